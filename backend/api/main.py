@@ -1,12 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from common.logging_config import GameLogger
+from common.metrics import metrics
+from player.flip_policy import load_flip_policy, unload_flip_policy
+from .models.game_manager import analysis_pool, board_pool, ponder_pool
 from .routers import game_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep stdout writes off the request path while the server runs
+    GameLogger.enable_queue_logging()
+    # Pre-generate boards so lobby bursts don't pay for board setup
+    board_pool.start()
+    # Map the precomputed flip table, if one was built, for the AI's early flips
+    load_flip_policy()
+    yield
+    board_pool.stop()
+    if ponder_pool:
+        ponder_pool.shutdown()
+    analysis_pool.shutdown()
+    unload_flip_policy()
+    GameLogger.disable_queue_logging()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="De Beer is Los! API",
     description="API for the 'De Beer is Los!' board game",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend
@@ -39,6 +64,12 @@ async def health_check():
     return {"status": "healthy", "service": "de-beer-is-los-api"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Export metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
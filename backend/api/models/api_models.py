@@ -1,12 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 # Import existing enums from core models
-from common.models.action import ActionType
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+from common.models.direction import Direction
+from game_engine.action_codes import CODE_BITS, decode, encode
 from game_engine.models.game_phase import GamePhase
 from tile.tile_types import TileType, TileOwner
 from pieces.piece_owner import PieceOwner
+from player.ai_levels import DEFAULT_AI_LEVEL, AILevel
 
 
 # Request Models
@@ -14,6 +18,12 @@ class CreateGameRequest(BaseModel):
     player1_name: str
     # If none then AI will be player 2
     player2_name: Optional[str] = None
+    # Strategy and compute budget of the AI player
+    ai_level: AILevel = DEFAULT_AI_LEVEL
+
+
+class BulkCreateGameRequest(BaseModel):
+    games: List[CreateGameRequest] = Field(..., min_length=1, max_length=1000)
 
 
 class CoordinateRequest(BaseModel):
@@ -22,11 +32,51 @@ class CoordinateRequest(BaseModel):
 
 
 class ActionRequest(BaseModel):
-    action_type: ActionType
+    # Either the packed action code (see game_engine/action_codes.py) or the spelled-out fields
+    code: Optional[int] = Field(None, ge=0, lt=1 << CODE_BITS)
+    action_type: Optional[ActionType] = None
     source: Optional[CoordinateRequest] = None
     target: Optional[CoordinateRequest] = None
     direction: Optional[str] = None
 
+    @field_validator("code")
+    @classmethod
+    def code_is_an_action(cls, code: Optional[int]) -> Optional[int]:
+        if code is not None:
+            decode(code)
+        return code
+
+    @model_validator(mode="after")
+    def has_an_action(self) -> "ActionRequest":
+        if self.code is None and self.action_type is None:
+            raise ValueError("either code or action_type is required")
+        return self
+
+    @classmethod
+    def from_action(cls, action: Action) -> "ActionRequest":
+        """Request for an engine action, with both its code and its fields."""
+        return cls(
+            code=encode(action),
+            action_type=action.type,
+            source=CoordinateRequest(x=action.source.x, y=action.source.y) if action.source else None,
+            target=CoordinateRequest(x=action.target.x, y=action.target.y) if action.target else None,
+            direction=action.direction.name if action.direction else None,
+        )
+
+    def to_action(self) -> Action:
+        """
+        Engine action for the request; the code wins when both are given.
+        Raises KeyError for an unknown direction name.
+        """
+        if self.code is not None:
+            return decode(self.code)
+        return Action(
+            type=self.action_type,
+            source=Coord.of(self.source.x, self.source.y) if self.source else None,
+            target=Coord.of(self.target.x, self.target.y) if self.target else None,
+            direction=Direction[self.direction] if self.direction else None,
+        )
+
 
 # Response Models
 class CoordinateResponse(BaseModel):
@@ -95,6 +145,51 @@ class CreateGameResponse(BaseModel):
     game_state: GameStateResponse
 
 
+class BulkCreateGameResponse(BaseModel):
+    game_ids: List[str]
+    message: str
+
+
+class ThreatsResponse(BaseModel):
+    # Squares covered by the face-up attackers of each kind
+    t_cell_lanes: List[CoordinateResponse]
+    virus_adjacent: List[CoordinateResponse]
+    bacteria_reach: List[CoordinateResponse]
+    # Face-up pieces on a square covered by an attacker that can take them
+    threatened: List[CoordinateResponse]
+
+
+class AnalyzeRequest(BaseModel):
+    # Seconds to spend deepening; every action is scored by the evaluator however short it is
+    time_budget: float = Field(1.0, gt=0, le=10.0)
+
+
+class ScoredActionResponse(BaseModel):
+    code: int
+    # For the requesting player, in evaluator units
+    score: float
+
+
+class AnalysisResponse(BaseModel):
+    game_id: str
+    state_version: int
+    player: str
+    # Plies every action was searched, counting the action itself
+    depth: int
+    seconds: float
+    # Best first
+    actions: List[ScoredActionResponse]
+
+
+class LegalActionsResponse(BaseModel):
+    game_id: str
+    # Changes whenever the game does; the list is valid for this version only
+    state_version: int
+    current_player: str
+    # Packed action codes (see game_engine/action_codes.py), in move generation order
+    actions: List[int]
+
+
 class ErrorResponse(BaseModel):
     error: str
     detail: Optional[str] = None
@@ -104,4 +199,10 @@ class StatsResponse(BaseModel):
     total_games: int
     active_games: int
     finished_games: int
-    oldest_game: Optional[datetime]
\ No newline at end of file
+    oldest_game: Optional[datetime]
+    games_per_phase: Dict[str, int]
+    actions_per_second: float
+    ai_turns_per_second: float
+    # Averages over finished games: length in turns, duration in seconds
+    average_game_length: Optional[float] = None
+    average_game_duration: Optional[float] = None
\ No newline at end of file
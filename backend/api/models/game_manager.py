@@ -1,19 +1,62 @@
-import uuid
+import os
 import threading
+import time
+import uuid
+from concurrent.futures import Future
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timedelta
+from board.board import Board
+from board.board_pool import BoardPool
+from board.lookup_tables import SQUARE_COORDS, square_index
+from board.threat_map import ThreatMap, mask_squares
+from game_engine.action_codes import FIELD_MASK, SQUARE_SHIFT, encode
 from game_engine.game_engine import GameEngine
+from game_engine.position import Position
 from player.ai_player import AIPlayer
+from player.ai_levels import AI_LEVELS, DEFAULT_AI_LEVEL, AILevel, choose_budgeted_action, create_ai_player
+from player.expectimax_player import ExpectimaxPlayer
+from player.analyzer import Analysis, AnalysisPool
+from player.ponderer import Ponderer, PonderPool
 from player.human_player import HumanPlayer
 from pieces.piece_owner import PieceOwner
 from common.models.action import Action
+from common.models.coordinate import Coord
 from tile.tile_types import TileType, TileOwner
+from common.logging_config import GameLogger
+from common.metrics import metrics, timed, TimedRLock
+from .session_stats import SessionStats
+
+
+LOCK_WAIT_SECONDS = metrics.histogram(
+    "phage_session_lock_wait_seconds", "Time spent waiting for the session manager lock"
+)
+LOCK_HOLD_SECONDS = metrics.histogram(
+    "phage_session_lock_hold_seconds", "Time the session manager lock was held"
+)
+AI_CHOOSE_ACTION_SECONDS = metrics.histogram(
+    "phage_ai_choose_action_seconds", "Time spent in AI choose_action"
+)
+GAME_STATE_SERIALIZE_SECONDS = metrics.histogram(
+    "phage_game_state_serialize_seconds", "Time spent serializing a game state"
+)
+LEGAL_ACTIONS_HITS = metrics.counter(
+    "phage_legal_actions_cache_hits_total", "Legal action lists served from the session cache"
+)
+LEGAL_ACTIONS_MISSES = metrics.counter(
+    "phage_legal_actions_cache_misses_total", "Legal action lists generated for a new game state"
+)
+ANALYSIS_CACHE_HITS = metrics.counter(
+    "phage_analysis_cache_hits_total", "Analyses served from, or joined in progress on, the session cache"
+)
+
+logger = GameLogger.get_module_logger("api.sessions")
 
 
 class GameSession:
     """Represents a single game session with metadata."""
 
-    def __init__(self, game_id: str, player1_name: str, player2_name: str = None):
+    def __init__(self, game_id: str, player1_name: str, player2_name: str = None, board: Board = None,
+                 ai_level: AILevel = DEFAULT_AI_LEVEL):
         self.game_id = game_id
         self.created_at = datetime.now()
         self.last_activity = datetime.now()
@@ -24,10 +67,13 @@ class GameSession:
         # Player 1 gets the Immune System (T Cell/Dendritic Cell) faction (PLAYER1)
         # Player 2 gets the Blue/Animal faction (PLAYER2)
         player1 = HumanPlayer(self.player1_name, PieceOwner.PLAYER1)
-        player2 = HumanPlayer(self.player2_name, PieceOwner.PLAYER2) if player2_name else AIPlayer(self.player2_name, PieceOwner.PLAYER2)
+        if player2_name:
+            player2 = HumanPlayer(self.player2_name, PieceOwner.PLAYER2)
+        else:
+            player2 = create_ai_player(self.player2_name, PieceOwner.PLAYER2, ai_level)
 
         # Create game engine
-        self.game_engine = GameEngine([player1, player2])
+        self.game_engine = GameEngine([player1, player2], board)
 
         # Track game state
         self.is_active = True
@@ -36,11 +82,44 @@ class GameSession:
 
         # AI delay - don't let AI move until this time
         self.ai_can_move_after = None
+        # Held by the request playing the AI's turns, which search outside the manager lock
+        self.ai_turn_lock = threading.Lock()
+
+        # AI level and the thinking time it has used so far
+        self.ai_level = ai_level
+        self.ai_seconds_used = 0.0
+
+        # Background search during the human's turn, if enabled
+        self.ponderer: Optional[Ponderer] = None
+
+        # Bumped on every change to the game; caches of derived data key on it
+        self.state_version = 0
+        self._legal_actions: Optional[Tuple[int, List[int]]] = None
+        # Player index -> (state version, time budget, analysis), the analysis possibly still running
+        self.analyses: Dict[int, Tuple[int, float, Future]] = {}
     
     def update_activity(self):
         """Update last activity timestamp."""
         self.last_activity = datetime.now()
     
+    def state_changed(self):
+        """Invalidate everything cached for the previous game state."""
+        self.state_version += 1
+
+    def legal_actions(self) -> List[int]:
+        """Action codes the current player may play, cached until the state changes."""
+        if self._legal_actions is not None and self._legal_actions[0] == self.state_version:
+            LEGAL_ACTIONS_HITS.inc()
+            return self._legal_actions[1]
+        LEGAL_ACTIONS_MISSES.inc()
+        codes = []
+        if self.is_active:
+            # The full view, as the rules validator sees the board: a cut is legal next to
+            # face-down debris, which the player's own view can only guess at
+            codes = Position.from_engine(self.game_engine).legal_actions()
+        self._legal_actions = (self.state_version, codes)
+        return codes
+
     def add_to_history(self, player_name: str, action: Action):
         """Add a move to the game history."""
         self.game_history.append({
@@ -48,6 +127,7 @@ class GameSession:
             'player': player_name,
             'action_type': action.type.name,
             'details': {
+                'code': encode(action),
                 'source': (action.source.x, action.source.y) if action.source else None,
                 'target': (action.target.x, action.target.y) if action.target else None,
                 'direction': action.direction.name if action.direction else None
@@ -66,23 +146,58 @@ class GameSessionManager:
     Thread-safe for concurrent access.
     """
     
-    def __init__(self):
+    def __init__(self, board_pool: BoardPool = None, ponder_pool: PonderPool = None, ai_move_delay: float = 1.0,
+                 analysis_pool: AnalysisPool = None):
         self.sessions: Dict[str, GameSession] = {}
-        self.lock = threading.RLock()  # Reentrant lock for thread safety
+        self.board_pool = board_pool
+        self.ponder_pool = ponder_pool  # Search AIs ponder the human's turn when set
+        self.analysis_pool = analysis_pool or AnalysisPool()  # Runs analyses inline unless given workers
+        self.ai_move_delay = ai_move_delay  # Seconds before the AI answers a human action
+        self.lock = TimedRLock(LOCK_WAIT_SECONDS, LOCK_HOLD_SECONDS)  # Reentrant lock for thread safety
+        self.stats = SessionStats()  # Counters maintained on create/finish/delete
     
-    def create_game(self, player1_name: str, player2_name: str = None) -> str:
+    def _new_session(self, player1_name: str, player2_name: str = None,
+                     ai_level: AILevel = DEFAULT_AI_LEVEL) -> GameSession:
+        """Build a session outside the manager lock, taking its board from the pool if any."""
+        board = self.board_pool.acquire() if self.board_pool else None
+        session = GameSession(str(uuid.uuid4()), player1_name, player2_name, board, ai_level)
+        ai_player = session.game_engine.players[1]
+        if self.ponder_pool and isinstance(ai_player, ExpectimaxPlayer):
+            session.ponderer = Ponderer(ai_player, self.ponder_pool)
+        return session
+
+    def create_game(self, player1_name: str, player2_name: str = None,
+                    ai_level: AILevel = DEFAULT_AI_LEVEL) -> str:
         """
         Create a new game session.
+        `ai_level` picks the AI's strategy and compute budget when player 2 is the AI.
         Returns the unique game ID.
         """
+        session = self._new_session(player1_name, player2_name, ai_level)
         with self.lock:
-            game_id = str(uuid.uuid4())
-            session = GameSession(game_id, player1_name, player2_name)
-            self.sessions[game_id] = session
-            
-            from common.logging_config import logger
-            logger.info(f"Created game {game_id}: {player1_name} vs {session.player2_name}")
-            return game_id
+            self.sessions[session.game_id] = session
+            self.stats.game_created(session)
+
+        logger.info("Created game %s: %s vs %s", session.game_id, player1_name, session.player2_name)
+        return session.game_id
+
+    def create_games(self, players: List[Tuple[str, Optional[str]]],
+                     ai_levels: Optional[List[AILevel]] = None) -> List[str]:
+        """
+        Create many game sessions at once, e.g. for a tournament round.
+        Takes the manager lock once for the whole batch.
+        Returns the game IDs in request order.
+        """
+        ai_levels = ai_levels or [DEFAULT_AI_LEVEL] * len(players)
+        sessions = [self._new_session(player1_name, player2_name, ai_level)
+                    for (player1_name, player2_name), ai_level in zip(players, ai_levels)]
+        with self.lock:
+            for session in sessions:
+                self.sessions[session.game_id] = session
+                self.stats.game_created(session)
+
+        logger.info("Created %d games in bulk", len(sessions))
+        return [session.game_id for session in sessions]
     
     def get_game(self, game_id: str) -> Optional[GameSession]:
         """Get a game session by ID."""
@@ -119,6 +234,11 @@ class GameSessionManager:
                 # Apply the action
                 points = session.game_engine.apply_action(player, action)
 
+                # The AI's background search is over; keep what it found for the AI's answer.
+                # Pondering works on its own copy of the position, so a rejected action leaves it running.
+                if session.ponderer:
+                    session.ponderer.stop()
+
                 # Add to history
                 session.add_to_history(player_name, action)
 
@@ -127,6 +247,7 @@ class GameSessionManager:
 
                 # Advance turn
                 session.game_engine.next_turn()
+                session.state_changed()
 
                 # Check if game is over
                 if session.game_engine.is_game_over:
@@ -136,16 +257,23 @@ class GameSessionManager:
                     # Set delay for AI to "think" - processed when frontend polls
                     current_player = session.game_engine.current_player
                     if isinstance(current_player, AIPlayer):
-                        session.ai_can_move_after = datetime.now() + timedelta(seconds=1)
+                        session.ai_can_move_after = datetime.now() + timedelta(seconds=self.ai_move_delay)
 
+                self.stats.record_action()
+                self.stats.sync(session)
                 return True, f"Action applied. Points gained: {points}", points
 
             except ValueError as e:
                 return False, str(e), 0
 
     def _process_ai_turns(self, session: GameSession):
-        """Process AI turns until it is a human player turn or game is over."""
-        from common.logging_config import logger
+        """
+        Process AI turns until it is a human player turn or game is over.
+
+        The AI chooses outside the manager lock, so a long search holds up
+        no other game; each chosen action is applied under the lock. The
+        caller holds the session's `ai_turn_lock`.
+        """
 
         max_ai_turns = 10  # Safety limit
         ai_turns = 0
@@ -156,53 +284,172 @@ class GameSessionManager:
             if not isinstance(current_player, AIPlayer):
                 break
 
-            ai_action = current_player.choose_action(session.game_engine)
-            if not ai_action:
-                # AI has no valid moves - pass the turn
-                logger.warning(f"AI {current_player.name} has no valid moves, passing turn")
-                session.game_engine.next_turn()
+            # Thinking time is capped per game by the session's AI level
+            seconds_left = AI_LEVELS[session.ai_level].game_seconds - session.ai_seconds_used
+            started = time.perf_counter()
+            with AI_CHOOSE_ACTION_SECONDS.time():
+                ai_action = choose_budgeted_action(current_player, session.game_engine, seconds_left)
+            session.ai_seconds_used += time.perf_counter() - started
 
-                if session.game_engine.is_game_over:
-                    session.is_active = False
-                    session.winner = session.game_engine.winner.name if session.game_engine.winner else "Draw"
+            with self.lock:
+                if not session.is_active:
+                    # Resigned while the AI was thinking
                     break
-
                 ai_turns += 1
-                continue
-
-            try:
-                points = session.game_engine.apply_action(current_player, ai_action)
-                session.add_to_history(current_player.name, ai_action)
-                session.game_engine.update_scores(current_player, points)
-                session.game_engine.next_turn()
+                if not ai_action:
+                    # AI has no valid moves - pass the turn
+                    logger.warning("AI %s has no valid moves, passing turn", current_player.name)
+                    session.game_engine.next_turn()
+                    session.state_changed()
+                else:
+                    try:
+                        points = session.game_engine.apply_action(current_player, ai_action)
+                        session.add_to_history(current_player.name, ai_action)
+                        session.game_engine.update_scores(current_player, points)
+                        session.game_engine.next_turn()
+                        session.state_changed()
+                        self.stats.record_action(ai_turn=True)
+                    except ValueError as e:
+                        logger.error("AI action failed: %s", e)
+                        # Advance turn anyway to prevent getting stuck
+                        session.game_engine.next_turn()
+                        session.state_changed()
+                        continue
 
                 if session.game_engine.is_game_over:
                     session.is_active = False
                     session.winner = session.game_engine.winner.name if session.game_engine.winner else "Draw"
                     break
 
-                ai_turns += 1
-
-            except ValueError as e:
-                logger.error(f"AI action failed: {e}")
-                # Advance turn anyway to prevent getting stuck
-                session.game_engine.next_turn()
-                ai_turns += 1
+        # Think about the human's move while waiting for it
+        with self.lock:
+            if session.ponderer and session.is_active and not isinstance(session.game_engine.current_player, AIPlayer):
+                session.ponderer.start(session.game_engine.player_view(session.ponderer.player))
 
     def get_game_state(self, game_id: str) -> Optional[Dict]:
-        """Get the current state of a game."""
+        """
+        Get the current state of a game, first playing the AI's turns once its delay has passed.
+
+        Blocks for as long as the AI searches, so callers on an event loop
+        run it in a worker thread. A request arriving while another plays
+        the AI's turns gets the state as it stands.
+        """
         session = self.get_game(game_id)
         if not session:
             return None
 
         # Process AI turns if it's AI's turn and delay has passed
-        if session.is_active:
-            current_player = session.game_engine.current_player
-            if isinstance(current_player, AIPlayer):
-                if session.ai_can_move_after and datetime.now() >= session.ai_can_move_after:
-                    self._process_ai_turns(session)
-                    session.ai_can_move_after = None
+        if session.is_active and session.ai_turn_lock.acquire(blocking=False):
+            try:
+                current_player = session.game_engine.current_player
+                if isinstance(current_player, AIPlayer):
+                    if session.ai_can_move_after and datetime.now() >= session.ai_can_move_after:
+                        session.ai_can_move_after = None
+                        self._process_ai_turns(session)
+            finally:
+                session.ai_turn_lock.release()
+
+        with self.lock:
+            # Pick up phase changes and finished games for the stats counters
+            self.stats.sync(session)
 
+            return self._serialize_state(session)
+
+    def get_threats(self, game_id: str) -> Optional[Dict]:
+        """Attack sets of the face-up pieces on a game's board, as lists of squares."""
+        session = self.get_game(game_id)
+        if not session:
+            return None
+
+        with self.lock:
+            threats = ThreatMap(session.game_engine.board)
+
+            def squares(mask: int) -> List[Dict]:
+                return [{"x": SQUARE_COORDS[square].x, "y": SQUARE_COORDS[square].y}
+                        for square in mask_squares(mask)]
+
+            return {
+                "t_cell_lanes": squares(threats.t_cell_lanes),
+                "virus_adjacent": squares(threats.virus_adjacent),
+                "bacteria_reach": squares(threats.bacteria_reach),
+                "threatened": squares(threats.threatened()),
+            }
+
+    def get_legal_actions(self, game_id: str, source: Optional[Coord] = None) -> Optional[Dict]:
+        """
+        Codes of the current player's legal actions, optionally only those
+        acting from `source` (the tile moved, shot with, cut with or flipped).
+        """
+        session = self.get_game(game_id)
+        if not session:
+            return None
+
+        with self.lock:
+            actions = session.legal_actions()
+            if source is not None:
+                square = square_index(source)
+                actions = [code for code in actions if code >> SQUARE_SHIFT & FIELD_MASK == square]
+            return {
+                "game_id": game_id,
+                "state_version": session.state_version,
+                "current_player": session.game_engine.current_player.name,
+                "actions": actions,
+            }
+
+    def analyze(self, game_id: str, player_name: str, time_budget: float) -> Optional[Dict]:
+        """
+        Every legal action of `player_name`, scored and ranked best first.
+
+        The position is copied under the lock and analyzed after releasing
+        it, so other requests and games carry on meanwhile. An analysis is
+        kept for the state version it was made for; a request for the same
+        state with no larger budget reuses it, or waits for it if it is
+        still running. Raises ValueError if the player cannot move now.
+        """
+        with self.lock:
+            session = self.get_game(game_id)
+            if not session:
+                return None
+            engine = session.game_engine
+            index = next((i for i, p in enumerate(engine.players) if p.name == player_name), None)
+            if index is None:
+                raise ValueError("Player not found in this game")
+            if not session.is_active:
+                raise ValueError("Game is not active")
+            if index != engine.current_player_turn_index:
+                raise ValueError(f"Not your turn. Current player: {engine.current_player.name}")
+
+            version = session.state_version
+            cached = session.analyses.get(index)
+            if cached and cached[0] == version and cached[1] >= time_budget:
+                ANALYSIS_CACHE_HITS.inc()
+                future, position = cached[2], None
+            else:
+                future, position = Future(), Position.from_engine(engine, index)
+                session.analyses[index] = (version, time_budget, future)
+
+        if position is not None:
+            try:
+                future.set_result(self.analysis_pool.analyze(position, time_budget))
+            except Exception as e:
+                future.set_exception(e)
+                with self.lock:
+                    if session.analyses.get(index, (None, None, None))[2] is future:
+                        del session.analyses[index]
+        analysis: Analysis = future.result()
+
+        return {
+            "game_id": game_id,
+            "state_version": version,
+            "player": player_name,
+            "depth": analysis.depth,
+            "seconds": analysis.seconds,
+            "actions": [{"code": code, "score": score} for code, score in analysis.ranked],
+        }
+
+    @timed(GAME_STATE_SERIALIZE_SECONDS)
+    def _serialize_state(self, session: GameSession) -> Dict:
+        """Build the API representation of a session's game state."""
         game = session.game_engine
         
         # Build board state (rows first, then columns within each row)
@@ -210,7 +457,7 @@ class GameSessionManager:
         for y in range(game.board.size):
             row = []
             for x in range(game.board.size):
-                tile = game.board.get_tile(type('Coord', (), {'x': x, 'y': y})())
+                tile = game.board.grid[x][y]
                 if tile:
                     row.append({
                         'x': x,
@@ -230,7 +477,7 @@ class GameSessionManager:
             board_state.append(row)
         
         return {
-            'game_id': game_id,
+            'game_id': session.game_id,
             'created_at': session.created_at.isoformat(),
             'last_activity': session.last_activity.isoformat(),
             'is_active': session.is_active,
@@ -267,16 +514,17 @@ class GameSessionManager:
     
     def cleanup_expired_games(self, timeout_hours: int = 24) -> int:
         """Remove expired game sessions. Returns number of games cleaned up."""
-        from common.logging_config import logger
         with self.lock:
             expired_games = [game_id for game_id, session in self.sessions.items() 
                            if session.is_expired(timeout_hours)]
 
             for game_id in expired_games:
+                self._stop_pondering(self.sessions[game_id])
                 del self.sessions[game_id]
+                self.stats.game_removed(game_id)
 
             if expired_games:
-                logger.info(f"Cleaned up {len(expired_games)} expired games")
+                logger.info("Cleaned up %d expired games", len(expired_games))
 
             return len(expired_games)
 
@@ -285,7 +533,6 @@ class GameSessionManager:
         Handle player resignation.
         Returns (success, winner_name).
         """
-        from common.logging_config import logger
         with self.lock:
             session = self.sessions.get(game_id)
             if not session:
@@ -305,33 +552,54 @@ class GameSessionManager:
             session.is_active = False
             session.winner = winner.name
             session.game_engine.phase = session.game_engine.phase.__class__("finished")
+            session.state_changed()
+            self._stop_pondering(session)
+            self.stats.sync(session)
 
-            logger.info(f"Player {player_name} resigned game {game_id}. Winner: {winner.name}")
+            logger.info("Player %s resigned game %s. Winner: %s", player_name, game_id, winner.name)
             return True, winner.name
 
+    @staticmethod
+    def _stop_pondering(session: GameSession) -> None:
+        if session.ponderer:
+            session.ponderer.cancel()
+
     def delete_game(self, game_id: str) -> bool:
         """Delete a specific game session."""
-        from common.logging_config import logger
         with self.lock:
             if game_id in self.sessions:
+                self._stop_pondering(self.sessions[game_id])
                 del self.sessions[game_id]
-                logger.info(f"Deleted game {game_id}")
+                self.stats.game_removed(game_id)
+                logger.info("Deleted game %s", game_id)
                 return True
             return False
     
     def get_stats(self) -> Dict:
-        """Get overall statistics."""
-        with self.lock:
-            total_games = len(self.sessions)
-            active_games = sum(bool(s.is_active) for s in self.sessions.values())
-            
-            return {
-                'total_games': total_games,
-                'active_games': active_games,
-                'finished_games': total_games - active_games,
-                'oldest_game': min((s.created_at for s in self.sessions.values()), default=None)
-            }
-
-
-# Global session manager instance
-game_session_manager = GameSessionManager()
+        """
+        Get overall statistics.
+        Served from incrementally maintained counters without taking the session lock.
+        """
+        return self.stats.snapshot()
+
+
+# Global session manager instance, drawing boards from a pool refilled in the background.
+# PHAGE_AI_MOVE_DELAY sets the AI's answer delay in seconds; PHAGE_PONDER_WORKERS > 0
+# lets search AIs ponder on that many shared background threads; move analyses run on
+# PHAGE_ANALYSIS_WORKERS worker processes (default 2), or on the request's thread if 0.
+board_pool = BoardPool()
+_ponder_workers = int(os.environ.get("PHAGE_PONDER_WORKERS", "0"))
+ponder_pool = PonderPool(_ponder_workers) if _ponder_workers > 0 else None
+analysis_pool = AnalysisPool(int(os.environ.get("PHAGE_ANALYSIS_WORKERS", "2")))
+game_session_manager = GameSessionManager(
+    board_pool, ponder_pool, ai_move_delay=float(os.environ.get("PHAGE_AI_MOVE_DELAY", "1.0")),
+    analysis_pool=analysis_pool,
+)
+
+metrics.gauge_callback(
+    "phage_sessions", "Game sessions by state", ("state",),
+    lambda: {
+        ("active",): game_session_manager.stats.active_games,
+        ("finished",): game_session_manager.stats.total_games - game_session_manager.stats.active_games,
+    },
+)
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from game_engine.models.game_phase import GamePhase
+
+
+class RateCounter:
+    """
+    Events-per-second counter over a sliding window of one-second buckets.
+    Adding is O(1); reading is O(window) with a small constant window.
+    """
+
+    def __init__(self, window_seconds: int = 60):
+        self.window_seconds = window_seconds
+        self.started_at = int(time.monotonic())
+        self._counts = [0] * window_seconds
+        self._seconds = [0] * window_seconds
+
+    def add(self, count: int = 1) -> None:
+        """Record `count` events at the current time."""
+        second = int(time.monotonic())
+        index = second % self.window_seconds
+        if self._seconds[index] != second:
+            self._seconds[index] = second
+            self._counts[index] = 0
+        self._counts[index] += count
+
+    def rate(self) -> float:
+        """Return the average events per second over the window."""
+        second = int(time.monotonic())
+        total = sum(
+            count for bucket_second, count in zip(self._seconds, self._counts)
+            if second - bucket_second < self.window_seconds
+        )
+        elapsed = min(self.window_seconds, second - self.started_at + 1)
+        return total / elapsed
+
+
+class SessionStats:
+    """
+    Incrementally maintained counters behind GameSessionManager.get_stats.
+
+    Every session is counted in exactly one phase bucket and as either active
+    or finished. The bucket a session was last counted in is remembered here,
+    so removals stay correct even if the session was mutated in between.
+    Uses its own lock so polling stats never waits on the session manager lock.
+    """
+
+    def __init__(self, rate_window_seconds: int = 60):
+        self.lock = threading.Lock()
+        self.total_games = 0
+        self.active_games = 0
+        self.games_per_phase: Dict[GamePhase, int] = {phase: 0 for phase in GamePhase}
+        self.actions = RateCounter(rate_window_seconds)
+        self.ai_turns = RateCounter(rate_window_seconds)
+
+        # Lifetime aggregates over finished games
+        self.completed_games = 0
+        self.completed_turns = 0
+        self.completed_seconds = 0.0
+
+        # game_id -> (phase, is_active) as currently counted
+        self._counted: Dict[str, Tuple[GamePhase, bool]] = {}
+        # game_id -> created_at, in creation order (first entry is the oldest)
+        self._created: "OrderedDict[str, datetime]" = OrderedDict()
+
+    def game_created(self, session) -> None:
+        phase = session.game_engine.phase
+        with self.lock:
+            self._counted[session.game_id] = (phase, session.is_active)
+            self._created[session.game_id] = session.created_at
+            self.total_games += 1
+            self.active_games += session.is_active
+            self.games_per_phase[phase] += 1
+
+    def game_removed(self, game_id: str) -> None:
+        with self.lock:
+            counted = self._counted.pop(game_id, None)
+            self._created.pop(game_id, None)
+            if counted is None:
+                return
+            phase, is_active = counted
+            self.total_games -= 1
+            self.active_games -= is_active
+            self.games_per_phase[phase] -= 1
+
+    def sync(self, session) -> None:
+        """Move a session between buckets if its phase or activity changed."""
+        phase = session.game_engine.phase
+        is_active = session.is_active
+        with self.lock:
+            counted = self._counted.get(session.game_id)
+            if counted is None or counted == (phase, is_active):
+                return
+            old_phase, was_active = counted
+            self._counted[session.game_id] = (phase, is_active)
+            self.games_per_phase[old_phase] -= 1
+            self.games_per_phase[phase] += 1
+            self.active_games += is_active - was_active
+
+            if was_active and not is_active:
+                self.completed_games += 1
+                self.completed_turns += session.game_engine.current_turn
+                self.completed_seconds += (datetime.now() - session.created_at).total_seconds()
+
+    def record_action(self, ai_turn: bool = False) -> None:
+        with self.lock:
+            self.actions.add()
+            if ai_turn:
+                self.ai_turns.add()
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            oldest_game = next(iter(self._created.values()), None)
+            completed = self.completed_games
+            return {
+                'total_games': self.total_games,
+                'active_games': self.active_games,
+                'finished_games': self.total_games - self.active_games,
+                'oldest_game': oldest_game,
+                'games_per_phase': {phase.value: count for phase, count in self.games_per_phase.items()},
+                'actions_per_second': self.actions.rate(),
+                'ai_turns_per_second': self.ai_turns.rate(),
+                'average_game_length': self.completed_turns / completed if completed else None,
+                'average_game_duration': self.completed_seconds / completed if completed else None,
+            }
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
 from ..models.api_models import (
     CreateGameRequest, CreateGameResponse, ActionRequest, ActionResultResponse,
-    GameStateResponse, GameListItemResponse, ErrorResponse, StatsResponse
+    GameStateResponse, GameListItemResponse, ErrorResponse, StatsResponse,
+    BulkCreateGameRequest, BulkCreateGameResponse, ThreatsResponse, LegalActionsResponse,
+    AnalyzeRequest, AnalysisResponse
 )
 from ..models.game_manager import game_session_manager
-from common.models.action import Action, ActionType
+from board.lookup_tables import BOARD_SIZE
 from common.models.coordinate import Coord
-from common.models.direction import Direction
+from .timed_route import TimedRoute
 
 
-router = APIRouter(prefix="/api/game", tags=["game"])
+router = APIRouter(prefix="/api/game", tags=["game"], route_class=TimedRoute)
 
 
 @router.post("/create", response_model=CreateGameResponse)
@@ -18,11 +21,12 @@ async def create_game(request: CreateGameRequest):
     """Create a new game session."""
     try:
         game_id = game_session_manager.create_game(
-            request.player1_name, 
-            request.player2_name
+            request.player1_name,
+            request.player2_name,
+            request.ai_level
         )
         
-        game_state = game_session_manager.get_game_state(game_id)
+        game_state = await run_in_threadpool(game_session_manager.get_game_state, game_id)
         if not game_state:
             raise HTTPException(status_code=500, detail="Failed to create game")
         
@@ -36,42 +40,81 @@ async def create_game(request: CreateGameRequest):
         raise HTTPException(status_code=500, detail=f"Failed to create game: {str(e)}")
 
 
+@router.post("/create/bulk", response_model=BulkCreateGameResponse)
+async def create_games(request: BulkCreateGameRequest):
+    """Create many game sessions at once (e.g. a tournament round)."""
+    try:
+        game_ids = game_session_manager.create_games(
+            [(game.player1_name, game.player2_name) for game in request.games],
+            [game.ai_level for game in request.games]
+        )
+        return BulkCreateGameResponse(
+            game_ids=game_ids,
+            message=f"Created {len(game_ids)} games successfully"
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create games: {str(e)}") from e
+
+
 @router.get("/{game_id}/state", response_model=GameStateResponse)
 async def get_game_state(game_id: str):
     """Get the current state of a game."""
-    game_state = game_session_manager.get_game_state(game_id)
+    # Off the event loop: playing the AI's turns can take a search's time limit per move
+    game_state = await run_in_threadpool(game_session_manager.get_game_state, game_id)
     if not game_state:
         raise HTTPException(status_code=404, detail="Game not found")
     
     return GameStateResponse(**game_state)
 
 
+@router.get("/{game_id}/threats", response_model=ThreatsResponse)
+async def get_threats(game_id: str):
+    """Get the squares each kind of face-up piece attacks, as a hint overlay."""
+    threats = game_session_manager.get_threats(game_id)
+    if not threats:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    return ThreatsResponse(**threats)
+
+
+@router.get("/{game_id}/legal-actions", response_model=LegalActionsResponse)
+async def get_legal_actions(game_id: str, x: Optional[int] = None, y: Optional[int] = None):
+    """Get the current player's legal actions as action codes, optionally only those acting from square (x, y)."""
+    source = None
+    if x is not None or y is not None:
+        if x is None or y is None or not (0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE):
+            raise HTTPException(status_code=400, detail="Source square needs both x and y on the board")
+        source = Coord.of(x, y)
+
+    legal_actions = game_session_manager.get_legal_actions(game_id, source)
+    if not legal_actions:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    return LegalActionsResponse(**legal_actions)
+
+
+@router.post("/{game_id}/analyze", response_model=AnalysisResponse)
+async def analyze(game_id: str, player_name: str, request: Optional[AnalyzeRequest] = None):
+    """Score every legal action of the player to move and rank them, as a coaching hint."""
+    time_budget = (request or AnalyzeRequest()).time_budget
+    try:
+        # Off the event loop: the analysis takes up to its time budget
+        analysis = await run_in_threadpool(game_session_manager.analyze, game_id, player_name, time_budget)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    return AnalysisResponse(**analysis)
+
+
 @router.post("/{game_id}/action", response_model=ActionResultResponse)
 async def apply_action(game_id: str, action_request: ActionRequest, player_name: str):
     """Apply a player action to the game."""
     try:
         # Convert API action to internal action
-        action_type = action_request.action_type
-        
-        source = None
-        target = None
-        direction = None
-        
-        if action_request.source:
-            source = Coord(action_request.source.x, action_request.source.y)
-        
-        if action_request.target:
-            target = Coord(action_request.target.x, action_request.target.y)
-        
-        if action_request.direction:
-            direction = Direction[action_request.direction]
-        
-        action = Action(
-            type=action_type,
-            source=source,
-            target=target,
-            direction=direction
-        )
+        action = action_request.to_action()
         
         # Apply the action
         success, message, points_gained = game_session_manager.apply_action(game_id, player_name, action)
@@ -84,7 +127,7 @@ async def apply_action(game_id: str, action_request: ActionRequest, player_name:
             )
 
         # Get updated game state
-        game_state = game_session_manager.get_game_state(game_id)
+        game_state = await run_in_threadpool(game_session_manager.get_game_state, game_id)
 
         return ActionResultResponse(
             success=True,
@@ -118,7 +161,7 @@ async def resign_game(game_id: str, player_name: str):
     if not success:
         raise HTTPException(status_code=404, detail="Game not found")
 
-    game_state = game_session_manager.get_game_state(game_id)
+    game_state = await run_in_threadpool(game_session_manager.get_game_state, game_id)
     return {
         "message": f"{player_name} resigned. {winner} wins!",
         "winner": winner,
@@ -0,0 +1,29 @@
+from time import perf_counter
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from common.metrics import metrics
+
+
+ENDPOINT_SECONDS = metrics.histogram(
+    "phage_http_request_seconds", "Time spent handling API requests", ("method", "endpoint")
+)
+
+
+class TimedRoute(APIRoute):
+    """API route recording its handling latency under the route's path template."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        histogram = ENDPOINT_SECONDS.labels(",".join(sorted(self.methods)), self.path)
+
+        async def timed_handler(request: Request) -> Response:
+            start = perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                histogram.observe(perf_counter() - start)
+
+        return timed_handler
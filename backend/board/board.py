@@ -1,22 +1,69 @@
 ﻿from tile.tile import Tile
 from tile.tile_types import TileType, TileOwner
 from common.models.coordinate import Coord
-from common.logging_config import logger
+from common.logging_config import GameLogger
+from .exit_distance import ExitDistances
+from .lookup_tables import (
+    ALIGNMENT, DIRECTION_INDEX, EXIT_DIRECTION, NEIGHBOR_COORDS, RAY_COORDS,
+    NORTH_INDEX, SOUTH_INDEX, EAST_INDEX, square_index
+)
+from game_engine.rules import SHOOTABLE_TYPES, can_exit, is_slider, is_stepper
 from typing import Optional
 import random
 
 
+logger = GameLogger.get_module_logger("board")
+
+
+# Correct piece distribution from game instructions:
+# 1 spelbord, 48 tegels onderverdeeld in:
+# - 2 beren en 6 vossen (blauwe achtergrond)
+# - 2 houthakkers en 8 jagers (bruine achtergrond)
+# - 7 eenden, 8 fazanten en 15 bomen (groene achtergrond)
+PIECE_DISTRIBUTION = [
+    # Pathogen team (Red - Player 2)
+    (TileType.VIRUS, TileOwner.PLAYER2, 2),       # 2 viruses
+    (TileType.BACTERIA, TileOwner.PLAYER2, 6),    # 6 bacteria
+
+    # Immune system team (Blue - Player 1)
+    (TileType.DENDRITIC_CELL, TileOwner.PLAYER1, 2), # 2 dendritic cells
+    (TileType.T_CELL, TileOwner.PLAYER1, 8),          # 8 T cells
+
+    # Neutral pieces (both players can move)
+    (TileType.RED_BLOOD_CELL, TileOwner.NEUTRAL, 7),  # 7 red blood cells (2pt)
+    (TileType.RED_BLOOD_CELL, TileOwner.NEUTRAL, 8),  # 8 red blood cells (3pt)
+    (TileType.DEBRIS, TileOwner.NEUTRAL, 15),         # 15 debris
+]
+
+# Point value for each piece type
+PIECE_POINTS = {
+    TileType.VIRUS: 10,
+    TileType.T_CELL: 5,
+    TileType.DENDRITIC_CELL: 5,
+    TileType.BACTERIA: 5,
+    TileType.RED_BLOOD_CELL: 3,  # Default to 3, but can be 2 for some
+    TileType.DEBRIS: 2,
+}
+
+
 class Board:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.size = 7
+        # Seed of the tile layout; None means the layout came from the global RNG
+        self.seed = seed
         self.grid = [[None for _ in range(self.size)] for _ in range(self.size)]
+        # Occupancy bitmasks: bit x of row_masks[y] and bit y of col_masks[x] are set if (x, y) holds a tile
+        self.row_masks = [0] * self.size
+        self.col_masks = [0] * self.size
+        # Distance-to-exit fields for the escape phase, keyed by the occupancy above
+        self.exits = ExitDistances(self)
         
         # Forest exit positions (imaginary positions one step outside the board)
         self.forest_exits = [
-            Coord(3, -1),   # North exit (one step north from edge)
-            Coord(7, 3),    # East exit (one step east from edge)
-            Coord(3, 7),    # South exit (one step south from edge)
-            Coord(-1, 3),   # West exit (one step west from edge)
+            Coord.of(3, -1),   # North exit (one step north from edge)
+            Coord.of(7, 3),    # East exit (one step east from edge)
+            Coord.of(3, 7),    # South exit (one step south from edge)
+            Coord.of(-1, 3),   # West exit (one step west from edge)
         ]
         
         self._setup_initial_tiles()
@@ -24,42 +71,25 @@ class Board:
     def _setup_initial_tiles(self):
         """Set up the game board with randomized piece placement."""
         
-        # Correct piece distribution from game instructions:
-        # 1 spelbord, 48 tegels onderverdeeld in:
-        # - 2 beren en 6 vossen (blauwe achtergrond) 
-        # - 2 houthakkers en 8 jagers (bruine achtergrond)
-        # - 7 eenden, 8 fazanten en 15 bomen (groene achtergrond)
-        piece_distribution = [
-            # Pathogen team (Red - Player 2)
-            (TileType.VIRUS, TileOwner.PLAYER2, 2),       # 2 viruses
-            (TileType.BACTERIA, TileOwner.PLAYER2, 6),    # 6 bacteria
-
-            # Immune system team (Blue - Player 1)
-            (TileType.DENDRITIC_CELL, TileOwner.PLAYER1, 2), # 2 dendritic cells
-            (TileType.T_CELL, TileOwner.PLAYER1, 8),          # 8 T cells
-
-            # Neutral pieces (both players can move)
-            (TileType.RED_BLOOD_CELL, TileOwner.NEUTRAL, 7),  # 7 red blood cells (2pt)
-            (TileType.RED_BLOOD_CELL, TileOwner.NEUTRAL, 8),  # 8 red blood cells (3pt)
-            (TileType.DEBRIS, TileOwner.NEUTRAL, 15),         # 15 debris
-        ]
-        
         # Create list of all pieces to place
         pieces_to_place = []
-        for tile_type, owner, count in piece_distribution:
+        for tile_type, owner, count in PIECE_DISTRIBUTION:
             pieces_to_place.extend([(tile_type, owner)] * count)
         
         # Verify we have exactly the right number of pieces
         assert len(pieces_to_place) == 48, f"Expected 48 pieces, got {len(pieces_to_place)}"
         
-        # Shuffle for random placement
-        random.shuffle(pieces_to_place)
+        # Shuffle for random placement (reproducible when the board is seeded)
+        if self.seed is None:
+            random.shuffle(pieces_to_place)
+        else:
+            random.Random(self.seed).shuffle(pieces_to_place)
         
         # Place pieces on board (skip center position 3,3)
         piece_index = 0
         for x in range(self.size):
             for y in range(self.size):
-                coord = Coord(x, y)
+                coord = Coord.of(x, y)
                 
                 # Skip center position (remains None - no tile)
                 if x == 3 and y == 3:
@@ -80,19 +110,64 @@ class Board:
                 # All tiles start face-down
                 tile.flipped = False
                 
-                self.grid[x][y] = tile
+                self._set_tile(x, y, tile)
     
     def _get_piece_points(self, tile_type: TileType) -> int:
         """Return point value for each piece type."""
-        point_values = {
-            TileType.VIRUS: 10,
-            TileType.T_CELL: 5,
-            TileType.DENDRITIC_CELL: 5,
-            TileType.BACTERIA: 5,
-            TileType.RED_BLOOD_CELL: 3,  # Default to 3, but can be 2 for some
-            TileType.DEBRIS: 2,
-        }
-        return point_values.get(tile_type, 0)
+        return PIECE_POINTS.get(tile_type, 0)
+
+    def _set_tile(self, x: int, y: int, tile) -> None:
+        """Place a tile (or None) on a square, keeping the occupancy masks in sync."""
+        self.grid[x][y] = tile
+        if tile:
+            self.row_masks[y] |= 1 << x
+            self.col_masks[x] |= 1 << y
+        else:
+            self.row_masks[y] &= ~(1 << x)
+            self.col_masks[x] &= ~(1 << y)
+        self.exits.square_changed(x * self.size + y, bool(tile))
+
+    def rebuild_occupancy(self) -> None:
+        """Recompute the occupancy masks and exit distances after the grid was assigned directly."""
+        self.row_masks = [0] * self.size
+        self.col_masks = [0] * self.size
+        for x in range(self.size):
+            for y in range(self.size):
+                if self.grid[x][y]:
+                    self.row_masks[y] |= 1 << x
+                    self.col_masks[x] |= 1 << y
+        self.exits.rebuild()
+
+    def blocker_distance(self, square: int, direction_index: int) -> int:
+        """
+        Steps from a square to the first occupied square along a ray, or 0 if the ray is empty.
+        One mask and one bit scan on the row or column occupancy.
+        """
+        x, y = divmod(square, self.size)
+        if direction_index == NORTH_INDEX:
+            mask = self.col_masks[x] & ((1 << y) - 1)
+            return y - mask.bit_length() + 1 if mask else 0
+        if direction_index == SOUTH_INDEX:
+            mask = self.col_masks[x] >> (y + 1)
+            return (mask & -mask).bit_length()
+        if direction_index == EAST_INDEX:
+            mask = self.row_masks[y] >> (x + 1)
+            return (mask & -mask).bit_length()
+        mask = self.row_masks[y] & ((1 << x) - 1)
+        return x - mask.bit_length() + 1 if mask else 0
+
+    def first_blocker(self, pos: Coord, direction) -> Optional[Coord]:
+        """Position of the first tile along a ray from `pos`, or None if the ray is empty."""
+        square = square_index(pos)
+        index = DIRECTION_INDEX[direction]
+        distance = self.blocker_distance(square, index)
+        return RAY_COORDS[square][index][distance - 1] if distance else None
+
+    def is_path_clear(self, source_pos: Coord, target_pos: Coord) -> bool:
+        """True if no tile stands strictly between two aligned on-board positions."""
+        index, distance = ALIGNMENT[(square_index(source_pos), square_index(target_pos))]
+        blocker = self.blocker_distance(square_index(source_pos), index)
+        return blocker == 0 or blocker >= distance
 
     def get_tile(self, pos):
         return None if not self.is_within_bounds(pos) else self.grid[pos.x][pos.y]
@@ -148,8 +223,8 @@ class Board:
             to_tile.capture()
         
         # Move the piece
-        self.grid[to_pos.x][to_pos.y] = from_tile
-        self.grid[from_pos.x][from_pos.y] = None
+        self._set_tile(to_pos.x, to_pos.y, from_tile)
+        self._set_tile(from_pos.x, from_pos.y, None)
         from_tile.move_to(to_pos, player)
         
         return points, captured_tile
@@ -159,8 +234,6 @@ class Board:
         T cell shooting action.
         T cells shoot in a straight line in their fixed direction until they hit a target.
         """
-        from common.models.direction import Direction
-        
         # Get the T cell piece
         tcell_tile = self.get_tile(source_pos)
         if not tcell_tile or tcell_tile.tile_type != TileType.T_CELL:
@@ -168,48 +241,25 @@ class Board:
         
         # Determine shooting direction (for now, use provided direction)
         # TODO: In full implementation, T cells should have fixed shooting directions
-        direction_map = {
-            Direction.NORTH: (0, -1),
-            Direction.SOUTH: (0, 1),
-            Direction.EAST: (1, 0),
-            Direction.WEST: (-1, 0)
-        }
-        
-        if direction not in direction_map:
+        if direction not in DIRECTION_INDEX:
             raise ValueError("Invalid shooting direction")
         
-        dx, dy = direction_map[direction]
         points = 0
         
-        # Trace along shooting direction until we hit something
-        distance = 1
-        while True:
-            target_pos = Coord(
-                source_pos.x + (dx * distance),
-                source_pos.y + (dy * distance)
-            )
-            
-            # Stop if out of bounds
-            if not self.is_within_bounds(target_pos):
-                break
-            
-            target_tile = self.get_tile(target_pos)
+        # The first tile along the shooting direction is the target
+        target_pos = self.first_blocker(source_pos, direction)
+        if target_pos:
+            target_tile = self.grid[target_pos.x][target_pos.y]
             
-            # If we hit a tile, check if T cell can capture it
-            if target_tile:
-                # T cells can capture all pathogens and red blood cells
-                if target_tile.tile_type in [TileType.VIRUS, TileType.BACTERIA, TileType.RED_BLOOD_CELL]:
-                    points = target_tile.points
-                    target_tile.capture()
-                    self.grid[target_pos.x][target_pos.y] = None
-                    logger.info(f"T cell shot {target_tile.tile_type.name} for {points} points!")
-                    break
-                else:
-                    # Shot blocked by non-capturable piece (debris, other T cell, etc.)
-                    logger.info(f"T cell shot blocked by {target_tile.tile_type.name}")
-                    break
-            
-            distance += 1
+            # T cells can capture all pathogens and red blood cells
+            if target_tile.tile_type in SHOOTABLE_TYPES:
+                points = target_tile.points
+                target_tile.capture()
+                self._set_tile(target_pos.x, target_pos.y, None)
+                logger.info("T cell shot %s for %d points!", target_tile.tile_type.name, points)
+            else:
+                # Shot blocked by non-capturable piece (debris, other T cell, etc.)
+                logger.info("T cell shot blocked by %s", target_tile.tile_type.name)
         
         return points
 
@@ -218,8 +268,6 @@ class Board:
         Dendritic cell debris removal action.
         Dendritic cells can remove debris in adjacent spaces (1 space away).
         """
-        from common.models.direction import Direction
-        
         # Get the dendritic cell piece
         dendritic_tile = self.get_tile(source_pos)
         if not dendritic_tile or dendritic_tile.tile_type != TileType.DENDRITIC_CELL:
@@ -228,28 +276,22 @@ class Board:
         points = 0
         debris_removed = 0
         
-        # Check all 4 adjacent directions for debris
-        directions = [Direction.NORTH, Direction.SOUTH, Direction.EAST, Direction.WEST]
-        
-        for direction in directions:
-            dx, dy = direction.value
-            target_pos = Coord(source_pos.x + dx, source_pos.y + dy)
+        # Check all 4 adjacent squares for debris
+        for target_pos in NEIGHBOR_COORDS[square_index(source_pos)]:
+            target_tile = self.grid[target_pos.x][target_pos.y]
             
-            if self.is_within_bounds(target_pos):
-                target_tile = self.get_tile(target_pos)
-                
-                # If there's debris, remove it
-                if target_tile and target_tile.tile_type == TileType.DEBRIS:
-                    points += target_tile.points
-                    target_tile.capture()
-                    self.grid[target_pos.x][target_pos.y] = None
-                    debris_removed += 1
-                    logger.info(f"Dendritic cell removed debris at ({target_pos.x}, {target_pos.y}) for {target_tile.points} points!")
+            # If there's debris, remove it
+            if target_tile and target_tile.tile_type == TileType.DEBRIS:
+                points += target_tile.points
+                target_tile.capture()
+                self._set_tile(target_pos.x, target_pos.y, None)
+                debris_removed += 1
+                logger.info("Dendritic cell removed debris at (%d, %d) for %d points!", target_pos.x, target_pos.y, target_tile.points)
         
         if debris_removed == 0:
             logger.info("No debris adjacent to dendritic cell to remove")
         else:
-            logger.info(f"Dendritic cell removed {debris_removed} debris piece(s) for {points} total points!")
+            logger.info("Dendritic cell removed %d debris piece(s) for %d total points!", debris_removed, points)
 
         return points
 
@@ -286,13 +328,13 @@ class Board:
         # Remove the piece from the board and award points
         points = piece_tile.points
         piece_tile.capture()
-        self.grid[pos.x][pos.y] = None
+        self._set_tile(pos.x, pos.y, None)
         
         exit_direction = "North" if pos.y == 0 else \
                         "East" if pos.x == 6 else \
                         "South" if pos.y == 6 else "West"
         
-        logger.info(f"{piece_tile.tile_type.name} escaped through {exit_direction} forest exit for {points} points!")
+        logger.info("%s escaped through %s forest exit for %d points!", piece_tile.tile_type.name, exit_direction, points)
         return points, True
 
     def escape_to_exit_position(self, source_pos: Coord, exit_pos: Coord, player) -> tuple[int, bool]:
@@ -311,13 +353,13 @@ class Board:
         # Remove the piece from the board and award points
         points = piece_tile.points
         piece_tile.capture()
-        self.grid[source_pos.x][source_pos.y] = None
+        self._set_tile(source_pos.x, source_pos.y, None)
         
         exit_direction = "North" if exit_pos.y == -1 else \
                         "East" if exit_pos.x == 7 else \
                         "South" if exit_pos.y == 7 else "West"
         
-        logger.info(f"{piece_tile.tile_type.name} escaped through {exit_direction} forest exit for {points} points!")
+        logger.info("%s escaped through %s forest exit for %d points!", piece_tile.tile_type.name, exit_direction, points)
         return points, True
 
     def _can_reach_exit_position(self, source_pos: Coord, exit_pos: Coord, piece_tile) -> bool:
@@ -335,13 +377,16 @@ class Board:
         # Check movement distance based on piece type
         total_distance = dx + dy
         
-        if piece_tile.tile_type in [TileType.VIRUS, TileType.DENDRITIC_CELL]:
+        if not can_exit(piece_tile.tile_type):
+            return False
+
+        if is_stepper(piece_tile.tile_type):
             # Can only move 1 space - must be adjacent to board edge to exit
             # For viruses/dendritic cells to reach exit position, they must be at the board edge
             edge_distance = self._distance_to_board_edge(source_pos, exit_pos)
             if edge_distance > 1:
                 return False
-        elif piece_tile.tile_type in [TileType.BACTERIA, TileType.T_CELL, TileType.RED_BLOOD_CELL]:
+        elif is_slider(piece_tile.tile_type):
             # Can move any number of spaces, check if path is clear
             if total_distance < 1:
                 return False
@@ -367,18 +412,13 @@ class Board:
 
     def _check_path_to_exit(self, source_pos: Coord, exit_pos: Coord) -> bool:
         """Check if the path from source to exit is clear (within board boundaries)."""
-        move_dx = 0 if exit_pos.x == source_pos.x else (1 if exit_pos.x > source_pos.x else -1)
-        move_dy = 0 if exit_pos.y == source_pos.y else (1 if exit_pos.y > source_pos.y else -1)
-        
-        # Check each step along the path until we reach the board edge
-        current = Coord(source_pos.x + move_dx, source_pos.y + move_dy)
+        square = square_index(source_pos)
+        direction_index = EXIT_DIRECTION.get((square, exit_pos))
+        if direction_index is None:
+            return False  # Exit is not in a straight line from the source
         
-        while self.is_within_bounds(current):
-            if (tile := self.get_tile(current)):
-                return False  # Path blocked
-            current = Coord(current.x + move_dx, current.y + move_dy)
-        
-        return True
+        # Clear if nothing stands between the source and the board edge
+        return self.blocker_distance(square, direction_index) == 0
 
     def get_valid_exit_positions(self, source_pos: Coord) -> list[Coord]:
         """
@@ -389,14 +429,12 @@ class Board:
         if not piece_tile or not piece_tile.flipped:
             return []
         
-        valid_exits = []
-        
         # Check all four edge exit positions
         edge_positions = [
-            Coord(3, 0),  # North edge
-            Coord(6, 3),  # East edge  
-            Coord(3, 6),  # South edge
-            Coord(0, 3),  # West edge
+            Coord.of(3, 0),  # North edge
+            Coord.of(6, 3),  # East edge  
+            Coord.of(3, 6),  # South edge
+            Coord.of(0, 3),  # West edge
         ]
         
         return [edge_pos for edge_pos in edge_positions
@@ -421,25 +459,17 @@ class Board:
         # Check movement distance based on piece type
         total_distance = dx + dy
         
-        if piece_tile.tile_type in [TileType.VIRUS, TileType.DENDRITIC_CELL]:
+        if is_stepper(piece_tile.tile_type):
             # Can only move 1 space - must be adjacent to edge to exit in one move
             if total_distance > 1:
                 return False
-        elif piece_tile.tile_type in [TileType.BACTERIA, TileType.T_CELL, TileType.RED_BLOOD_CELL]:
+        elif is_slider(piece_tile.tile_type):
             # Can move any number of spaces, but path must be clear
             if total_distance < 1:
                 return False
                 
-            # Check if path is clear
-            move_dx = 0 if edge_pos.x == source_pos.x else (1 if edge_pos.x > source_pos.x else -1)
-            move_dy = 0 if edge_pos.y == source_pos.y else (1 if edge_pos.y > source_pos.y else -1)
-            
-            # Check each step along the path (excluding source and target)
-            current = Coord(source_pos.x + move_dx, source_pos.y + move_dy)
-            
-            while current != edge_pos:
-                if (tile := self.get_tile(current)):
-                    return False  # Path blocked
-                current = Coord(current.x + move_dx, current.y + move_dy)
+            # Check the path (excluding source and target)
+            if not self.is_path_clear(source_pos, edge_pos):
+                return False  # Path blocked
         
         return True
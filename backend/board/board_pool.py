@@ -0,0 +1,97 @@
+import random
+import threading
+from collections import deque
+from typing import Deque, Optional
+
+from board.board import Board
+from common.logging_config import GameLogger
+from common.metrics import metrics
+
+
+POOL_HITS = metrics.counter("phage_board_pool_hits_total", "Boards served from the pre-generated pool")
+POOL_MISSES = metrics.counter("phage_board_pool_misses_total", "Boards built inline because the pool was empty")
+
+logger = GameLogger.get_module_logger("board.pool")
+
+
+class BoardPool:
+    """
+    Pool of ready-made, seeded boards that game creation takes from.
+
+    A background thread tops the pool up to `target_size` whenever it drops
+    below `low_water`. When the pool is empty (or was never started) boards are
+    built inline, so acquiring always succeeds.
+    """
+
+    def __init__(self, target_size: int = 512, low_water: Optional[int] = None, seed: Optional[int] = None):
+        self.target_size = target_size
+        self.low_water = low_water if low_water is not None else target_size // 2
+        self._seeds = random.Random(seed)
+        self._boards: Deque[Board] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def _next_seed(self) -> int:
+        with self._condition:
+            return self._seeds.getrandbits(63)
+
+    def _build(self) -> Board:
+        return Board(seed=self._next_seed())
+
+    def acquire(self) -> Board:
+        """Take a fresh board from the pool, building one inline if it is empty."""
+        try:
+            board = self._boards.popleft()
+        except IndexError:
+            POOL_MISSES.inc()
+            board = self._build()
+        else:
+            POOL_HITS.inc()
+
+        if self._running and len(self._boards) < self.low_water:
+            with self._condition:
+                self._condition.notify()
+        return board
+
+    def fill(self, count: Optional[int] = None) -> None:
+        """Synchronously add boards until the pool holds `count` (default: target size)."""
+        count = self.target_size if count is None else count
+        while len(self._boards) < count:
+            self._boards.append(self._build())
+
+    def start(self) -> None:
+        """Start the background refill thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._refill_loop, name="board-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refill thread."""
+        if not self._running:
+            return
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+
+    def _refill_loop(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: not self._running or len(self._boards) < self.low_water
+                )
+                if not self._running:
+                    return
+            # Build outside the condition so acquirers never wait on board setup
+            added = 0
+            while self._running and len(self._boards) < self.target_size:
+                self._boards.append(self._build())
+                added += 1
+            logger.debug("Board pool refilled with %d boards", added)
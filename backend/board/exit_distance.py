@@ -0,0 +1,334 @@
+"""
+Distance-to-exit fields for the escape phase.
+
+For every square, the number of actions a piece standing there needs to
+leave the forest, found as shortest paths out to the four exits over the
+empty squares. There is one field per movement model: steppers go one
+square per move and leave from the edge square next to an exit; sliders
+go any distance along a clear line and leave from any square with a
+clear line out through an exit. Captures on the way are not considered.
+
+A field is kept current square by square. When squares fill or empty,
+only the squares whose moves changed are looked at: first the distances
+that lost every shortest path out are dropped, then they and any
+distances the change shortened are relaxed again from their neighbours,
+nearest first. A field can journal its changes, so a search that undoes
+an action gets the field back as it was without searching again.
+"""
+import heapq
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from common.models.coordinate import Coord
+from common.models.direction import Direction
+from game_engine.rules import can_exit, can_move, is_slider, is_stepper
+from tile.tile_types import TileType
+from .lookup_tables import (
+    DIRECTION_INDEX, DIRECTIONS, EXIT_EDGE_SQUARES, EXIT_PATHS, FOREST_EXITS, NEIGHBORS, NUM_SQUARES, RAYS, SQUARE_COORDS, square_index,
+)
+
+# Distance of a square with no path to the exit
+UNREACHABLE = NUM_SQUARES + 1
+
+ALL_EXITS: Tuple[int, ...] = tuple(range(len(FOREST_EXITS)))
+
+# OPPOSITE_RAY[square][direction_index]: the ray from `square` the other way
+OPPOSITE_RAY: Tuple[Tuple[Tuple[int, ...], ...], ...] = tuple(
+    tuple(rays[DIRECTION_INDEX[Direction(tuple(-step for step in direction.value))]] for direction in DIRECTIONS)
+    for rays in RAYS
+)
+
+def _path_mask(path: Tuple[int, ...]) -> int:
+    return sum(1 << step for step in path)
+
+
+class Escape(NamedTuple):
+    """A piece that can reach an exit, and the nearest exit it can leave through."""
+    source: Coord
+    exit: Coord
+    distance: int
+
+
+class ExitField:
+    """
+    Actions a piece of one movement model needs to leave through any of
+    `exits`, per square, for the occupancy bitmask it was last given
+    (bit `x * 7 + y` set for every tile).
+    """
+
+    __slots__ = ("slider", "exits", "occupied", "distance", "_leaving", "_journal")
+
+    def __init__(self, occupied: int, slider: bool, exits: Tuple[int, ...] = ALL_EXITS, journaled: bool = False):
+        self.slider = slider
+        self.exits = exits
+        self.occupied = occupied
+        # _leaving[square]: masks of the squares that must be empty to leave from it in one action
+        if slider:
+            self._leaving = tuple(
+                tuple(_path_mask(EXIT_PATHS[(square, FOREST_EXITS[exit_index])]) for exit_index in exits
+                      if (square, FOREST_EXITS[exit_index]) in EXIT_PATHS)
+                for square in range(NUM_SQUARES)
+            )
+        else:
+            edges = {EXIT_EDGE_SQUARES[exit_index] for exit_index in exits}
+            self._leaving = tuple((0,) if square in edges else () for square in range(NUM_SQUARES))
+        self.distance = [UNREACHABLE] * NUM_SQUARES
+        self._journal: Optional[List[Tuple[int, int]]] = None
+        self._relax(range(NUM_SQUARES))
+        if journaled:
+            self._journal = []
+
+    def copy(self) -> "ExitField":
+        clone = ExitField.__new__(ExitField)
+        clone.slider = self.slider
+        clone.exits = self.exits
+        clone.occupied = self.occupied
+        clone.distance = self.distance[:]
+        clone._leaving = self._leaving
+        clone._journal = [] if self._journal is not None else None
+        return clone
+
+    def mark(self) -> Tuple[int, int]:
+        """A point to `rollback` to; the field must be journaled."""
+        return len(self._journal), self.occupied
+
+    def rollback(self, mark: Tuple[int, int]) -> None:
+        """Undo every change since `mark`."""
+        length, self.occupied = mark
+        journal, distance = self._journal, self.distance
+        while len(journal) > length:
+            square, previous = journal.pop()
+            distance[square] = previous
+
+    def update(self, changes: Iterable[Tuple[int, bool]]) -> None:
+        """Repair the field after each (square, now occupied) change."""
+        occupied = self.occupied
+        for square, filled in changes:
+            if filled:
+                occupied |= 1 << square
+            else:
+                occupied &= ~(1 << square)
+        if occupied == self.occupied:
+            return
+        self.occupied = occupied
+        # Only the squares a piece could move to a changed square from have other moves now:
+        # its neighbours for a stepper, the squares in line with it up to the first tile for a slider.
+        # Filling a square takes moves away, emptying one adds moves.
+        blocked, opened = [], []
+        for square, filled in changes:
+            if filled:
+                blocked.extend(self._sources(square, True))
+            else:
+                opened.append(square)
+
+        # Drop the distances left without a shortest path out, and those that relied on them
+        distance = self.distance
+        dropped = set()
+        while blocked:
+            square = blocked.pop()
+            current = distance[square]
+            if current >= UNREACHABLE or square in dropped:
+                continue
+            if current == 1:
+                if self._leaves(square):
+                    continue
+            elif any(distance[target] == current - 1 and target not in dropped for target in self._targets(square)):
+                continue
+            dropped.add(square)
+            blocked.extend(source for source in self._sources(square) if distance[source] == current + 1)
+        for square in dropped:
+            self._set(square, UNREACHABLE)
+        heap = []
+        for square in opened:
+            self._push_opened(square, heap)
+        self._relax(dropped, heap)
+
+    def _push_opened(self, square: int, heap: List[Tuple[int, int]]) -> None:
+        """Push the distances that the moves onto, or through, the emptied `square` give."""
+        occupied, distance = self.occupied, self.distance
+        if not self.slider:
+            for source in NEIGHBORS[square]:
+                heap.append((distance[square] + 1, source))
+            return
+        for ray, opposite in zip(RAYS[square], OPPOSITE_RAY[square]):
+            # Pieces along `ray` can now stop on `square` or go on past it
+            best = distance[square]
+            for target in opposite:
+                if occupied >> target & 1:
+                    break
+                if distance[target] < best:
+                    best = distance[target]
+            for source in ray:
+                heap.append((1 if self._leaves(source) else best + 1, source))
+                if occupied >> source & 1:
+                    break
+
+    def _relax(self, squares: Iterable[int], heap: Optional[List[Tuple[int, int]]] = None) -> None:
+        """
+        Lower distances, starting from what `squares` can reach now and any
+        (distance, square) already on `heap`, nearest first.
+        """
+        distance = self.distance
+        heap = heap if heap is not None else []
+        for square in squares:
+            candidate = self._candidate(square)
+            if candidate < distance[square]:
+                heap.append((candidate, square))
+        heapq.heapify(heap)
+        while heap:
+            candidate, square = heapq.heappop(heap)
+            if candidate >= distance[square]:
+                continue
+            self._set(square, candidate)
+            candidate += 1
+            for source in self._sources(square):
+                if candidate < distance[source]:
+                    heapq.heappush(heap, (candidate, source))
+
+    def _set(self, square: int, value: int) -> None:
+        if self._journal is not None:
+            self._journal.append((square, self.distance[square]))
+        self.distance[square] = value
+
+    def _leaves(self, square: int) -> bool:
+        occupied = self.occupied
+        for path in self._leaving[square]:
+            if not occupied & path:
+                return True
+        return False
+
+    def _candidate(self, square: int) -> int:
+        """Distance from `square` through its best move now, or 1 if it can leave at once."""
+        if self._leaves(square):
+            return 1
+        occupied, distance = self.occupied, self.distance
+        best = UNREACHABLE
+        if self.slider:
+            for ray in RAYS[square]:
+                for target in ray:
+                    if occupied >> target & 1:
+                        break
+                    if distance[target] < best:
+                        best = distance[target]
+        else:
+            for target in NEIGHBORS[square]:
+                if not occupied >> target & 1 and distance[target] < best:
+                    best = distance[target]
+        return best + 1 if best < UNREACHABLE else UNREACHABLE
+
+    def _targets(self, square: int) -> List[int]:
+        """Empty squares a piece on `square` can move to."""
+        occupied = self.occupied
+        if not self.slider:
+            return [target for target in NEIGHBORS[square] if not occupied >> target & 1]
+        targets = []
+        for ray in RAYS[square]:
+            for target in ray:
+                if occupied >> target & 1:
+                    break
+                targets.append(target)
+        return targets
+
+    def _sources(self, square: int, even_if_occupied: bool = False) -> List[int]:
+        """Squares a piece can move to `square` from, were it empty; none if it is occupied, unless asked."""
+        occupied = self.occupied
+        if occupied >> square & 1 and not even_if_occupied:
+            return []
+        if not self.slider:
+            return list(NEIGHBORS[square])
+        sources = []
+        for ray in RAYS[square]:
+            for source in ray:
+                sources.append(source)
+                if occupied >> source & 1:
+                    break
+        return sources
+
+
+def model_of(tile_type: TileType) -> Optional[bool]:
+    """True for a slider, False for a stepper, None if `tile_type` cannot leave the forest."""
+    if not can_exit(tile_type):
+        return None
+    if is_slider(tile_type):
+        return True
+    if is_stepper(tile_type):
+        return False
+    return None
+
+
+class ExitDistances:
+    """
+    Distance-to-exit queries for a `Board`, one field per exit and movement
+    model, kept current through `Board._set_tile` once first asked for.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.occupied = 0
+        # Movement model (slider?) -> one field per exit, in FOREST_EXITS order
+        self._fields = {}
+
+    def square_changed(self, square: int, occupied: bool) -> None:
+        if occupied:
+            self.occupied |= 1 << square
+        else:
+            self.occupied &= ~(1 << square)
+        for fields in self._fields.values():
+            for field in fields:
+                field.update(((square, occupied),))
+
+    def rebuild(self) -> None:
+        """Recompute the occupancy bitmask, e.g. after the grid was assigned directly."""
+        grid = self.board.grid
+        self.occupied = sum(1 << square for square, pos in enumerate(SQUARE_COORDS) if grid[pos.x][pos.y])
+        self._fields.clear()
+
+    def fields(self, tile_type: TileType) -> Optional[Tuple[ExitField, ...]]:
+        """The per-exit fields for the movement model of `tile_type`, or None if it cannot leave the forest."""
+        slider = model_of(tile_type)
+        if slider is None:
+            return None
+        fields = self._fields.get(slider)
+        if fields is None:
+            fields = self._fields[slider] = tuple(ExitField(self.occupied, slider, (exit_index,))
+                                                  for exit_index in ALL_EXITS)
+        return fields
+
+    def nearest(self, square: int, tile_type: TileType) -> Tuple[int, int]:
+        """(distance, exit index) of the nearest exit from `square`, the first one on ties."""
+        fields = self.fields(tile_type)
+        if not fields:
+            return UNREACHABLE, 0
+        return min((field.distance[square], exit_index) for exit_index, field in enumerate(fields))
+
+    def distance(self, pos, tile_type: TileType) -> int:
+        """Actions a piece of `tile_type` at `pos` needs to leave through the nearest exit."""
+        return self.nearest(square_index(pos), tile_type)[0]
+
+    def escapes(self, faction=None) -> List[Escape]:
+        """
+        Every face-up piece that can reach an exit, with its nearest exit,
+        nearest first. With `faction`, only the pieces that faction may move.
+        """
+        grid = self.board.grid
+        found = []
+        for square, pos in enumerate(SQUARE_COORDS):
+            tile = grid[pos.x][pos.y]
+            if not tile or not tile.flipped or (faction is not None and not can_move(faction, tile.tile_type)):
+                continue
+            distance, exit_index = self.nearest(square, tile.tile_type)
+            if distance < UNREACHABLE:
+                found.append(Escape(pos, FOREST_EXITS[exit_index], distance))
+        found.sort(key=lambda escape: escape.distance)
+        return found
+
+    def next_step(self, pos, tile_type: TileType, exit_pos) -> Optional[Coord]:
+        """A square one move from `pos` that is one action nearer to `exit_pos`, if any."""
+        fields = self.fields(tile_type)
+        if not fields:
+            return None
+        field = fields[FOREST_EXITS.index(exit_pos)]
+        square = square_index(pos)
+        for target in field._targets(square):
+            if field.distance[target] == field.distance[square] - 1:
+                return SQUARE_COORDS[target]
+        return None
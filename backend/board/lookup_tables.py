@@ -0,0 +1,117 @@
+"""
+Precomputed geometry for the 7x7 board.
+
+Squares are numbered 0..48 as `x * BOARD_SIZE + y`, matching `Board.grid[x][y]`.
+Direction-indexed tables follow the order of the `Direction` enum
+(NORTH, SOUTH, EAST, WEST).
+"""
+from typing import Dict, Optional, Tuple
+
+from common.models.coordinate import Coord
+from common.models.direction import Direction
+
+
+BOARD_SIZE = 7
+NUM_SQUARES = BOARD_SIZE * BOARD_SIZE
+CENTER_SQUARE = 3 * BOARD_SIZE + 3
+
+DIRECTIONS: Tuple[Direction, ...] = tuple(Direction)
+DIRECTION_INDEX: Dict[Direction, int] = {direction: index for index, direction in enumerate(DIRECTIONS)}
+NORTH_INDEX, SOUTH_INDEX, EAST_INDEX, WEST_INDEX = (
+    DIRECTION_INDEX[Direction.NORTH], DIRECTION_INDEX[Direction.SOUTH],
+    DIRECTION_INDEX[Direction.EAST], DIRECTION_INDEX[Direction.WEST],
+)
+
+
+def square_of(x: int, y: int) -> int:
+    """Square number of an on-board coordinate."""
+    return x * BOARD_SIZE + y
+
+
+def square_index(pos) -> Optional[int]:
+    """Square number of a position, or None if it is off the board."""
+    if 0 <= pos.x < BOARD_SIZE and 0 <= pos.y < BOARD_SIZE:
+        return pos.x * BOARD_SIZE + pos.y
+    return None
+
+
+# Square number -> Coord
+SQUARE_COORDS: Tuple[Coord, ...] = tuple(
+    Coord.of(x, y) for x in range(BOARD_SIZE) for y in range(BOARD_SIZE)
+)
+
+
+def _ray(square: int, direction: Direction) -> Tuple[int, ...]:
+    x, y = divmod(square, BOARD_SIZE)
+    dx, dy = direction.value
+    ray = []
+    x, y = x + dx, y + dy
+    while 0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE:
+        ray.append(square_of(x, y))
+        x, y = x + dx, y + dy
+    return tuple(ray)
+
+
+# RAYS[square][direction_index]: squares from the neighbor out to the edge, in order
+RAYS: Tuple[Tuple[Tuple[int, ...], ...], ...] = tuple(
+    tuple(_ray(square, direction) for direction in DIRECTIONS) for square in range(NUM_SQUARES)
+)
+RAY_COORDS: Tuple[Tuple[Tuple[Coord, ...], ...], ...] = tuple(
+    tuple(tuple(SQUARE_COORDS[s] for s in ray) for ray in rays) for rays in RAYS
+)
+
+# NEIGHBORS[square]: on-board 4-neighbors, in direction order
+NEIGHBORS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(rays[index][0] for index in range(len(DIRECTIONS)) if rays[index]) for rays in RAYS
+)
+NEIGHBOR_COORDS: Tuple[Tuple[Coord, ...], ...] = tuple(
+    tuple(SQUARE_COORDS[s] for s in neighbors) for neighbors in NEIGHBORS
+)
+
+# BETWEEN[(source, target)]: squares strictly between two aligned squares
+BETWEEN: Dict[Tuple[int, int], Tuple[int, ...]] = {
+    (square, target): ray[:distance]
+    for square in range(NUM_SQUARES)
+    for ray in RAYS[square]
+    for distance, target in enumerate(ray)
+}
+
+# ALIGNMENT[(source, target)]: (direction index, distance) between two aligned squares
+ALIGNMENT: Dict[Tuple[int, int], Tuple[int, int]] = {
+    (square, target): (index, distance + 1)
+    for square in range(NUM_SQUARES)
+    for index, ray in enumerate(RAYS[square])
+    for distance, target in enumerate(ray)
+}
+
+# Forest exits (one step outside the board) and the edge square next to each
+FOREST_EXITS: Tuple[Coord, ...] = (Coord.of(3, -1), Coord.of(7, 3), Coord.of(3, 7), Coord.of(-1, 3))
+EXIT_EDGE_SQUARES: Tuple[int, ...] = (square_of(3, 0), square_of(6, 3), square_of(3, 6), square_of(0, 3))
+EXIT_DIRECTIONS: Tuple[Direction, ...] = (Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST)
+EDGE_SQUARE_EXIT: Dict[int, Coord] = dict(zip(EXIT_EDGE_SQUARES, FOREST_EXITS))
+
+
+def _exit_on_ray(square: int, direction: Direction) -> Optional[Coord]:
+    for exit_pos, edge_square, exit_direction in zip(FOREST_EXITS, EXIT_EDGE_SQUARES, EXIT_DIRECTIONS):
+        if exit_direction == direction and (square == edge_square or edge_square in RAYS[square][DIRECTION_INDEX[direction]]):
+            return exit_pos
+    return None
+
+
+# RAY_EXIT[square][direction_index]: forest exit the ray runs into past the edge, if any
+RAY_EXIT: Tuple[Tuple[Optional[Coord], ...], ...] = tuple(
+    tuple(_exit_on_ray(square, direction) for direction in DIRECTIONS) for square in range(NUM_SQUARES)
+)
+
+# EXIT_DIRECTION[(square, exit)]: direction index of the ray from `square` leading out through `exit`
+EXIT_DIRECTION: Dict[Tuple[int, Coord], int] = {
+    (square, RAY_EXIT[square][index]): index
+    for square in range(NUM_SQUARES)
+    for index in range(len(DIRECTIONS))
+    if RAY_EXIT[square][index] is not None
+}
+
+# EXIT_PATHS[(square, exit)]: squares a slider crosses from `square` to leave through `exit`
+EXIT_PATHS: Dict[Tuple[int, Coord], Tuple[int, ...]] = {
+    key: RAYS[key[0]][index] for key, index in EXIT_DIRECTION.items()
+}
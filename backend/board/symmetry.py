@@ -0,0 +1,80 @@
+"""
+Symmetries of the board.
+
+The 7x7 board with its four forest exits in the middle of each edge is
+unchanged by the eight rotations and reflections of the square (the
+dihedral group D4). Each symmetry is stored as a permutation of square
+numbers, with matching permutations of directions and forest exits so
+that shots and exit moves turn with the board; the identity comes first.
+Tiles carry no direction of their own, so squares, directions and exits
+are all a position or an action needs.
+"""
+from typing import Callable, Tuple
+
+from common.models.action import Action
+from common.models.coordinate import Coord
+from .lookup_tables import BOARD_SIZE, DIRECTIONS, DIRECTION_INDEX, FOREST_EXITS, SQUARE_COORDS, square_of
+
+_LAST = BOARD_SIZE - 1
+
+# (x, y) -> image, for the identity, the three rotations and the four reflections
+COORD_TRANSFORMS: Tuple[Callable[[int, int], Tuple[int, int]], ...] = (
+    lambda x, y: (x, y),
+    lambda x, y: (_LAST - y, x),
+    lambda x, y: (_LAST - x, _LAST - y),
+    lambda x, y: (y, _LAST - x),
+    lambda x, y: (_LAST - x, y),
+    lambda x, y: (x, _LAST - y),
+    lambda x, y: (y, x),
+    lambda x, y: (_LAST - y, _LAST - x),
+)
+
+# SQUARE_MAPS[t][square]: image of a square under symmetry t
+SQUARE_MAPS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(square_of(*transform(pos.x, pos.y)) for pos in SQUARE_COORDS) for transform in COORD_TRANSFORMS
+)
+NUM_SYMMETRIES = len(SQUARE_MAPS)
+
+# DIRECTION_MAPS[t][direction_index]: image of a direction under symmetry t
+DIRECTION_MAPS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(
+        DIRECTIONS.index(next(
+            candidate for candidate in DIRECTIONS
+            if transform(_LAST // 2 + direction.value[0], _LAST // 2 + direction.value[1])
+            == (_LAST // 2 + candidate.value[0], _LAST // 2 + candidate.value[1])
+        ))
+        for direction in DIRECTIONS
+    )
+    for transform in COORD_TRANSFORMS
+)
+
+# EXIT_MAPS[t][exit_index]: image of a forest exit (an index into FOREST_EXITS) under symmetry t
+EXIT_MAPS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(FOREST_EXITS.index(Coord.of(*transform(exit_pos.x, exit_pos.y))) for exit_pos in FOREST_EXITS)
+    for transform in COORD_TRANSFORMS
+)
+
+# INVERSE[t]: the symmetry that undoes t
+INVERSE: Tuple[int, ...] = tuple(
+    next(inverse for inverse, back in enumerate(SQUARE_MAPS) if all(back[squares[s]] == s for s in range(len(squares))))
+    for squares in SQUARE_MAPS
+)
+
+
+def transform_coord(pos, symmetry: int) -> Coord:
+    """Image of a position under a symmetry; forest exits off the board map to forest exits."""
+    return Coord.of(*COORD_TRANSFORMS[symmetry](pos.x, pos.y))
+
+
+def transform_action(action: Action, symmetry: int) -> Action:
+    """The same action on the board turned by `symmetry`."""
+    direction = action.direction
+    if direction is not None:
+        direction = DIRECTIONS[DIRECTION_MAPS[symmetry][DIRECTION_INDEX[direction]]]
+    return Action(
+        action.type,
+        target=transform_coord(action.target, symmetry) if action.target is not None else None,
+        source=transform_coord(action.source, symmetry) if action.source is not None else None,
+        direction=direction,
+        steps=action.steps,
+    )
@@ -0,0 +1,122 @@
+"""
+Attack sets of the face-up pieces on a board.
+
+Three sets are tracked, as bitmasks over square numbers (bit `x * 7 + y`):
+
+- T cell lanes: the squares a T cell can shoot along, in each direction up
+  to and including the first tile.
+- Virus adjacency: the squares next to a virus.
+- Bacteria reach: the squares a bacterium can slide to, up to and
+  including the first tile in each direction.
+
+Each attacker's set is stored on its own, and a sliding attacker's lane
+is read off the board's occupancy masks. Face-down tiles attack nothing.
+
+A map is built on demand for the hint overlay
+(`GET /api/game/{game_id}/threats`), its only reader; search and the
+evaluator work on `Position` snapshots, so board changes do not pay to
+keep one current.
+"""
+from typing import Dict, List, Tuple
+
+from game_engine.rules import PIECE_RULES, SHOOTABLE_TYPES
+from tile.tile_types import TileType
+from .lookup_tables import NEIGHBORS, NUM_SQUARES, RAYS, SQUARE_COORDS, square_index
+
+SQUARE_BIT: Tuple[int, ...] = tuple(1 << square for square in range(NUM_SQUARES))
+NEIGHBOR_MASK: Tuple[int, ...] = tuple(
+    sum(SQUARE_BIT[neighbor] for neighbor in neighbors) for neighbors in NEIGHBORS
+)
+# RAY_PREFIX_MASK[square][direction][k]: the first k squares of the ray
+RAY_PREFIX_MASK: Tuple[Tuple[Tuple[int, ...], ...], ...] = tuple(
+    tuple(
+        tuple(sum(SQUARE_BIT[step] for step in ray[:length]) for length in range(len(ray) + 1))
+        for ray in rays
+    )
+    for rays in RAYS
+)
+
+ATTACKERS = (TileType.T_CELL, TileType.VIRUS, TileType.BACTERIA)
+SLIDING_ATTACKERS = (TileType.T_CELL, TileType.BACTERIA)
+
+# Pieces each attacker can take on a square it covers (a T cell by shooting)
+TARGETS = {
+    TileType.T_CELL: frozenset(SHOOTABLE_TYPES),
+    TileType.VIRUS: PIECE_RULES[TileType.VIRUS].captures,
+    TileType.BACTERIA: PIECE_RULES[TileType.BACTERIA].captures,
+}
+
+
+def mask_squares(mask: int) -> List[int]:
+    """Square numbers set in a bitmask, in increasing order."""
+    squares = []
+    while mask:
+        low = mask & -mask
+        squares.append(low.bit_length() - 1)
+        mask ^= low
+    return squares
+
+
+class ThreatMap:
+    """Per-attacker attack sets of a `Board`, as it stands when the map is built."""
+
+    def __init__(self, board):
+        self.board = board
+        self._attacks: Dict[TileType, Dict[int, int]] = {kind: {} for kind in ATTACKERS}
+        self._unions: Dict[TileType, int] = {}
+        grid = board.grid
+        for square, pos in enumerate(SQUARE_COORDS):
+            tile = grid[pos.x][pos.y]
+            kind = getattr(tile, "tile_type", None)
+            if kind in self._attacks and getattr(tile, "flipped", False):
+                attacks = NEIGHBOR_MASK[square] if kind == TileType.VIRUS else self._lane_mask(square)
+                self._attacks[kind][square] = attacks
+
+    def _lane_mask(self, square: int) -> int:
+        mask = 0
+        prefixes = RAY_PREFIX_MASK[square]
+        for direction_index, ray in enumerate(RAYS[square]):
+            blocker = self.board.blocker_distance(square, direction_index)
+            mask |= prefixes[direction_index][blocker or len(ray)]
+        return mask
+
+    def attacked_by(self, kind: TileType) -> int:
+        """Union of the attack sets of every face-up piece of `kind`."""
+        union = self._unions.get(kind)
+        if union is None:
+            union = 0
+            for mask in self._attacks[kind].values():
+                union |= mask
+            self._unions[kind] = union
+        return union
+
+    @property
+    def t_cell_lanes(self) -> int:
+        return self.attacked_by(TileType.T_CELL)
+
+    @property
+    def virus_adjacent(self) -> int:
+        return self.attacked_by(TileType.VIRUS)
+
+    @property
+    def bacteria_reach(self) -> int:
+        return self.attacked_by(TileType.BACTERIA)
+
+    def attackers_of(self, pos) -> List[Tuple[int, TileType]]:
+        """(square, type) of every face-up attacker whose set covers `pos`."""
+        bit = SQUARE_BIT[square_index(pos)]
+        return [(square, kind) for kind, attacks in self._attacks.items()
+                for square, mask in attacks.items() if mask & bit]
+
+    def threatened(self) -> int:
+        """Face-up pieces standing on a square covered by an attacker that can take them."""
+        mask = 0
+        grid = self.board.grid
+        for kind in ATTACKERS:
+            targets = TARGETS[kind]
+            for square in mask_squares(self.attacked_by(kind)):
+                pos = SQUARE_COORDS[square]
+                tile = grid[pos.x][pos.y]
+                if tile and tile.flipped and tile.tile_type in targets:
+                    mask |= SQUARE_BIT[square]
+        return mask
@@ -1,45 +1,157 @@
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from typing import Optional
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+ROOT_LOGGER_NAME = "de_beer_is_los"
+
+# Level above CRITICAL, used to switch a logger off entirely
+SILENT = logging.CRITICAL + 10
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves %-style formatting to the listener thread.
+    Log arguments are expected to be immutable values (names, numbers, coordinates).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info or record.stack_info:
+            # Tracebacks must be rendered while they are still alive
+            return super().prepare(record)
+        return record
+
 
 class GameLogger:
     """Centralized logging configuration for the game engine."""
-    
+
     _logger: Optional[logging.Logger] = None
-    
+    _listener: Optional[logging.handlers.QueueListener] = None
+
     @classmethod
-    def setup_logger(cls, name: str = "de_beer_is_los", level: int = logging.INFO) -> logging.Logger:
+    def setup_logger(cls, name: str = ROOT_LOGGER_NAME, level: int = logging.INFO) -> logging.Logger:
         """Set up and return the game logger."""
         if cls._logger is not None:
             return cls._logger
-        
+
         cls._logger = logging.getLogger(name)
         cls._logger.setLevel(level)
-        
+
         # Avoid duplicate handlers
         if cls._logger.handlers:
             return cls._logger
-        
+
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(level)
-        
+
         # Formatter
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         console_handler.setFormatter(formatter)
-        
+
         cls._logger.addHandler(console_handler)
-        
+
+        # Optional environment configuration, e.g.
+        # PHAGE_LOG_LEVELS="board=WARNING,player=ERROR" PHAGE_LOG_QUEUE=1
+        if os.environ.get("PHAGE_LOG_LEVELS"):
+            cls.configure_levels(cls.parse_levels(os.environ["PHAGE_LOG_LEVELS"]))
+        if os.environ.get("PHAGE_LOG_QUEUE", "").lower() in ("1", "true", "yes"):
+            cls.enable_queue_logging()
+
         return cls._logger
-    
+
     @classmethod
-    def get_logger(cls, name: str = "de_beer_is_los") -> logging.Logger:
+    def get_logger(cls, name: str = ROOT_LOGGER_NAME) -> logging.Logger:
         """Get the configured logger instance."""
         if cls._logger is None:
             return cls.setup_logger(name)
         return cls._logger
 
+    @classmethod
+    def get_module_logger(cls, module: str) -> logging.Logger:
+        """
+        Get the logger for a game module (e.g. "board", "player.ai").
+        Module loggers share the game logger's handlers but can have their own level.
+        """
+        return cls.get_logger().getChild(module)
+
+    @staticmethod
+    def parse_levels(spec: str) -> Dict[str, int]:
+        """
+        Parse a "module=LEVEL,module=LEVEL" spec. The module "*" is the game logger itself.
+        Raises ValueError for a level name logging does not know.
+        """
+        levels = {}
+        for entry in spec.split(","):
+            if not entry.strip():
+                continue
+            module, _, level_name = entry.partition("=")
+            level_name = level_name.strip().upper()
+            level = SILENT if level_name == "OFF" else logging.getLevelName(level_name)
+            if not isinstance(level, int):
+                raise ValueError(f"Unknown log level {level_name!r} for {module.strip() or '*'!r}")
+            levels[module.strip()] = level
+        return levels
+
+    @classmethod
+    def configure_levels(cls, levels: Dict[str, int]) -> None:
+        """Set per-module log levels, e.g. {"board": logging.WARNING, "*": logging.INFO}."""
+        root = cls.get_logger()
+        for module, level in levels.items():
+            target = root if module in ("*", "") else root.getChild(module)
+            target.setLevel(level)
+
+    @classmethod
+    def enable_queue_logging(cls) -> None:
+        """
+        Route all game log records through a queue drained by a listener thread,
+        so callers on the game hot path never block on stream writes.
+        """
+        if cls._listener is not None:
+            return
+        root = cls.get_logger()
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        handlers = list(root.handlers)
+        for handler in handlers:
+            root.removeHandler(handler)
+        root.addHandler(_DeferredQueueHandler(log_queue))
+
+        cls._listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        cls._listener.start()
+
+    @classmethod
+    def disable_queue_logging(cls) -> None:
+        """Flush the queue, stop the listener thread and restore direct handlers."""
+        if cls._listener is None:
+            return
+        listener, cls._listener = cls._listener, None
+        listener.stop()
+
+        root = cls.get_logger()
+        for handler in list(root.handlers):
+            if isinstance(handler, _DeferredQueueHandler):
+                root.removeHandler(handler)
+        for handler in listener.handlers:
+            root.addHandler(handler)
+
+
+@contextmanager
+def quiet_logging(level: int = SILENT):
+    """Raise the game logger's level for the duration of a block (self-play, simulations)."""
+    root = GameLogger.get_logger()
+    previous = root.level
+    root.setLevel(level)
+    try:
+        yield
+    finally:
+        root.setLevel(previous)
+
+
 # Initialize the logger
-logger = GameLogger.get_logger()
\ No newline at end of file
+logger = GameLogger.get_logger()
@@ -0,0 +1,230 @@
+import threading
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Latency buckets in seconds, from 50 microseconds up to 5 seconds
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+class Histogram:
+    """A single histogram series with fixed upper bounds."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> "_Timer":
+        """Context manager observing the elapsed wall time of its block."""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(perf_counter() - self.start)
+        return False
+
+
+class Counter:
+    """A single monotonically increasing counter series."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class MetricFamily:
+    """A named metric with zero or more label dimensions."""
+
+    def __init__(self, name: str, help_text: str, metric_type: str,
+                 label_names: Tuple[str, ...] = (), factory: Callable = None,
+                 callback: Callable[[], Dict[Tuple[str, ...], float]] = None):
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self.label_names = label_names
+        self._factory = factory
+        self._callback = callback
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Return the series for the given label values, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def series(self) -> Iterable[Tuple[Tuple[str, ...], object]]:
+        if self._callback is not None:
+            return list(self._callback().items())
+        return list(self._children.items())
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    In-process metrics in the Prometheus text exposition format.
+    Observations are a bisect plus a short critical section, cheap enough to leave on.
+    """
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        with self._lock:
+            existing = self._families.get(family.name)
+            if existing is not None:
+                return existing
+            self._families[family.name] = family
+            return family
+
+    def histogram(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """Register a histogram. Without labels the series itself is returned."""
+        family = self._register(
+            MetricFamily(name, help_text, "histogram", label_names, lambda: Histogram(buckets))
+        )
+        return family if label_names else family.labels()
+
+    def counter(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        """Register a counter. Without labels the series itself is returned."""
+        family = self._register(MetricFamily(name, help_text, "counter", label_names, Counter))
+        return family if label_names else family.labels()
+
+    def gauge_callback(self, name: str, help_text: str, label_names: Tuple[str, ...],
+                       callback: Callable[[], Dict[Tuple[str, ...], float]]) -> MetricFamily:
+        """Register a gauge whose series are read from `callback` at scrape time."""
+        return self._register(
+            MetricFamily(name, help_text, "gauge", label_names, callback=callback)
+        )
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format."""
+        lines: List[str] = []
+        for family in list(self._families.values()):
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.metric_type}")
+            for values, series in family.series():
+                if family.metric_type == "histogram":
+                    cumulative = 0
+                    bounds = list(series.buckets) + [float("inf")]
+                    for bound, count in zip(bounds, list(series.counts)):
+                        cumulative += count
+                        labels = _format_labels(family.label_names, values, f'le="{_format_value(bound)}"')
+                        lines.append(f"{family.name}_bucket{labels} {cumulative}")
+                    labels = _format_labels(family.label_names, values)
+                    lines.append(f"{family.name}_sum{labels} {_format_value(series.sum)}")
+                    lines.append(f"{family.name}_count{labels} {series.count}")
+                elif family.metric_type == "counter":
+                    labels = _format_labels(family.label_names, values)
+                    lines.append(f"{family.name}{labels} {_format_value(series.value)}")
+                else:
+                    labels = _format_labels(family.label_names, values)
+                    lines.append(f"{family.name}{labels} {_format_value(series)}")
+        return "\n".join(lines) + "\n"
+
+
+def timed(histogram: Histogram):
+    """Decorator observing the wall time of every call to the wrapped function."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(perf_counter() - start)
+        return wrapper
+
+    return decorator
+
+
+class TimedRLock:
+    """
+    Reentrant lock recording how long callers wait for it and how long it is held.
+    Only the outermost acquire/release of the owning thread is measured.
+    """
+
+    def __init__(self, wait_histogram: Histogram, hold_histogram: Histogram):
+        self._lock = threading.RLock()
+        self._wait = wait_histogram
+        self._hold = hold_histogram
+        # Only touched by the thread holding the lock
+        self._depth = 0
+        self._acquired_at = 0.0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            self._depth += 1
+            if self._depth == 1:
+                now = perf_counter()
+                self._wait.observe(now - start)
+                self._acquired_at = now
+        return acquired
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._hold.observe(perf_counter() - self._acquired_at)
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+# Process-wide registry exported by the API's /metrics endpoint
+metrics = MetricsRegistry()
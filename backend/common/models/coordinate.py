@@ -1,30 +1,96 @@
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError
 from typing import List
 
-@dataclass(frozen=True)
+# Coordinates from -1 to 7 on both axes (the 7x7 board, its forest exits and
+# the ring just outside the edge) are interned: one shared instance each.
+_INTERN_MIN = -1
+_INTERN_MAX = 7
+_INTERN_SPAN = _INTERN_MAX - _INTERN_MIN + 1
+
+
 class Coord:
-    x: int
-    y: int
+    """
+    Immutable board coordinate.
+
+    Coordinates on or next to the board are flyweights: `Coord(x, y)` and
+    `Coord.of(x, y)` return the same shared instance for a given square, so
+    probing squares allocates nothing. Other coordinates are built on demand.
+    """
+
+    __slots__ = ("x", "y", "_hash")
+
+    def __new__(cls, x: int, y: int) -> "Coord":
+        return Coord.of(x, y)
+
+    @staticmethod
+    def of(x: int, y: int) -> "Coord":
+        """Return the coordinate (x, y), shared for squares on or next to the board."""
+        if _INTERN_MIN <= x <= _INTERN_MAX and _INTERN_MIN <= y <= _INTERN_MAX:
+            return _INTERNED[(x - _INTERN_MIN) * _INTERN_SPAN + (y - _INTERN_MIN)]
+        return Coord._create(x, y)
+
+    @staticmethod
+    def _create(x: int, y: int) -> "Coord":
+        coord = object.__new__(Coord)
+        object.__setattr__(coord, "x", x)
+        object.__setattr__(coord, "y", y)
+        object.__setattr__(coord, "_hash", hash((x, y)))
+        return coord
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if other.__class__ is not Coord:
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Coord(x={self.x!r}, y={self.y!r})"
+
+    def __reduce__(self):
+        return Coord.of, (self.x, self.y)
+
+    def __copy__(self) -> "Coord":
+        return self
+
+    def __deepcopy__(self, memo) -> "Coord":
+        return self
 
     def moved(self, dx: int, dy: int) -> "Coord":
-        return Coord(self.x + dx, self.y + dy)
+        return Coord.of(self.x + dx, self.y + dy)
 
     def neighbors4(self, board_size) -> List["Coord"]:
         if self.x < 0 or self.x >= board_size or self.y < 0 or self.y >= board_size:
             raise ValueError("Coordinate out of board bounds.")
-        
+
         neighbors = []
         if self.x > 0:
             # Up
-            neighbors.append(Coord(self.x - 1, self.y))
+            neighbors.append(Coord.of(self.x - 1, self.y))
         if self.x < board_size - 1:
             # Down
-            neighbors.append(Coord(self.x + 1, self.y))
+            neighbors.append(Coord.of(self.x + 1, self.y))
         if self.y > 0:
             # Left
-            neighbors.append(Coord(self.x, self.y - 1))
+            neighbors.append(Coord.of(self.x, self.y - 1))
         if self.y < board_size - 1:
             # Right
-            neighbors.append(Coord(self.x, self.y + 1))
+            neighbors.append(Coord.of(self.x, self.y + 1))
 
         return neighbors
+
+
+_INTERNED = tuple(
+    Coord._create(x, y)
+    for x in range(_INTERN_MIN, _INTERN_MAX + 1)
+    for y in range(_INTERN_MIN, _INTERN_MAX + 1)
+)
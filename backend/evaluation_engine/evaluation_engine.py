@@ -0,0 +1,49 @@
+"""
+Static evaluation of positions for search.
+
+Values are in game points from one player's side: the score difference,
+plus a share of the points the pieces on the board could still bring in.
+A finished game is worth WIN_VALUE to the winner on top of the margin.
+"""
+from board.exit_distance import UNREACHABLE
+from game_engine.models.game_phase import GamePhase
+from game_engine.position import MOVABLE, POINTS, STEPPERS, Position
+
+WIN_VALUE = 1000.0
+
+# Share of a piece's points credited in the escape phase for a piece that
+# can leave next turn; a piece further out gets this divided by the actions
+# it needs, but never less than MATERIAL_WEIGHT
+EXIT_WEIGHT = 0.5
+# Share credited for any other face-up piece the player alone can move
+MATERIAL_WEIGHT = 0.1
+
+
+def evaluate(position: Position, player: int) -> float:
+    """Value of `position` for player index `player`."""
+    scores = position.scores
+    margin = scores[player] - scores[1 - player]
+    if position.phase == GamePhase.FINISHED:
+        return margin + (WIN_VALUE if position.winner == player else -WIN_VALUE)
+
+    own, other = MOVABLE[player], MOVABLE[1 - player]
+    escape_phase = position.phase == GamePhase.ESCAPE
+    value = float(margin)
+    types, face_down = position.types, position.face_down
+    if escape_phase:
+        step_field, slide_field = position.exit_fields()
+        step_distance, slide_distance = step_field.distance, slide_field.distance
+    for square, code in enumerate(types):
+        if not code or face_down[square]:
+            continue
+        mine, theirs = code in own, code in other
+        if mine == theirs:
+            # Empty, unmovable, or a red blood cell either side may take
+            continue
+        weight = MATERIAL_WEIGHT
+        if escape_phase:
+            distance = (step_distance if code in STEPPERS else slide_distance)[square]
+            if distance < UNREACHABLE:
+                weight = max(EXIT_WEIGHT / distance, MATERIAL_WEIGHT)
+        value += weight * POINTS[code] if mine else -weight * POINTS[code]
+    return value
@@ -0,0 +1,126 @@
+"""
+Packed integer encoding of actions.
+
+An action code is a small int laid out as
+
+    bits 0-2    kind: the ActionType's position in the enum
+    bits 3-8    square: the tile that acts (the source of a move or escape,
+                the target of a flip, shot or cut)
+    bits 9-14   argument: the target square of a move, or NUM_SQUARES + the
+                FOREST_EXITS index for a move out of an exit; the direction
+                index of a shot; 0 for the other kinds
+
+so every action fits in 16 bits. Move generation, search tables and logs
+keep codes; `decode` turns one into an engine `Action` only at the edges,
+and returns the same frozen instance for the same code.
+"""
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from board.lookup_tables import (
+    BOARD_SIZE, DIRECTION_INDEX, DIRECTIONS, FOREST_EXITS, NUM_SQUARES, SQUARE_COORDS, square_index,
+)
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+
+ACTION_KINDS = tuple(ActionType)
+KIND_CODE = {kind: code for code, kind in enumerate(ACTION_KINDS)}
+FLIP, MOVE, SHOOT, CUT, ESCAPE = (KIND_CODE[kind] for kind in
+                                  (ActionType.FLIP, ActionType.MOVE, ActionType.SHOOT,
+                                   ActionType.CUT, ActionType.ESCAPE))
+
+SQUARE_SHIFT = 3
+ARGUMENT_SHIFT = 9
+KIND_MASK = (1 << SQUARE_SHIFT) - 1
+FIELD_MASK = (1 << (ARGUMENT_SHIFT - SQUARE_SHIFT)) - 1
+CODE_BITS = 16
+
+
+def pack(kind: int, square: int, argument: int = 0) -> int:
+    """Code for a kind, acting square and argument."""
+    return kind | square << SQUARE_SHIFT | argument << ARGUMENT_SHIFT
+
+
+def unpack(code: int) -> Tuple[int, int, int]:
+    """(kind, square, argument) of a code."""
+    return code & KIND_MASK, code >> SQUARE_SHIFT & FIELD_MASK, code >> ARGUMENT_SHIFT
+
+
+def _square(pos) -> int:
+    square = square_index(pos)
+    if square is None:
+        raise ValueError(f"{pos} is off the board")
+    return square
+
+
+def _target_code(pos) -> int:
+    """Square number of an on-board target, or the exit code of a forest exit."""
+    if 0 <= pos.x < BOARD_SIZE and 0 <= pos.y < BOARD_SIZE:
+        return square_index(pos)
+    exit_pos = Coord.of(pos.x, pos.y)
+    if exit_pos not in FOREST_EXITS:
+        raise ValueError(f"{pos} is neither a square nor a forest exit")
+    return NUM_SQUARES + FOREST_EXITS.index(exit_pos)
+
+
+def encode(action: Action) -> int:
+    """
+    Code for an engine action. Raises ValueError if the action is missing the
+    fields its kind needs or names a position off the board.
+    """
+    kind = KIND_CODE[action.type]
+    if kind == MOVE:
+        if action.source is None or action.target is None:
+            raise ValueError("a move needs a source and a target")
+        return pack(kind, _square(action.source), _target_code(action.target))
+    if kind == ESCAPE:
+        if action.source is None:
+            raise ValueError("an escape needs a source")
+        return pack(kind, _square(action.source))
+    # Flips, shots and cuts act on their target; a shot given only a source fires from there
+    pos = action.target if action.target is not None else action.source
+    if pos is None:
+        raise ValueError(f"a {action.type.value} needs a target")
+    if kind == SHOOT:
+        if action.direction not in DIRECTION_INDEX:
+            raise ValueError("a shot needs a direction")
+        return pack(kind, _square(pos), DIRECTION_INDEX[action.direction])
+    return pack(kind, _square(pos))
+
+
+@lru_cache(maxsize=None)
+def decode(code: int) -> Action:
+    """Engine action for a code. Raises ValueError for a code no action packs to."""
+    kind, square, argument = unpack(code)
+    if kind >= len(ACTION_KINDS) or square >= NUM_SQUARES or code >> CODE_BITS:
+        raise ValueError(f"invalid action code {code}")
+    coord = SQUARE_COORDS[square]
+    action_type = ACTION_KINDS[kind]
+    if kind == MOVE:
+        if argument >= NUM_SQUARES + len(FOREST_EXITS):
+            raise ValueError(f"invalid action code {code}")
+        target = SQUARE_COORDS[argument] if argument < NUM_SQUARES else FOREST_EXITS[argument - NUM_SQUARES]
+        return Action(action_type, source=coord, target=target)
+    if kind == SHOOT:
+        if argument >= len(DIRECTIONS):
+            raise ValueError(f"invalid action code {code}")
+        return Action(action_type, target=coord, direction=DIRECTIONS[argument])
+    if argument:
+        raise ValueError(f"invalid action code {code}")
+    if kind == ESCAPE:
+        return Action(action_type, source=coord)
+    return Action(action_type, target=coord)
+
+
+def describe(code: Optional[int]) -> str:
+    """Short text for logs, e.g. 'move 3,4->3,5', 'shoot 1,1 NORTH' or 'flip 0,6'."""
+    if code is None:
+        return "pass"
+    action = decode(code)
+    if action.type == ActionType.MOVE:
+        return f"move {action.source.x},{action.source.y}->{action.target.x},{action.target.y}"
+    if action.type == ActionType.ESCAPE:
+        return f"escape {action.source.x},{action.source.y}"
+    if action.type == ActionType.SHOOT:
+        return f"shoot {action.target.x},{action.target.y} {action.direction.name}"
+    return f"{action.type.value} {action.target.x},{action.target.y}"
@@ -0,0 +1,454 @@
+"""
+Batched simulation engine for self-play.
+
+Holds N games as NumPy arrays of shape (N, 7, 7) and advances all of them one
+action per step with vectorized operations. The rules mirror
+`GameRulesValidator` and `GameEngine.apply_action` exactly; the object engine
+stays the reference and `tests/test_batched_engine.py` plays both side by side.
+
+Actions are indices into a fixed table of every structurally possible action
+(`ACTIONS`); -1 passes the turn. Player 0 is PLAYER1 (immune system),
+player 1 is PLAYER2 (pathogens).
+
+Requires numpy, which the API server itself does not need; it is listed in
+requirements-sim.txt.
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from board.board import PIECE_DISTRIBUTION, PIECE_POINTS
+from board.lookup_tables import (
+    BETWEEN, CENTER_SQUARE, DIRECTIONS, EXIT_EDGE_SQUARES, EXIT_PATHS, FOREST_EXITS,
+    NEIGHBORS, NUM_SQUARES, RAYS, SQUARE_COORDS, square_index,
+)
+from common.models.action import Action, ActionType
+from tile.tile_types import TileOwner
+from .action_codes import CUT, ESCAPE, FLIP, MOVE, SHOOT
+from .models.game_phase import GamePhase
+from .rules import (
+    CAPTURE_MASK, DEBRIS, DENDRITIC_CELL, EMPTY, EXIT_MASK, MOVABLE_MASK, RED_BLOOD_CELL, SHOOTABLE_MASK,
+    STEP_MASK, T_CELL, TILE_CODE, TILE_TYPES,
+)
+
+
+OWNERS = tuple(TileOwner)
+OWNER_CODE = {owner: code for code, owner in enumerate(OWNERS)}
+
+PHASES = (GamePhase.FLIP, GamePhase.ESCAPE, GamePhase.FINISHED)
+FLIP_PHASE, ESCAPE_PHASE, FINISHED_PHASE = range(len(PHASES))
+ESCAPE_ROUNDS = 5
+
+
+# Padding cell: index NUM_SQUARES is an always-empty square appended to every board
+PAD = NUM_SQUARES
+
+POINTS = np.array([PIECE_POINTS.get(tile_type, 0) for tile_type in TILE_TYPES], dtype=np.int32)
+
+
+def _mask_array(mask: int) -> np.ndarray:
+    return np.array([bool(mask >> code & 1) for code in range(len(TILE_TYPES))])
+
+
+# Compiled piece rules (game_engine.rules) as boolean lookup arrays
+# MOVABLE[player, tile]: pieces each player may move
+MOVABLE = np.array([_mask_array(mask) for mask in MOVABLE_MASK])
+# CAPTURES[attacker, target]
+CAPTURES = np.array([_mask_array(CAPTURE_MASK[code]) for code in range(len(TILE_TYPES))])
+CAPTURES_FLAT = CAPTURES.ravel()
+# Pieces that move one square; the rest slide any distance
+STEPPER = _mask_array(STEP_MASK)
+SHOOTABLE = _mask_array(SHOOTABLE_MASK)
+# Pieces that may leave through a forest exit
+EXITABLE = _mask_array(EXIT_MASK)
+
+# NEIGHBOR_CELLS[square]: the 4-neighbors, padded with PAD
+NEIGHBOR_CELLS = np.full((NUM_SQUARES + 1, 4), PAD, dtype=np.int64)
+for _square, _neighbors in enumerate(NEIGHBORS):
+    NEIGHBOR_CELLS[_square, :len(_neighbors)] = _neighbors
+
+SQUARE_BITS = np.left_shift(np.uint64(1), np.arange(NUM_SQUARES + 1, dtype=np.uint64))
+SQUARE_BITS[PAD] = 0
+NEIGHBOR_MASK = np.bitwise_or.reduce(SQUARE_BITS[NEIGHBOR_CELLS], axis=1)
+
+_PATH_WIDTH = 6
+
+
+def _bitboard(squares: np.ndarray) -> np.ndarray:
+    """(G, 49) square flags -> (G, 1) uint64 bitboards."""
+    return np.bitwise_or.reduce(np.where(squares, SQUARE_BITS[:NUM_SQUARES], np.uint64(0)), axis=1, keepdims=True)
+
+
+def _build_action_table():
+    actions, rows = [], []
+
+    def add(action, kind, source, target=-1, direction=-1, path=(), step=False):
+        actions.append(action)
+        rows.append((kind, source, target, direction, tuple(path), step))
+
+    for square, coord in enumerate(SQUARE_COORDS):
+        add(Action(ActionType.FLIP, target=coord), FLIP, square)
+    for square, coord in enumerate(SQUARE_COORDS):
+        add(Action(ActionType.CUT, target=coord), CUT, square)
+    for square, coord in enumerate(SQUARE_COORDS):
+        for index, direction in enumerate(DIRECTIONS):
+            add(Action(ActionType.SHOOT, target=coord, direction=direction), SHOOT, square,
+                direction=index, path=RAYS[square][index])
+    for square in EXIT_EDGE_SQUARES:
+        add(Action(ActionType.ESCAPE, source=SQUARE_COORDS[square]), ESCAPE, square)
+    for (square, target), between in BETWEEN.items():
+        add(Action(ActionType.MOVE, source=SQUARE_COORDS[square], target=SQUARE_COORDS[target]),
+            MOVE, square, target, path=between, step=not between)
+    for (square, exit_pos), path in EXIT_PATHS.items():
+        add(Action(ActionType.MOVE, source=SQUARE_COORDS[square], target=exit_pos),
+            MOVE, square, NUM_SQUARES + FOREST_EXITS.index(exit_pos), path=path,
+            step=square == EXIT_EDGE_SQUARES[FOREST_EXITS.index(exit_pos)])
+    return tuple(actions), rows
+
+
+ACTIONS, _rows = _build_action_table()
+NUM_ACTIONS = len(ACTIONS)
+ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+ACTION_KIND = np.array([row[0] for row in _rows], dtype=np.int8)
+ACTION_SOURCE = np.array([row[1] for row in _rows], dtype=np.int64)
+# Board square or NUM_SQUARES + exit index for moves, -1 otherwise
+ACTION_TARGET = np.array([row[2] for row in _rows], dtype=np.int64)
+# Cell read for the target: the square itself, or PAD for exits and non-moves
+ACTION_CELL = np.where((ACTION_TARGET >= 0) & (ACTION_TARGET < NUM_SQUARES), ACTION_TARGET, PAD)
+ACTION_DIRECTION = np.array([row[3] for row in _rows], dtype=np.int8)
+# Squares that must be empty for a move, or the shooting ray in order; padded with PAD
+ACTION_PATH = np.full((NUM_ACTIONS, _PATH_WIDTH), PAD, dtype=np.int64)
+for _index, _row in enumerate(_rows):
+    ACTION_PATH[_index, :len(_row[4])] = _row[4]
+ACTION_PATH_MASK = np.bitwise_or.reduce(SQUARE_BITS[ACTION_PATH], axis=1)
+# Moves a one-square piece can make: distance 1, or off the board from the exit's edge square
+ACTION_STEP = np.array([row[5] for row in _rows], dtype=bool)
+ACTION_TO_EXIT = ACTION_TARGET >= NUM_SQUARES
+del _rows
+
+# The table is laid out in blocks: flips and cuts by square, shots by square then
+# direction, escapes by exit, then moves
+FLIP_ACTIONS = slice(0, NUM_SQUARES)
+CUT_ACTIONS = slice(NUM_SQUARES, 2 * NUM_SQUARES)
+SHOOT_ACTIONS = slice(2 * NUM_SQUARES, 2 * NUM_SQUARES + NUM_SQUARES * len(DIRECTIONS))
+ESCAPE_ACTIONS = slice(SHOOT_ACTIONS.stop, SHOOT_ACTIONS.stop + len(EXIT_EDGE_SQUARES))
+BOARD_MOVE_ACTIONS = slice(ESCAPE_ACTIONS.stop, ESCAPE_ACTIONS.stop + len(BETWEEN))
+EXIT_MOVE_ACTIONS = slice(BOARD_MOVE_ACTIONS.stop, NUM_ACTIONS)
+BOARD_MOVE_SOURCE = ACTION_SOURCE[BOARD_MOVE_ACTIONS]
+BOARD_MOVE_TARGET = ACTION_TARGET[BOARD_MOVE_ACTIONS]
+BOARD_MOVE_PATH_MASK = ACTION_PATH_MASK[BOARD_MOVE_ACTIONS]
+EXIT_MOVE_SOURCE = ACTION_SOURCE[EXIT_MOVE_ACTIONS]
+
+# PAIR_RULES[mover code << 4 | target code] for on-board moves. The mover code
+# packs the tile code with "owned" (bit 3) and "free of red blood cell
+# restrictions" (bit 4); the target code packs the tile code with "face up" (bit 3).
+# STEP_OK marks moves legal at distance one, SLIDE_OK moves legal along any clear path.
+STEP_OK, SLIDE_OK = 1, 2
+PAIR_RULES = np.zeros(1 << 9, dtype=np.uint8)
+for _mover in range(1, len(TILE_TYPES)):
+    for _target in range(len(TILE_TYPES)):
+        if _target != EMPTY and not CAPTURES[_mover, _target]:
+            continue
+        for _target_face_up in (0, 1):
+            if _target != EMPTY and not _target_face_up:
+                continue
+            _code = ((_mover | 8 | 16) << 4) | _target | (_target_face_up << 3)
+            PAIR_RULES[_code] = STEP_OK if STEPPER[_mover] else STEP_OK | SLIDE_OK
+# Distance-one moves accept either kind of mover; longer ones need a slider (and a clear path)
+BOARD_MOVE_ALLOWED = np.where(ACTION_STEP[BOARD_MOVE_ACTIONS], STEP_OK | SLIDE_OK, SLIDE_OK).astype(np.uint8)
+
+
+class BatchedEngine:
+    """
+    N games advanced in lockstep.
+
+    Board arrays are (N, 7, 7) and indexed [game, x, y] like `Board.grid`:
+    `types` and `factions` hold tile and owner codes, `flipped` the face-up
+    flags, and `previous`, `moved_by` and `revealed_by` the movement
+    restrictions (previous square, player index, or -1).
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        shape = (n, 7, 7)
+        self.types = np.zeros(shape, dtype=np.int8)
+        self.factions = np.zeros(shape, dtype=np.int8)
+        self.flipped = np.zeros(shape, dtype=bool)
+        self.previous = np.full(shape, -1, dtype=np.int8)
+        self.moved_by = np.full(shape, -1, dtype=np.int8)
+        self.revealed_by = np.full(shape, -1, dtype=np.int8)
+
+        self.current = np.zeros(n, dtype=np.int8)
+        self.phase = np.full(n, FLIP_PHASE, dtype=np.int8)
+        self.rounds_remaining = np.zeros(n, dtype=np.int8)
+        self.scores = np.zeros((n, 2), dtype=np.int32)
+        self.turn = np.zeros(n, dtype=np.int32)
+        self.winner = np.full(n, -1, dtype=np.int8)
+
+    @classmethod
+    def new(cls, n: int, seed: Optional[int] = None) -> "BatchedEngine":
+        """N fresh games with random layouts drawn from the standard piece distribution."""
+        pieces = []
+        for tile_type, owner, count in PIECE_DISTRIBUTION:
+            pieces.extend([(TILE_CODE[tile_type], OWNER_CODE[owner])] * count)
+        codes = np.array(pieces, dtype=np.int8)
+
+        rng = np.random.default_rng(seed)
+        order = rng.permuted(np.tile(np.arange(len(codes)), (n, 1)), axis=1)
+        layout = np.insert(codes[order], CENTER_SQUARE, [EMPTY, OWNER_CODE[TileOwner.NONE]], axis=1)
+
+        engine = cls(n)
+        engine.types[:] = layout[:, :, 0].reshape(n, 7, 7)
+        engine.factions[:] = layout[:, :, 1].reshape(n, 7, 7)
+        return engine
+
+    @classmethod
+    def from_engines(cls, engines: Sequence) -> "BatchedEngine":
+        """Snapshot two-player `GameEngine`s into a batch."""
+        batch = cls(len(engines))
+        for index, engine in enumerate(engines):
+            players = {id(player): number for number, player in enumerate(engine.players)}
+            for x, column in enumerate(engine.board.grid):
+                for y, tile in enumerate(column):
+                    if not tile:
+                        continue
+                    batch.types[index, x, y] = TILE_CODE[tile.tile_type]
+                    batch.factions[index, x, y] = OWNER_CODE[tile.faction]
+                    batch.flipped[index, x, y] = tile.flipped
+                    if tile.previous_position is not None:
+                        batch.previous[index, x, y] = square_index(tile.previous_position)
+                    batch.moved_by[index, x, y] = players.get(id(tile.last_moved_by), -1)
+                    batch.revealed_by[index, x, y] = players.get(id(tile.last_revealed_by), -1)
+            batch.current[index] = engine.current_player_turn_index
+            batch.phase[index] = PHASES.index(engine.phase)
+            batch.rounds_remaining[index] = engine.rounds_remaining or 0
+            batch.scores[index] = [engine.scores[player.name] for player in engine.players]
+            batch.turn[index] = engine.current_turn
+            if engine.winner is not None:
+                batch.winner[index] = players[id(engine.winner)]
+        return batch
+
+    @property
+    def active(self) -> np.ndarray:
+        """Games that are not finished."""
+        return self.phase != FINISHED_PHASE
+
+    def _flat(self, array: np.ndarray) -> np.ndarray:
+        return array.reshape(self.n, NUM_SQUARES)
+
+    def _padded(self, array: np.ndarray, fill) -> np.ndarray:
+        return np.concatenate([self._flat(array), np.full((self.n, 1), fill, dtype=array.dtype)], axis=1)
+
+    def _square_facts(self, games: np.ndarray):
+        """Per-square facts for `games`: padded types and flags, owned pieces and RBC restrictions."""
+        types = self._padded(self.types, EMPTY)[games]
+        flipped = self._padded(self.flipped, False)[games]
+        player = self.current[games, None]
+        moved_by = self._flat(self.moved_by)[games]
+        revealed_by = self._flat(self.revealed_by)[games]
+        owned = flipped & MOVABLE[player, types]
+        # Red blood cells stay with the player who revealed or last moved them
+        unrestricted = (types[:, :NUM_SQUARES] != RED_BLOOD_CELL) | (
+            ((moved_by < 0) | (moved_by == player)) & ((revealed_by < 0) | (revealed_by == player)))
+        return types, flipped, owned, unrestricted
+
+    def _legal(self, games: np.ndarray, actions: np.ndarray) -> np.ndarray:
+        """Legality of `actions[i]` in game `games[i]`."""
+        types, flipped, owned, unrestricted = self._square_facts(games)
+        rows = np.arange(len(games))
+        phase = self.phase[games]
+        kind = ACTION_KIND[actions]
+        source = ACTION_SOURCE[actions]
+        cell = ACTION_CELL[actions]
+        piece = types[rows, source]
+        owner_ok = owned[rows, source]
+
+        flip_ok = (kind == FLIP) & (phase == FLIP_PHASE) & (piece != EMPTY) & ~flipped[rows, source]
+        escape_ok = (kind == ESCAPE) & (phase == ESCAPE_PHASE) & owner_ok & EXITABLE[piece]
+        shoot_ok = (kind == SHOOT) & owner_ok & (piece == T_CELL)
+        cut_ok = (kind == CUT) & owner_ok & (piece == DENDRITIC_CELL) & (
+            types[rows[:, None], NEIGHBOR_CELLS[source]] == DEBRIS).any(axis=1)
+
+        blocked = (types[rows[:, None], ACTION_PATH[actions]] != EMPTY).any(axis=1)
+        reachable = np.where(STEPPER[piece], ACTION_STEP[actions], ~blocked)
+        target = types[rows, cell]
+        capture_ok = (target == EMPTY) | (flipped[rows, cell] & CAPTURES[piece, target])
+        restriction_ok = (self._flat(self.previous)[games, source] != ACTION_TARGET[actions]) & unrestricted[rows, source]
+        move_ok = (kind == MOVE) & owner_ok & reachable & np.where(
+            ACTION_TO_EXIT[actions], (phase == ESCAPE_PHASE) & EXITABLE[piece], capture_ok & restriction_ok)
+
+        return (phase != FINISHED_PHASE) & (flip_ok | escape_ok | shoot_ok | cut_ok | move_ok)
+
+    def legal_mask(self, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        (len(games), NUM_ACTIONS) mask of legal actions, for all games by default.
+
+        Works block by block over the action table: square-level facts are
+        computed once per game, and path and adjacency checks are bitboard tests.
+        """
+        games = np.arange(self.n) if games is None else np.asarray(games, dtype=np.int64)
+        types, flipped, owned, unrestricted = self._square_facts(games)
+        board_types = types[:, :NUM_SQUARES]
+        phase = self.phase[games, None]
+        occupancy = _bitboard(board_types != EMPTY)
+        debris = _bitboard(board_types == DEBRIS)
+        board_owned = owned[:, :NUM_SQUARES]
+
+        mask = np.empty((len(games), NUM_ACTIONS), dtype=bool)
+        mask[:, FLIP_ACTIONS] = (phase == FLIP_PHASE) & (board_types != EMPTY) & ~flipped[:, :NUM_SQUARES]
+        mask[:, CUT_ACTIONS] = board_owned & (board_types == DENDRITIC_CELL) & (
+            (debris & NEIGHBOR_MASK[:NUM_SQUARES]) != 0)
+        mask[:, SHOOT_ACTIONS] = np.repeat(board_owned & (board_types == T_CELL), len(DIRECTIONS), axis=1)
+        edges = list(EXIT_EDGE_SQUARES)
+        mask[:, ESCAPE_ACTIONS] = (phase == ESCAPE_PHASE) & board_owned[:, edges] & EXITABLE[board_types[:, edges]]
+
+        # Board moves: one lookup on (mover, target) codes, then the path condition
+        mover_code = (board_types | (board_owned << 3) | (unrestricted << 4)).astype(np.int16) << 4
+        target_code = (types | (flipped << 3)).astype(np.int16)
+        pair = PAIR_RULES[mover_code[:, BOARD_MOVE_SOURCE] | target_code[:, BOARD_MOVE_TARGET]]
+        mask[:, BOARD_MOVE_ACTIONS] = ((pair & BOARD_MOVE_ALLOWED) != 0) & (
+            (occupancy & BOARD_MOVE_PATH_MASK) == 0) & (
+            self._flat(self.previous)[games][:, BOARD_MOVE_SOURCE] != BOARD_MOVE_TARGET)
+
+        # Moves onto a forest exit: escape phase only, no capture or restriction checks
+        exit_piece = board_types[:, EXIT_MOVE_SOURCE]
+        stepper = STEPPER[exit_piece]
+        exit_ok = (phase == ESCAPE_PHASE) & board_owned[:, EXIT_MOVE_SOURCE] & EXITABLE[exit_piece]
+        mask[:, EXIT_MOVE_ACTIONS] = exit_ok & np.where(
+            stepper, ACTION_STEP[EXIT_MOVE_ACTIONS], (occupancy & ACTION_PATH_MASK[EXIT_MOVE_ACTIONS]) == 0)
+
+        mask &= phase != FINISHED_PHASE
+        return mask
+
+    def is_legal(self, actions: np.ndarray) -> np.ndarray:
+        """Legality of one action index per game (-1, a pass, is never legal)."""
+        actions = np.asarray(actions, dtype=np.int64)
+        legal = np.zeros(self.n, dtype=bool)
+        playing = np.flatnonzero(actions >= 0)
+        legal[playing] = self._legal(playing, actions[playing])
+        return legal
+
+    def random_actions(self, rng: np.random.Generator, chunk_size: int = 1024) -> np.ndarray:
+        """
+        A uniformly random legal action per game, or -1 where there is none (or
+        the game is over). Masks are built `chunk_size` games at a time so they
+        stay in cache.
+        """
+        choice = np.full(self.n, -1, dtype=np.int64)
+        live = np.flatnonzero(self.active)
+        for start in range(0, len(live), chunk_size):
+            games = live[start:start + chunk_size]
+            rows, columns = np.nonzero(self.legal_mask(games))
+            counts = np.bincount(rows, minlength=len(games))
+            offsets = np.cumsum(counts) - counts
+            playable = np.flatnonzero(counts)
+            picks = offsets[playable] + (rng.random(len(playable)) * counts[playable]).astype(np.int64)
+            choice[games[playable]] = columns[picks]
+        return choice
+
+    def _clear(self, games: np.ndarray, squares: np.ndarray) -> None:
+        self._flat(self.types)[games, squares] = EMPTY
+        self._flat(self.factions)[games, squares] = OWNER_CODE[TileOwner.NONE]
+        self._flat(self.flipped)[games, squares] = False
+        self._flat(self.previous)[games, squares] = -1
+        self._flat(self.moved_by)[games, squares] = -1
+        self._flat(self.revealed_by)[games, squares] = -1
+
+    def step(self, actions: np.ndarray) -> np.ndarray:
+        """
+        Apply one action per game and advance every unfinished game a turn.
+
+        `actions` holds an index into ACTIONS per game, or -1 to pass. Finished
+        games are left untouched. Raises ValueError, changing nothing, if any
+        unfinished game is given an illegal action. Returns the points scored.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        live = np.flatnonzero(self.active)
+        games = live[actions[live] >= 0]
+        chosen = actions[games]
+        if not self._legal(games, chosen).all():
+            raise ValueError("Invalid action in batch")
+
+        types = self._flat(self.types)
+        padded_types = self._padded(self.types, EMPTY)
+        kind = ACTION_KIND[chosen]
+        source = ACTION_SOURCE[chosen]
+        player = self.current[games]
+        points = np.zeros(self.n, dtype=np.int32)
+
+        flips = kind == FLIP
+        self._flat(self.flipped)[games[flips], source[flips]] = True
+        self._flat(self.revealed_by)[games[flips], source[flips]] = player[flips]
+
+        # Shots capture the first tile along the ray if it is a pathogen or red blood cell
+        shots = kind == SHOOT
+        shooters, rays = games[shots], ACTION_PATH[chosen[shots]]
+        occupied = padded_types[shooters[:, None], rays] != EMPTY
+        first = rays[np.arange(len(rays)), occupied.argmax(axis=1)]
+        hit = SHOOTABLE[padded_types[shooters, first]] & occupied.any(axis=1)
+        points[shooters[hit]] += POINTS[types[shooters[hit], first[hit]]]
+        self._clear(shooters[hit], first[hit])
+
+        # Cuts remove every adjacent debris tile, face-down ones included
+        cuts = kind == CUT
+        neighbors = NEIGHBOR_CELLS[source[cuts]]
+        rows, columns = np.nonzero(padded_types[games[cuts][:, None], neighbors] == DEBRIS)
+        cutters, debris = games[cuts][rows], neighbors[rows, columns]
+        np.add.at(points, cutters, POINTS[DEBRIS])
+        self._clear(cutters, debris)
+
+        # Escapes, by action or by moving onto a forest exit
+        escapes = (kind == ESCAPE) | ((kind == MOVE) & ACTION_TO_EXIT[chosen])
+        points[games[escapes]] += POINTS[types[games[escapes], source[escapes]]]
+        self._clear(games[escapes], source[escapes])
+
+        moves = (kind == MOVE) & ~ACTION_TO_EXIT[chosen]
+        movers, origin, target = games[moves], source[moves], ACTION_TARGET[chosen[moves]]
+        points[movers] += POINTS[types[movers, target]]
+        for array in (self.types, self.factions, self.flipped, self.revealed_by):
+            flat = self._flat(array)
+            flat[movers, target] = flat[movers, origin]
+        self._flat(self.previous)[movers, target] = origin
+        self._flat(self.moved_by)[movers, target] = player[moves]
+        self._clear(movers, origin)
+
+        self.scores[games, player] += points[games]
+        self._next_turn(live)
+        return points
+
+    def _next_turn(self, games: np.ndarray) -> None:
+        """Phase transitions and turn hand-over, as in GameEngine.next_turn."""
+        phase = self.phase[games]
+        face_down = ((self._flat(self.types) != EMPTY) & ~self._flat(self.flipped))[games].any(axis=1)
+        entering_escape = games[(phase == FLIP_PHASE) & ~face_down]
+        in_escape = phase == ESCAPE_PHASE
+
+        self.rounds_remaining[games[in_escape & (self.current[games] == 1)]] -= 1
+        finishing = games[in_escape & (self.rounds_remaining[games] <= 0)]
+        self.phase[entering_escape] = ESCAPE_PHASE
+        self.rounds_remaining[entering_escape] = ESCAPE_ROUNDS
+        self.phase[finishing] = FINISHED_PHASE
+        # The first player with the strictly highest score wins
+        self.winner[finishing] = np.where(self.scores[finishing, 0] >= self.scores[finishing, 1], 0, 1)
+
+        self.current[games] ^= 1
+        self.turn[games] += 1
+
+    def play_random(self, seed: Optional[int] = None, max_turns: int = 400) -> int:
+        """Play uniformly random legal actions until every game ends; returns the turns taken."""
+        rng = np.random.default_rng(seed)
+        turns = 0
+        while turns < max_turns and self.active.any():
+            self.step(self.random_actions(rng))
+            turns += 1
+        return turns
+
+    @staticmethod
+    def action_index(action: Action) -> int:
+        """Index of an engine Action in ACTIONS; raises KeyError for actions outside the table."""
+        return ACTION_INDEX[action]
+
+    @staticmethod
+    def actions_of(indices: Sequence[int]) -> List[Action]:
+        return [ACTIONS[index] for index in indices]
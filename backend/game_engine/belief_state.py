@@ -0,0 +1,189 @@
+"""
+Public belief about the face-down tiles.
+
+Everything that happens to a face-down tile is public: a flip shows its type,
+a shot or a cut that removes it scores its points, and a shot that stops on it
+without capturing shows it is not a pathogen or red blood cell. `BeliefState`
+tracks what follows from that: how many tiles of each type are still face
+down, and which types each face-down square can still hold. Both players see
+the same events, so one belief serves both.
+"""
+import math
+import random
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from board.board import PIECE_DISTRIBUTION
+from board.lookup_tables import SQUARE_COORDS
+from tile.tile_types import TileType
+
+
+# Types a face-down tile can have, in piece-distribution order
+HIDDEN_TYPES: Tuple[TileType, ...] = tuple(dict.fromkeys(tile_type for tile_type, _, _ in PIECE_DISTRIBUTION))
+TYPE_INDEX: Dict[TileType, int] = {tile_type: index for index, tile_type in enumerate(HIDDEN_TYPES)}
+ALL_TYPES = (1 << len(HIDDEN_TYPES)) - 1
+
+
+def type_mask(tile_types: Iterable[TileType]) -> int:
+    """Bitmask over HIDDEN_TYPES."""
+    mask = 0
+    for tile_type in tile_types:
+        mask |= 1 << TYPE_INDEX[tile_type]
+    return mask
+
+
+def _multinomial(total: int, counts: Iterable[int]) -> int:
+    ways = math.factorial(total)
+    for count in counts:
+        ways //= math.factorial(count)
+    return ways
+
+
+def _splits(size: int, available: Tuple[int, ...], mask: int, index: int = 0):
+    """Ways to fill `size` squares from `available` tiles, using only the types in `mask`."""
+    if index == len(available):
+        if size == 0:
+            yield ()
+        return
+    most = min(size, available[index]) if mask >> index & 1 else 0
+    for count in range(most + 1):
+        for rest in _splits(size - count, available, mask, index + 1):
+            yield (count,) + rest
+
+
+class _Solution:
+    """Squares grouped by allowed types, and the weighted ways to share the tiles out among the groups."""
+
+    def __init__(self, allowed: Dict[int, int], counts: Tuple[int, ...]):
+        groups: Dict[int, List[int]] = {}
+        for square, mask in allowed.items():
+            groups.setdefault(mask, []).append(square)
+        free = groups.pop(ALL_TYPES, [])
+        constrained = sorted(groups.items())
+        self.groups = [squares for _, squares in constrained] + [free]
+        self.group_of = {square: index for index, squares in enumerate(self.groups) for square in squares}
+
+        # Each allocation fixes how many tiles of each type every group holds;
+        # its weight is the number of layouts with that allocation.
+        self.allocations: List[Tuple[Tuple[int, ...], ...]] = []
+        weights: List[int] = []
+
+        def allocate(index, remaining, weight, chosen):
+            if index == len(constrained):
+                self.allocations.append(chosen + (remaining,))
+                weights.append(weight * _multinomial(len(free), remaining))
+                return
+            mask, squares = constrained[index]
+            for split in _splits(len(squares), remaining, mask):
+                left = tuple(have - used for have, used in zip(remaining, split))
+                allocate(index + 1, left, weight * _multinomial(len(squares), split), chosen + (split,))
+
+        allocate(0, counts, 1, ())
+        if not weights:
+            raise ValueError("No layout of the face-down tiles fits the observations")
+
+        self.total = sum(weights)
+        self.cumulative = []
+        running = 0
+        for weight in weights:
+            running += weight
+            self.cumulative.append(running)
+
+        # Expected count of each type in each group
+        self.expected = [[0.0] * len(counts) for _ in self.groups]
+        for allocation, weight in zip(self.allocations, weights):
+            share = weight / self.total
+            for group, split in enumerate(allocation):
+                for index, count in enumerate(split):
+                    self.expected[group][index] += share * count
+        self.pools = [
+            [[HIDDEN_TYPES[index] for index, count in enumerate(split) for _ in range(count)] for split in allocation]
+            for allocation in self.allocations
+        ]
+
+
+class BeliefState:
+    """
+    Remaining tile counts and per-square type constraints for the face-down tiles.
+
+    Squares are numbered as in `board.lookup_tables`. Updates are O(1); the
+    exact probabilities are worked out on first use after a change and cached.
+    """
+
+    def __init__(self, squares: Iterable[int], counts: Dict[TileType, int]):
+        self.allowed: Dict[int, int] = {square: ALL_TYPES for square in squares}
+        self.counts: List[int] = [counts.get(tile_type, 0) for tile_type in HIDDEN_TYPES]
+        if sum(self.counts) != len(self.allowed):
+            raise ValueError("Tile counts do not match the number of face-down squares")
+        self.version = 0
+        self._solution: Optional[_Solution] = None
+        self._solved_version = -1
+
+    @classmethod
+    def from_board(cls, board) -> "BeliefState":
+        """
+        Belief for a board's current face-down tiles.
+
+        The counts are read from the tiles themselves; on a fresh board they
+        are the published piece distribution.
+        """
+        squares, types = [], Counter()
+        for square, pos in enumerate(SQUARE_COORDS):
+            tile = board.grid[pos.x][pos.y]
+            if tile and not tile.flipped:
+                squares.append(square)
+                types[tile.tile_type] += 1
+        return cls(squares, types)
+
+    def copy(self) -> "BeliefState":
+        clone = BeliefState.__new__(BeliefState)
+        clone.allowed = dict(self.allowed)
+        clone.counts = list(self.counts)
+        clone.version = self.version
+        clone._solution = self._solution
+        clone._solved_version = self._solved_version
+        return clone
+
+    @property
+    def hidden_squares(self) -> List[int]:
+        return list(self.allowed)
+
+    def remaining(self) -> Dict[TileType, int]:
+        """Face-down tiles left of each type."""
+        return dict(zip(HIDDEN_TYPES, self.counts))
+
+    def reveal(self, square: int, tile_type: TileType) -> None:
+        """A face-down tile's type became public: it was flipped, or captured or removed while face down."""
+        del self.allowed[square]
+        self.counts[TYPE_INDEX[tile_type]] -= 1
+        self.version += 1
+
+    def exclude(self, square: int, tile_types: Iterable[TileType]) -> None:
+        """A face-down square is known not to hold any of `tile_types`."""
+        self.allowed[square] &= ~type_mask(tile_types)
+        self.version += 1
+
+    def _solve(self) -> _Solution:
+        if self._solved_version != self.version:
+            self._solution = _Solution(self.allowed, tuple(self.counts))
+            self._solved_version = self.version
+        return self._solution
+
+    def probabilities(self, square: int) -> Dict[TileType, float]:
+        """Exact probability of each type under a face-down square, given everything public."""
+        solution = self._solve()
+        group = solution.group_of[square]
+        size = len(solution.groups[group])
+        return {tile_type: solution.expected[group][index] / size for index, tile_type in enumerate(HIDDEN_TYPES)}
+
+    def sample(self, rng: Optional[random.Random] = None) -> Dict[int, TileType]:
+        """One layout of the face-down tiles, drawn uniformly from those consistent with the observations."""
+        rng = rng or random
+        solution = self._solve()
+        choice = 0
+        if len(solution.allocations) > 1:
+            choice = rng.choices(range(len(solution.allocations)), cum_weights=solution.cumulative)[0]
+        layout = {}
+        for squares, pool in zip(solution.groups, solution.pools[choice]):
+            layout.update(zip(squares, rng.sample(pool, len(pool))))
+        return layout
@@ -1,9 +1,21 @@
 from player.player import Player
 from .models.game_phase import GamePhase
 from .game_rules_validator import GameRulesValidator
+from .belief_state import BeliefState
+from .position import Position
 from common.models.action import ActionType
-from board.board import Board
-from common.logging_config import logger
+from board.board import Board, SHOOTABLE_TYPES
+from board.lookup_tables import DIRECTION_INDEX, NEIGHBOR_COORDS, square_index
+from tile.tile_types import TileType
+from common.logging_config import GameLogger
+from common.metrics import metrics, timed
+
+
+APPLY_ACTION_SECONDS = metrics.histogram(
+    "phage_engine_apply_action_seconds", "Time spent in GameEngine.apply_action"
+)
+
+logger = GameLogger.get_module_logger("engine")
 
 
 class GameEngine:
@@ -25,6 +37,8 @@ class GameEngine:
         self.winner = None
         self.scores = {player.name: 0 for player in players}
         self.rules_validator = GameRulesValidator(self)
+        # What both players can infer about the face-down tiles
+        self.belief = BeliefState.from_board(self.board)
 
 
     @property
@@ -33,6 +47,14 @@ class GameEngine:
         return self.players[self.current_player_turn_index]
 
 
+    def player_view(self, player) -> Position:
+        """
+        Snapshot of the game as `player` sees it, with face-down tiles unknown.
+        Independent of the live game: search can play moves on it freely.
+        """
+        return Position.from_engine(self, viewer=self.players.index(player))
+
+
     @property
     def is_game_over(self) -> bool:
         """Returns True if all tiles are flipped and scoring rounds finished."""
@@ -80,7 +102,7 @@ class GameEngine:
             # Decrement rounds after each full round (when last player just finished their turn)
             if self.current_player_turn_index == len(self.players) - 1:
                 self.rounds_remaining -= 1
-                logger.info(f"Escape phase: {self.rounds_remaining} rounds remaining")
+                logger.info("Escape phase: %d rounds remaining", self.rounds_remaining)
             if self.rounds_remaining <= 0:
                 self.advance_phase()
         elif self.phase == GamePhase.FINISHED:
@@ -89,6 +111,7 @@ class GameEngine:
         return None
 
 
+    @timed(APPLY_ACTION_SECONDS)
     def apply_action(self, player, action) -> int:
         """Apply the given action to the board/game state."""
         
@@ -100,7 +123,8 @@ class GameEngine:
         points = 0
         
         if action.type == ActionType.FLIP:
-            self.board.flip_tile(action.target, player)
+            tile = self.board.flip_tile(action.target, player)
+            self.belief.reveal(square_index(action.target), tile.tile_type)
         elif action.type == ActionType.MOVE:
             # Check if this is a move to a forest exit position (outside board)
             if self.board.is_forest_exit(action.target):
@@ -116,13 +140,39 @@ class GameEngine:
             if not success:
                 raise ValueError("Failed to escape through forest exit")
         elif action.type == ActionType.SHOOT:
+            blocker = None
+            if action.direction in DIRECTION_INDEX:
+                blocker = self.board.first_blocker(action.target, action.direction)
+            hidden = self._hidden_tiles([blocker] if blocker else [])
             points = self.board.shoot(player, action.target, action.direction)
+            self._observe_hidden(hidden, SHOOTABLE_TYPES)
         elif action.type == ActionType.CUT:
+            hidden = self._hidden_tiles(NEIGHBOR_COORDS[square_index(action.target)])
             points = self.board.remove_debris(action.target, player)
+            self._observe_hidden(hidden, [TileType.DEBRIS])
 
         return points
 
 
+    def _hidden_tiles(self, positions):
+        """Face-down tiles at the given positions, with their square numbers."""
+        return [(square_index(pos), tile) for pos in positions
+                if (tile := self.board.grid[pos.x][pos.y]) and not tile.flipped]
+
+
+    def _observe_hidden(self, hidden, excluded_types) -> None:
+        """
+        Record what a shot or cut showed about face-down tiles: the ones it
+        removed scored their type's points, the ones it left cannot be any of
+        `excluded_types`.
+        """
+        for square, tile in hidden:
+            if tile.alive:
+                self.belief.exclude(square, excluded_types)
+            else:
+                self.belief.reveal(square, tile.tile_type)
+
+
     def advance_phase(self) -> None:
         if self.phase == GamePhase.FLIP:
             self.phase = GamePhase.ESCAPE
@@ -136,8 +186,6 @@ class GameEngine:
 
     def end_game(self) -> None:
         """Calculates final scores and declares the winner."""
-        from common.logging_config import logger
-
         highest_score = -1
         
         for player in self.players:
@@ -145,5 +193,5 @@ class GameEngine:
                 highest_score = self.scores[player.name]
                 self.winner = player
         
-        logger.info(f"Game Over! The winner is {self.winner.name} with {highest_score} points.")
+        logger.info("Game Over! The winner is %s with %d points.", self.winner.name, highest_score)
         
\ No newline at end of file
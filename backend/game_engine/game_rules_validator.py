@@ -2,9 +2,17 @@ from common.models.action import Action, ActionType
 from common.models.coordinate import Coord
 from tile.tile_types import TileType, TileOwner
 from pieces.piece_owner import PieceOwner
+from board.lookup_tables import ALIGNMENT, NEIGHBOR_COORDS, RAY_COORDS, square_index
+from common.metrics import metrics, timed
+from .rules import CAPTURE_MASK, EXIT_MASK, MOVER_MASK, PIECE_RULES, PLAYER_INDEX, SLIDE_MASK, STEP_MASK, TILE_CODE
 from typing import List, Optional, Tuple
 
 
+VALIDATE_ACTION_SECONDS = metrics.histogram(
+    "phage_engine_validate_action_seconds", "Time spent in GameRulesValidator.validate_action"
+)
+
+
 class GameRulesValidator:
     """
     Validates game actions according to "De Beer is Los!" rules.
@@ -13,6 +21,7 @@ class GameRulesValidator:
     def __init__(self, game_engine):
         self.game_engine = game_engine
 
+    @timed(VALIDATE_ACTION_SECONDS)
     def validate_action(self, player, action: Action) -> Tuple[bool, str]:
         """
         Validate if an action is legal for the given player.
@@ -167,21 +176,11 @@ class GameRulesValidator:
             return False, ownership_msg
         
         # Check if there are adjacent debris to remove
-        from common.models.direction import Direction
-        has_adjacent_debris = False
-        
-        directions = [Direction.NORTH, Direction.SOUTH, Direction.EAST, Direction.WEST]
-        for direction in directions:
-            dx, dy = direction.value
-            adjacent_pos = type('Coord', (), {
-                'x': action.target.x + dx, 
-                'y': action.target.y + dy
-            })()
-            if self.game_engine.board.is_within_bounds(adjacent_pos):
-                adjacent_tile = self.game_engine.board.get_tile(adjacent_pos)
-                if adjacent_tile and adjacent_tile.tile_type == TileType.DEBRIS:
-                    has_adjacent_debris = True
-                    break
+        grid = self.game_engine.board.grid
+        has_adjacent_debris = any(
+            (adjacent_tile := grid[adjacent_pos.x][adjacent_pos.y]) and adjacent_tile.tile_type == TileType.DEBRIS
+            for adjacent_pos in NEIGHBOR_COORDS[square_index(action.target)]
+        )
         if not has_adjacent_debris:
             return False, "No debris adjacent to dendritic cell"
         
@@ -204,21 +203,16 @@ class GameRulesValidator:
         if not hasattr(player, 'faction') or player.faction is None:
             return False, "Player has no faction assigned"
         
-        # Check ownership based on player faction and tile faction
-        if tile.tile_type in [TileType.T_CELL, TileType.DENDRITIC_CELL]:
-            # Immune system pieces - only PLAYER1
-            if player.faction != PieceOwner.PLAYER1:
-                return False, "Cannot move opponent's T cell/dendritic cell pieces"
-        elif tile.tile_type in [TileType.VIRUS, TileType.BACTERIA]:
-            # Pathogen pieces - only PLAYER2
-            if player.faction != PieceOwner.PLAYER2:
-                return False, "Cannot move opponent's virus/bacteria pieces"
-        elif tile.tile_type == TileType.RED_BLOOD_CELL:
-            # Neutral pieces - both players can move them (restrictions checked separately)
-            pass
-        elif tile.tile_type == TileType.DEBRIS:
-            return False, "Debris cannot be moved, only removed"
-        
+        # Ownership comes from the movers column of the rules table
+        rule = PIECE_RULES.get(tile.tile_type)
+        if rule is None:
+            return True, ""
+        if not rule.movers:
+            return False, f"{rule.label} cannot be moved, only removed"
+        player_index = PLAYER_INDEX.get(player.faction)
+        if player_index is None or not MOVER_MASK[TILE_CODE[tile.tile_type]] >> player_index & 1:
+            return False, f"Cannot move opponent's {rule.label} pieces"
+
         return True, ""
 
     def _check_capture_rules(self, attacker_tile, target_tile) -> Tuple[bool, str]:
@@ -230,18 +224,11 @@ class GameRulesValidator:
         attacker_type = attacker_tile.tile_type
         target_type = target_tile.tile_type
         
-        # Define capture rules
-        capture_rules = {
-            TileType.VIRUS: [TileType.T_CELL, TileType.DENDRITIC_CELL],
-            TileType.BACTERIA: [TileType.RED_BLOOD_CELL],
-            TileType.T_CELL: [TileType.VIRUS, TileType.BACTERIA, TileType.RED_BLOOD_CELL],
-            TileType.DENDRITIC_CELL: [TileType.DEBRIS],
-        }
-        if attacker_type in capture_rules:
-            if target_type in capture_rules[attacker_type]:
-                return True, ""
-            else:
-                return False, f"{attacker_type.name} cannot capture {target_type.name}"
+        capture_mask = CAPTURE_MASK[TILE_CODE[attacker_type]]
+        if capture_mask >> TILE_CODE[target_type] & 1:
+            return True, ""
+        if capture_mask:
+            return False, f"{attacker_type.name} cannot capture {target_type.name}"
         return False, f"{attacker_type.name} cannot capture anything"
 
     def _check_movement_pattern(self, piece_tile, source: Coord, target: Coord) -> Tuple[bool, str]:
@@ -260,12 +247,13 @@ class GameRulesValidator:
         
         total_distance = dx + dy
         
-        # Movement rules by piece type
-        if piece_type in [TileType.VIRUS, TileType.DENDRITIC_CELL]:
+        # Movement range by piece type
+        piece_bit = 1 << TILE_CODE[piece_type]
+        if STEP_MASK & piece_bit:
             # Can only move 1 space
             if total_distance != 1:
                 return False, f"{piece_type.name} can only move 1 space"
-        elif piece_type in [TileType.BACTERIA, TileType.T_CELL, TileType.RED_BLOOD_CELL]:
+        elif SLIDE_MASK & piece_bit:
             # Can move any number of spaces in straight line
             if total_distance < 1:
                 return False, "Must move at least 1 space"
@@ -277,19 +265,16 @@ class GameRulesValidator:
     def _check_movement_path(self, piece_tile, source: Coord, target: Coord) -> Tuple[bool, str]:
         """Check if the path from source to target is clear."""
         
-        # Calculate direction
-        dx = 0 if target.x == source.x else (1 if target.x > source.x else -1)
-        dy = 0 if target.y == source.y else (1 if target.y > source.y else -1)
-        
-        # Check each step along the path (excluding source and target)
-        current = Coord(source.x + dx, source.y + dy)
-        
-        while current != target:
-            tile = self.game_engine.board.get_tile(current)
-            if tile:
-                return False, f"Path blocked by piece at ({current.x}, {current.y})"
-            
-            current = Coord(current.x + dx, current.y + dy)
+        # Compare the distance to the first occupied square with the distance to the target
+        source_square = square_index(source)
+        alignment = ALIGNMENT.get((source_square, square_index(target)))
+        if alignment is None:
+            return True, ""
+        direction_index, distance = alignment
+        blocker = self.game_engine.board.blocker_distance(source_square, direction_index)
+        if blocker and blocker < distance:
+            blocked = RAY_COORDS[source_square][direction_index][blocker - 1]
+            return False, f"Path blocked by piece at ({blocked.x}, {blocked.y})"
         
         return True, ""
     
@@ -346,6 +331,9 @@ class GameRulesValidator:
         if not can_move:
             return False, ownership_msg
         
+        if not EXIT_MASK >> TILE_CODE[piece_tile.tile_type] & 1:
+            return False, f"{piece_tile.tile_type.name} cannot leave the forest"
+
         # Check if piece is at an edge position where it can escape
         if not self.game_engine.board.can_exit_from_position(action.source):
             return False, "Can only escape from forest exit positions: (3,0), (6,3), (3,6), or (0,3)"
@@ -0,0 +1,141 @@
+"""
+Perft: count the action sequences of a given length from a position.
+
+Counting leaves of the full game tree is the standard benchmark and
+correctness check for a move generator. `perft` walks a full-view
+`Position` with apply/undo; `verify` walks the same tree on copies of a
+`GameEngine` and checks every node's generated actions against
+`GameRulesValidator.validate_action`, both ways.
+"""
+import copy
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from board.board import Board
+from board.lookup_tables import DIRECTIONS, FOREST_EXITS, SQUARE_COORDS
+from common.logging_config import quiet_logging
+from common.models.action import Action, ActionType
+from pieces.piece_owner import PieceOwner
+from player.human_player import HumanPlayer
+from .action_codes import ACTION_KINDS, KIND_MASK
+from .game_engine import GameEngine
+from .position import Position
+
+
+# Every structurally possible engine action; the validator accepts a subset of these
+CANDIDATE_ACTIONS: Tuple[Action, ...] = tuple(
+    [Action(ActionType.FLIP, target=pos) for pos in SQUARE_COORDS]
+    + [Action(ActionType.CUT, target=pos) for pos in SQUARE_COORDS]
+    + [Action(ActionType.ESCAPE, source=pos) for pos in SQUARE_COORDS]
+    + [Action(ActionType.SHOOT, target=pos, direction=direction) for pos in SQUARE_COORDS for direction in DIRECTIONS]
+    + [Action(ActionType.MOVE, source=pos, target=target) for pos in SQUARE_COORDS
+       for target in SQUARE_COORDS + FOREST_EXITS if target != pos and (target.x == pos.x or target.y == pos.y)]
+)
+
+
+@dataclass
+class PerftResult:
+    depth: int
+    nodes: int
+    seconds: float
+    # Leaf counts split by the type of the first action
+    by_type: Dict[ActionType, int] = field(default_factory=dict)
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class PerftMismatch:
+    """A node where the generator and the validator disagree."""
+    path: Tuple[Action, ...]
+    generated_only: List[Action]
+    validator_only: List[Action]
+
+
+def seeded_engine(seed: int, plies: int = 0) -> GameEngine:
+    """A fresh game on the board for `seed`, advanced by `plies` random legal actions."""
+    engine = GameEngine([HumanPlayer("player1", PieceOwner.PLAYER1), HumanPlayer("player2", PieceOwner.PLAYER2)],
+                        Board(seed=seed))
+    rng = random.Random(seed)
+    with quiet_logging(logging.WARNING):
+        for _ in range(plies):
+            if engine.is_game_over:
+                break
+            actions = Position.from_engine(engine).legal_actions()
+            player = engine.current_player
+            if actions:
+                engine.update_scores(player, engine.apply_action(player, Position.to_action(rng.choice(actions))))
+            engine.next_turn()
+    return engine
+
+
+def perft(position: Position, depth: int) -> int:
+    """Number of legal action sequences of length `depth` from a full-view position."""
+    if depth == 0:
+        return 1
+    actions = position.legal_actions()
+    if depth == 1:
+        return len(actions)
+    nodes = 0
+    for action in actions:
+        token = position.apply(action)
+        nodes += perft(position, depth - 1)
+        position.undo(token)
+    return nodes
+
+
+def perft_divide(position: Position, depth: int) -> PerftResult:
+    """Perft with the count split by root action type, timed."""
+    started = time.perf_counter()
+    by_type: Counter = Counter()
+    if depth == 0:
+        nodes = 1
+    else:
+        for action in position.legal_actions():
+            token = position.apply(action)
+            by_type[ACTION_KINDS[action & KIND_MASK]] += perft(position, depth - 1)
+            position.undo(token)
+        nodes = sum(by_type.values())
+    return PerftResult(depth, nodes, time.perf_counter() - started, dict(by_type))
+
+
+def verify(engine: GameEngine, depth: int, limit: Optional[int] = None) -> Tuple[int, List[PerftMismatch]]:
+    """
+    Walk the tree to `depth` on copies of `engine`, comparing the generated
+    actions at every node with the validator's verdict on every candidate.
+    Returns the leaf count, which should equal `perft`, and the mismatches
+    found (at most `limit`).
+    """
+    mismatches: List[PerftMismatch] = []
+
+    def walk(node: GameEngine, remaining: int, path: Tuple[Action, ...]) -> int:
+        if remaining == 0:
+            return 1
+        if node.is_game_over:
+            return 0
+        player = node.current_player
+        generated = [Position.to_action(action) for action in Position.from_engine(node).legal_actions()]
+        valid = {action for action in CANDIDATE_ACTIONS if node.rules_validator.validate_action(player, action)[0]}
+        generated_set = set(generated)
+        if generated_set != valid and (limit is None or len(mismatches) < limit):
+            mismatches.append(PerftMismatch(path, sorted(generated_set - valid, key=repr),
+                                            sorted(valid - generated_set, key=repr)))
+        if remaining == 1:
+            return len(generated)
+        nodes = 0
+        for action in generated:
+            child = copy.deepcopy(node)
+            child_player = child.current_player
+            child.update_scores(child_player, child.apply_action(child_player, action))
+            child.next_turn()
+            nodes += walk(child, remaining - 1, path + (action,))
+        return nodes
+
+    with quiet_logging(logging.WARNING):
+        return walk(engine, depth, ()), mismatches
@@ -0,0 +1,485 @@
+"""
+Compact, mutable game snapshots for search.
+
+A `Position` copies what a player may know out of a `GameEngine` into a few
+flat arrays indexed by square number. In a player's view face-down tiles are
+UNKNOWN; a full view (no viewer) keeps their real types for tools such as
+perft. Positions are independent of the live session, so search can apply
+and undo actions on them freely, and take them under the session lock and
+work on them after it is released.
+"""
+from operator import itemgetter
+from typing import List, Optional, Tuple
+
+from board.board import PIECE_POINTS
+from board.exit_distance import ExitField
+from board.lookup_tables import (
+    DIRECTIONS, EXIT_EDGE_SQUARES, EXIT_PATHS, FOREST_EXITS, NEIGHBORS, NUM_SQUARES, RAYS,
+    SQUARE_COORDS, square_index,
+)
+from board.symmetry import DIRECTION_MAPS, EXIT_MAPS, INVERSE, NUM_SYMMETRIES, SQUARE_MAPS
+from common.models.action import Action
+from .action_codes import ARGUMENT_SHIFT, CUT, ESCAPE, FLIP, MOVE, SHOOT, SQUARE_SHIFT, decode, unpack
+from .belief_state import HIDDEN_TYPES
+from .models.game_phase import GamePhase
+from .rules import (
+    BACTERIA, CAPTURE_MASK, DEBRIS, DENDRITIC_CELL, EMPTY, EXIT_MASK, MOVABLE_MASK, NUM_CODES, RED_BLOOD_CELL,
+    SHOOTABLE_MASK, STEP_MASK, T_CELL, TILE_CODE, TILE_TYPES, UNKNOWN, VIRUS,
+)
+
+
+HIDDEN_CODES = tuple(TILE_CODE[tile_type] for tile_type in HIDDEN_TYPES)
+
+POINTS = tuple(PIECE_POINTS.get(tile_type, 0) for tile_type in TILE_TYPES) + (0,)
+
+
+def _codes(mask: int) -> frozenset:
+    return frozenset(code for code in range(NUM_CODES) if mask >> code & 1)
+
+
+# Set views of the compiled rules, by player index (0: PLAYER1, 1: PLAYER2) and attacker code
+MOVABLE = tuple(_codes(mask) for mask in MOVABLE_MASK)
+CAPTURES = {code: _codes(mask) for code, mask in enumerate(CAPTURE_MASK) if mask}
+STEPPERS = _codes(STEP_MASK)
+SHOOTABLE = _codes(SHOOTABLE_MASK)
+
+# Forest exits are encoded as NUM_SQUARES + their index in FOREST_EXITS
+EXIT_ROUTES: Tuple[Tuple[Tuple[int, Tuple[int, ...], bool], ...], ...] = tuple(
+    tuple(
+        (NUM_SQUARES + FOREST_EXITS.index(exit_pos), path, square == EXIT_EDGE_SQUARES[FOREST_EXITS.index(exit_pos)])
+        for (source, exit_pos), path in EXIT_PATHS.items() if source == square
+    )
+    for square in range(NUM_SQUARES)
+)
+IS_EXIT_EDGE = tuple(square in EXIT_EDGE_SQUARES for square in range(NUM_SQUARES))
+
+# _GATHER[t](array): the per-square values of the position turned by symmetry t
+_GATHER = tuple(itemgetter(*SQUARE_MAPS[INVERSE[symmetry]]) for symmetry in range(NUM_SYMMETRIES))
+
+# Actions are packed action codes (see action_codes): the acting square, and as the
+# argument the target square or exit code of a move or the direction index of a shot.
+PositionAction = int
+
+
+class Position:
+    """
+    Flat snapshot of a game: per-square tile codes, face-down flags and
+    movement restrictions, plus turn, phase and scores.
+
+    `hidden_counts[code]` is how many face-down tiles of each type remain and
+    `allowed[square]` the bitmask of tile codes a face-down square can still
+    hold, both taken from the engine's public belief.
+
+    `exits` holds the stepper and slider distance-to-exit fields once
+    `exit_fields` has built them, as it does for every escape-phase
+    position; apply and undo keep them current from then on.
+    """
+
+    __slots__ = (
+        "types", "face_down", "previous", "moved_by", "revealed_by", "allowed",
+        "hidden_counts", "current", "phase", "rounds_remaining", "scores", "viewer", "exits",
+    )
+
+    @classmethod
+    def from_engine(cls, engine, viewer: Optional[int] = None) -> "Position":
+        """Snapshot `engine` as seen by player index `viewer`, or with full information if None."""
+        position = cls.__new__(cls)
+        players = {id(player): number for number, player in enumerate(engine.players)}
+        position.types = bytearray(NUM_SQUARES)
+        position.face_down = bytearray(NUM_SQUARES)
+        position.previous = [-1] * NUM_SQUARES
+        position.moved_by = [-1] * NUM_SQUARES
+        position.revealed_by = [-1] * NUM_SQUARES
+        position.allowed = [0] * NUM_SQUARES
+        grid = engine.board.grid
+        for square, pos in enumerate(SQUARE_COORDS):
+            tile = grid[pos.x][pos.y]
+            if not tile:
+                continue
+            position.types[square] = TILE_CODE[tile.tile_type]
+            if not tile.flipped:
+                position.face_down[square] = 1
+                if viewer is not None:
+                    position.types[square] = UNKNOWN
+            if tile.previous_position is not None:
+                position.previous[square] = square_index(tile.previous_position)
+            position.moved_by[square] = players.get(id(tile.last_moved_by), -1)
+            position.revealed_by[square] = players.get(id(tile.last_revealed_by), -1)
+
+        belief = engine.belief
+        position.hidden_counts = [0] * (UNKNOWN + 1)
+        for code, count in zip(HIDDEN_CODES, belief.counts):
+            position.hidden_counts[code] = count
+        for square, mask in belief.allowed.items():
+            position.allowed[square] = sum(1 << code for index, code in enumerate(HIDDEN_CODES) if mask >> index & 1)
+
+        position.current = engine.current_player_turn_index
+        position.phase = engine.phase
+        position.rounds_remaining = engine.rounds_remaining or 0
+        position.scores = [engine.scores[player.name] for player in engine.players]
+        position.viewer = viewer
+        position.exits = None
+        if position.phase == GamePhase.ESCAPE:
+            position.exit_fields()
+        return position
+
+    def copy(self) -> "Position":
+        clone = Position.__new__(Position)
+        clone.types = self.types[:]
+        clone.face_down = self.face_down[:]
+        clone.previous = self.previous[:]
+        clone.moved_by = self.moved_by[:]
+        clone.revealed_by = self.revealed_by[:]
+        clone.allowed = self.allowed[:]
+        clone.hidden_counts = self.hidden_counts[:]
+        clone.current = self.current
+        clone.phase = self.phase
+        clone.rounds_remaining = self.rounds_remaining
+        clone.scores = self.scores[:]
+        clone.viewer = self.viewer
+        clone.exits = tuple(field.copy() for field in self.exits) if self.exits is not None else None
+        return clone
+
+    def exit_fields(self) -> Tuple[ExitField, ExitField]:
+        """The stepper and slider distance-to-exit fields, built on first use."""
+        if self.exits is None:
+            occupied = sum(1 << square for square, code in enumerate(self.types) if code)
+            self.exits = (ExitField(occupied, False, journaled=True), ExitField(occupied, True, journaled=True))
+        return self.exits
+
+    def key(self) -> tuple:
+        """Hashable identity of everything that affects play from here, for transposition tables."""
+        return (bytes(self.types), bytes(self.face_down), tuple(self.previous), tuple(self.moved_by),
+                tuple(self.revealed_by), tuple(self.allowed), tuple(self.hidden_counts), self.current, self.phase,
+                self.rounds_remaining, self.scores[0], self.scores[1])
+
+    def transformed(self, symmetry: int) -> "Position":
+        """The same position on the board turned by `symmetry` (see board.symmetry)."""
+        squares, gather = SQUARE_MAPS[symmetry], _GATHER[symmetry]
+        clone = self.copy()
+        clone.types = bytearray(gather(self.types))
+        clone.face_down = bytearray(gather(self.face_down))
+        clone.previous = [-1 if previous < 0 else squares[previous] for previous in gather(self.previous)]
+        clone.moved_by = list(gather(self.moved_by))
+        clone.revealed_by = list(gather(self.revealed_by))
+        clone.allowed = list(gather(self.allowed))
+        clone.exits = None
+        return clone
+
+    def canonical_key(self) -> Tuple[tuple, int]:
+        """
+        `key()` of the symmetric variant of this position that sorts first,
+        and the symmetry that turns this position into it. Symmetric
+        positions share a canonical key, so tables keyed by it hold one
+        entry for all eight; actions stored with it must be turned with
+        `transform_action`.
+        """
+        types = self.types
+        layouts = [bytes(gather(types)) for gather in _GATHER]
+        first = min(layouts)
+        candidates = [symmetry for symmetry, layout in enumerate(layouts) if layout == first]
+        if len(candidates) == 1 and candidates[0] == 0:
+            return self.key(), 0
+        return min((self.transformed(symmetry).key(), symmetry) for symmetry in candidates)
+
+    @staticmethod
+    def transform_action(action: "PositionAction", symmetry: int) -> "PositionAction":
+        """The same action on the board turned by `symmetry`."""
+        kind, square, argument = unpack(action)
+        if kind == SHOOT:
+            argument = DIRECTION_MAPS[symmetry][argument]
+        elif kind == MOVE:
+            if argument >= NUM_SQUARES:
+                argument = NUM_SQUARES + EXIT_MAPS[symmetry][argument - NUM_SQUARES]
+            else:
+                argument = SQUARE_MAPS[symmetry][argument]
+        return kind | SQUARE_MAPS[symmetry][square] << SQUARE_SHIFT | argument << ARGUMENT_SHIFT
+
+    @property
+    def is_finished(self) -> bool:
+        return self.phase == GamePhase.FINISHED
+
+    def legal_actions(self) -> List[PositionAction]:
+        """Every legal action for the player to move, in a fixed order."""
+        if self.phase == GamePhase.FINISHED:
+            return []
+        actions = []
+        types, face_down = self.types, self.face_down
+        player = self.current
+        movable = MOVABLE_MASK[player]
+        escape_phase = self.phase == GamePhase.ESCAPE
+
+        if self.phase == GamePhase.FLIP:
+            actions.extend(FLIP | square << SQUARE_SHIFT for square in range(NUM_SQUARES) if face_down[square])
+
+        for square in range(NUM_SQUARES):
+            piece = types[square]
+            if face_down[square] or not movable >> piece & 1:
+                continue
+            at = square << SQUARE_SHIFT
+
+            # Red blood cells stay with the player who revealed or last moved them
+            free = piece != RED_BLOOD_CELL or (
+                self.moved_by[square] in (-1, player) and self.revealed_by[square] in (-1, player))
+            if free:
+                previous = self.previous[square]
+                captures = CAPTURE_MASK[piece]
+                stepper = STEP_MASK >> piece & 1
+                for ray in RAYS[square]:
+                    for target in ray:
+                        occupant = types[target]
+                        if occupant != EMPTY:
+                            if captures >> occupant & 1 and not face_down[target] and target != previous:
+                                actions.append(MOVE | at | target << ARGUMENT_SHIFT)
+                            break
+                        if target != previous:
+                            actions.append(MOVE | at | target << ARGUMENT_SHIFT)
+                        if stepper:
+                            break
+
+            if piece == T_CELL:
+                actions.extend(SHOOT | at | index << ARGUMENT_SHIFT for index in range(len(DIRECTIONS)))
+            elif piece == DENDRITIC_CELL and (any(types[neighbor] == DEBRIS for neighbor in NEIGHBORS[square])
+                                              or self._hidden_debris(square)):
+                actions.append(CUT | at)
+
+            if escape_phase and EXIT_MASK >> piece & 1:
+                if IS_EXIT_EDGE[square]:
+                    actions.append(ESCAPE | at)
+                stepper = STEP_MASK >> piece & 1
+                for exit_code, path, at_edge in EXIT_ROUTES[square]:
+                    if at_edge if stepper else all(types[step] == EMPTY for step in path):
+                        actions.append(MOVE | at | exit_code << ARGUMENT_SHIFT)
+        return actions
+
+    def _shot_target(self, square: int, direction: int) -> Optional[int]:
+        for target in RAYS[square][direction]:
+            if self.types[target] != EMPTY:
+                return target
+        return None
+
+    def _hidden_debris(self, square: int) -> List[int]:
+        """UNKNOWN neighbours of `square` that may still be debris, in NEIGHBORS order."""
+        if not self.hidden_counts[DEBRIS]:
+            return []
+        return [neighbor for neighbor in NEIGHBORS[square]
+                if self.types[neighbor] == UNKNOWN and self.allowed[neighbor] >> DEBRIS & 1]
+
+    def _chance(self, square: int) -> List[Tuple[int, int]]:
+        """(tile code, remaining count) for each type a face-down square may still hold."""
+        allowed = self.allowed[square]
+        return [(code, self.hidden_counts[code]) for code in HIDDEN_CODES
+                if allowed >> code & 1 and self.hidden_counts[code]]
+
+    def chance_outcomes(self, action: PositionAction) -> Optional[List[Tuple[int, float]]]:
+        """
+        Possible tile codes, with probabilities, for the face-down tile an
+        action would expose: a flip, or a shot stopped by an unknown tile.
+        None when the action has no hidden outcome. Probabilities follow the
+        remaining counts over the types still allowed on that square.
+
+        A cut next to UNKNOWN tiles that may be debris takes whichever of
+        them are; its outcomes are bitmasks over those tiles (in NEIGHBORS
+        order) of the ones that are debris. Each tile's chance is taken on
+        its own, and masks needing more debris than remains are dropped.
+        The engine rejects a cut with no debris next to it at all, which
+        ends the AI's turn; the empty mask plays that as a pass that only
+        rules debris out.
+
+        A shot stopped by a type it cannot kill leaves the same position
+        whatever that type is, so those types come back as a single outcome
+        (the first such code) carrying their combined probability.
+        """
+        kind, square, argument = unpack(action)
+        if kind == CUT:
+            return self._cut_outcomes(square)
+        if kind == SHOOT:
+            square = self._shot_target(square, argument)
+            if square is None:
+                return None
+        elif kind != FLIP:
+            return None
+        if self.types[square] != UNKNOWN:
+            return None
+        weights = self._chance(square)
+        total = sum(weight for _, weight in weights)
+        if kind == SHOOT:
+            blocked = [(code, weight) for code, weight in weights if code not in SHOOTABLE]
+            if len(blocked) > 1:
+                weights = [(code, weight) for code, weight in weights if code in SHOOTABLE]
+                weights.append((blocked[0][0], sum(weight for _, weight in blocked)))
+        return [(code, weight / total) for code, weight in weights]
+
+    def _cut_outcomes(self, square: int) -> Optional[List[Tuple[int, float]]]:
+        hidden = self._hidden_debris(square)
+        if not hidden:
+            return None
+        chances = []
+        for neighbor in hidden:
+            weights = self._chance(neighbor)
+            chances.append(self.hidden_counts[DEBRIS] / sum(weight for _, weight in weights))
+        outcomes = []
+        for mask in range(1 << len(hidden)):
+            if bin(mask).count("1") > self.hidden_counts[DEBRIS]:
+                continue
+            probability = 1.0
+            for index, chance in enumerate(chances):
+                probability *= chance if mask >> index & 1 else 1 - chance
+            if probability:
+                outcomes.append((mask, probability))
+        total = sum(probability for _, probability in outcomes)
+        return [(mask, probability / total) for mask, probability in outcomes]
+
+    def _clear(self, square: int) -> None:
+        self.types[square] = EMPTY
+        self.face_down[square] = 0
+        self.previous[square] = -1
+        self.moved_by[square] = -1
+        self.revealed_by[square] = -1
+        self.allowed[square] = 0
+
+    def apply(self, action: PositionAction, outcome: Optional[int] = None):
+        """
+        Play a legal action and pass the turn; returns a token for `undo`.
+
+        `outcome` is the tile code of an UNKNOWN tile the action exposes, or
+        for a cut the mask of the UNKNOWN neighbours that are debris (see
+        `chance_outcomes`).
+        """
+        kind, square, argument = unpack(action)
+        types = self.types
+        saved = []
+        revealed = []
+
+        def save(cell):
+            saved.append((cell, types[cell], self.face_down[cell], self.previous[cell],
+                          self.moved_by[cell], self.revealed_by[cell], self.allowed[cell]))
+
+        def resolve(cell):
+            code = types[cell]
+            if code == UNKNOWN:
+                if outcome is None:
+                    raise ValueError("Action exposes a face-down tile; an outcome is required")
+                code = outcome
+            return code
+
+        def take_hidden(cell, code):
+            if self.face_down[cell]:
+                self.hidden_counts[code] -= 1
+                revealed.append(code)
+
+        points = 0
+        if kind == FLIP:
+            save(square)
+            code = resolve(square)
+            take_hidden(square, code)
+            types[square] = code
+            self.face_down[square] = 0
+            self.allowed[square] = 0
+            self.revealed_by[square] = self.current
+        elif kind == MOVE or kind == ESCAPE:
+            save(square)
+            if kind == MOVE and argument < NUM_SQUARES:
+                save(argument)
+                points = POINTS[types[argument]]
+                types[argument] = types[square]
+                self.face_down[argument] = 0
+                self.allowed[argument] = 0
+                self.revealed_by[argument] = self.revealed_by[square]
+                self.previous[argument] = square
+                self.moved_by[argument] = self.current
+            else:
+                points = POINTS[types[square]]
+            self._clear(square)
+        elif kind == SHOOT:
+            target = self._shot_target(square, argument)
+            if target is not None:
+                code = resolve(target)
+                save(target)
+                if code in SHOOTABLE:
+                    take_hidden(target, code)
+                    points = POINTS[code]
+                    self._clear(target)
+                else:
+                    self.allowed[target] &= ~SHOOTABLE_MASK
+        elif kind == CUT:
+            hidden = self._hidden_debris(square)
+            if hidden and outcome is None:
+                raise ValueError("Cut may take face-down debris; an outcome is required")
+            for neighbor in NEIGHBORS[square]:
+                code = types[neighbor]
+                if neighbor in hidden:
+                    code = DEBRIS if outcome >> hidden.index(neighbor) & 1 else UNKNOWN
+                if code == DEBRIS:
+                    save(neighbor)
+                    take_hidden(neighbor, DEBRIS)
+                    points += POINTS[DEBRIS]
+                    self._clear(neighbor)
+                elif self.face_down[neighbor] and self.allowed[neighbor] >> DEBRIS & 1:
+                    save(neighbor)
+                    self.allowed[neighbor] &= ~(1 << DEBRIS)
+
+        exits = self.exits
+        marks = None
+        if exits is not None:
+            marks = [field.mark() for field in exits]
+            changes = [(cell, bool(types[cell])) for cell, code, *_ in saved if bool(code) != bool(types[cell])]
+            if changes:
+                for field in exits:
+                    field.update(changes)
+
+        token = (saved, revealed, self.current, self.phase, self.rounds_remaining, self.scores[self.current], marks)
+        self.scores[self.current] += points
+        self._next_turn()
+        if exits is None and self.phase == GamePhase.ESCAPE and token[3] == GamePhase.FLIP:
+            # The escape phase starts: its evaluations read the fields at every node
+            self.exit_fields()
+        return token
+
+    def undo(self, token) -> None:
+        """Take back the action that returned `token`."""
+        saved, revealed, current, phase, rounds_remaining, score, marks = token
+        for cell, code, face_down, previous, moved_by, revealed_by, allowed in reversed(saved):
+            self.types[cell] = code
+            self.face_down[cell] = face_down
+            self.previous[cell] = previous
+            self.moved_by[cell] = moved_by
+            self.revealed_by[cell] = revealed_by
+            self.allowed[cell] = allowed
+        for code in revealed:
+            self.hidden_counts[code] += 1
+        self.current = current
+        self.phase = phase
+        self.rounds_remaining = rounds_remaining
+        self.scores[current] = score
+        if marks is None:
+            # Built after the action, for a board this one no longer has
+            self.exits = None
+        else:
+            for field, mark in zip(self.exits, marks):
+                field.rollback(mark)
+
+    def _next_turn(self) -> None:
+        """Phase transitions and turn hand-over, as in GameEngine.next_turn."""
+        if self.phase == GamePhase.FLIP:
+            if not any(self.face_down):
+                self.phase = GamePhase.ESCAPE
+                self.rounds_remaining = 5
+        elif self.phase == GamePhase.ESCAPE:
+            if self.current == 1:
+                self.rounds_remaining -= 1
+            if self.rounds_remaining <= 0:
+                self.phase = GamePhase.FINISHED
+        self.current ^= 1
+
+    @property
+    def winner(self) -> Optional[int]:
+        """Index of the winning player once the game is finished."""
+        if self.phase != GamePhase.FINISHED:
+            return None
+        return 0 if self.scores[0] >= self.scores[1] else 1
+
+    @staticmethod
+    def to_action(action: PositionAction) -> Action:
+        """The engine Action for a position action."""
+        return decode(action)
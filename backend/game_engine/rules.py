@@ -0,0 +1,125 @@
+"""
+Piece rules as one declarative table.
+
+`PIECE_RULES` has a row per tile type saying who may move it, how far it
+moves, what it captures, whether a T cell's shot takes it and whether it may
+leave through a forest exit. The rows are compiled once, at import, into
+bitmasks over tile codes; the rules validator, the board, the position move
+generator and the batched engine all read those instead of keeping their own
+lists.
+"""
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from pieces.piece_owner import PieceOwner
+from tile.tile_types import TileType
+
+
+@dataclass(frozen=True)
+class PieceRule:
+    # Factions that may move the piece; none for pieces that never move
+    movers: FrozenSet[PieceOwner] = frozenset()
+    # Squares per move: 1 steps, None slides any distance along a clear line, 0 never moves
+    max_range: Optional[int] = 0
+    captures: FrozenSet[TileType] = frozenset()
+    shootable: bool = False
+    can_exit: bool = False
+    # Name used in rule error messages
+    label: str = ""
+
+
+PIECE_RULES: Dict[TileType, PieceRule] = {
+    TileType.VIRUS: PieceRule(
+        movers=frozenset({PieceOwner.PLAYER2}), max_range=1,
+        captures=frozenset({TileType.T_CELL, TileType.DENDRITIC_CELL}),
+        shootable=True, can_exit=True, label="virus/bacteria",
+    ),
+    TileType.BACTERIA: PieceRule(
+        movers=frozenset({PieceOwner.PLAYER2}), max_range=None,
+        captures=frozenset({TileType.RED_BLOOD_CELL}),
+        shootable=True, can_exit=True, label="virus/bacteria",
+    ),
+    TileType.T_CELL: PieceRule(
+        movers=frozenset({PieceOwner.PLAYER1}), max_range=None,
+        captures=frozenset({TileType.VIRUS, TileType.BACTERIA, TileType.RED_BLOOD_CELL}),
+        can_exit=True, label="T cell/dendritic cell",
+    ),
+    TileType.DENDRITIC_CELL: PieceRule(
+        movers=frozenset({PieceOwner.PLAYER1}), max_range=1,
+        captures=frozenset({TileType.DEBRIS}),
+        can_exit=True, label="T cell/dendritic cell",
+    ),
+    TileType.RED_BLOOD_CELL: PieceRule(
+        movers=frozenset({PieceOwner.PLAYER1, PieceOwner.PLAYER2}), max_range=None,
+        shootable=True, can_exit=True, label="red blood cell",
+    ),
+    TileType.DEBRIS: PieceRule(label="Debris"),
+}
+
+
+# Tile codes; 0 is an empty square, UNKNOWN a face-down tile the viewer cannot see
+TILE_TYPES = (
+    TileType.EMPTY, TileType.VIRUS, TileType.BACTERIA, TileType.T_CELL,
+    TileType.DENDRITIC_CELL, TileType.RED_BLOOD_CELL, TileType.DEBRIS,
+)
+TILE_CODE = {tile_type: code for code, tile_type in enumerate(TILE_TYPES)}
+EMPTY, VIRUS, BACTERIA, T_CELL, DENDRITIC_CELL, RED_BLOOD_CELL, DEBRIS = range(len(TILE_TYPES))
+UNKNOWN = len(TILE_TYPES)
+NUM_CODES = UNKNOWN + 1
+
+# Player index (0: PLAYER1, 1: PLAYER2) of each faction that takes turns
+PLAYER_INDEX = {PieceOwner.PLAYER1: 0, PieceOwner.PLAYER2: 1}
+
+
+def code_mask(tile_types: Iterable[TileType]) -> int:
+    """Bitmask over tile codes."""
+    mask = 0
+    for tile_type in tile_types:
+        mask |= 1 << TILE_CODE[tile_type]
+    return mask
+
+
+def _rule(code: int) -> PieceRule:
+    return PIECE_RULES.get(TILE_TYPES[code], PieceRule()) if code < len(TILE_TYPES) else PieceRule()
+
+
+# CAPTURE_MASK[code]: codes a piece may capture by moving onto them
+CAPTURE_MASK: Tuple[int, ...] = tuple(code_mask(_rule(code).captures) for code in range(NUM_CODES))
+# MOVER_MASK[code]: bit i is set if player index i may move the piece
+MOVER_MASK: Tuple[int, ...] = tuple(
+    sum(1 << PLAYER_INDEX[owner] for owner in _rule(code).movers) for code in range(NUM_CODES)
+)
+# MOVABLE_MASK[player]: codes player index `player` may move
+MOVABLE_MASK: Tuple[int, ...] = tuple(
+    sum(1 << code for code in range(NUM_CODES) if MOVER_MASK[code] >> player & 1) for player in range(2)
+)
+STEP_MASK = sum(1 << code for code in range(NUM_CODES) if _rule(code).max_range == 1)
+SLIDE_MASK = sum(1 << code for code in range(NUM_CODES) if _rule(code).movers and _rule(code).max_range is None)
+SHOOTABLE_MASK = code_mask(tile_type for tile_type, rule in PIECE_RULES.items() if rule.shootable)
+EXIT_MASK = code_mask(tile_type for tile_type, rule in PIECE_RULES.items() if rule.can_exit)
+
+SHOOTABLE_TYPES: Tuple[TileType, ...] = tuple(
+    tile_type for tile_type in TILE_TYPES if SHOOTABLE_MASK >> TILE_CODE[tile_type] & 1
+)
+
+
+def can_capture(attacker: TileType, target: TileType) -> bool:
+    return bool(CAPTURE_MASK[TILE_CODE[attacker]] >> TILE_CODE[target] & 1)
+
+
+def can_move(faction: PieceOwner, tile_type: TileType) -> bool:
+    """Whether a player of `faction` may ever move pieces of `tile_type`."""
+    player = PLAYER_INDEX.get(faction)
+    return player is not None and bool(MOVER_MASK[TILE_CODE[tile_type]] >> player & 1)
+
+
+def is_stepper(tile_type: TileType) -> bool:
+    return bool(STEP_MASK >> TILE_CODE[tile_type] & 1)
+
+
+def is_slider(tile_type: TileType) -> bool:
+    return bool(SLIDE_MASK >> TILE_CODE[tile_type] & 1)
+
+
+def can_exit(tile_type: TileType) -> bool:
+    return bool(EXIT_MASK >> TILE_CODE[tile_type] & 1)
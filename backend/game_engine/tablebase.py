@@ -0,0 +1,303 @@
+"""
+Endgame tablebase for small ESCAPE-phase positions.
+
+Covers every escape-phase position with at most `max_pieces` tiles on the
+board, any rounds remaining and either player to move, and stores the
+exact minimax value: the points the player to move gains from here on,
+less the points the opponent gains, under best play by both. A position
+is looked up by index in O(1); no search is needed once the tablebase
+holds it.
+
+Debris counts as a tile, and real escape phases keep far more tiles than
+a table can cover (22 or more, 9 or more besides debris), so neither the
+evaluator nor the AI players probe it. It is an offline tool: exact
+values to test the search and evaluation against on small endgames.
+
+A tile is described by a piece state: its square, its kind and the square
+it last came from (a piece may not move straight back). Red blood cells
+split into three kinds by who may still move them. A position is the
+sorted set of its piece states, indexed with the combinatorial number
+system, so a table is dense: for each piece count, layer (rounds
+remaining, player to move) and set of piece states there is one signed
+byte.
+
+The generator works backwards from the last round. Only one position out
+of each set related by a board symmetry is solved; the others are copied
+from it at the end. The file is memory-mapped on load and read-only; by
+default it lives at data/tablebase.bin under backend/. Building with two
+pieces takes a while; see tools/build_tablebase.py.
+"""
+import math
+import mmap
+import os
+import struct
+from array import array
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from board.lookup_tables import NEIGHBORS, NUM_SQUARES, RAYS
+from board.symmetry import SQUARE_MAPS
+from .models.game_phase import GamePhase
+from .position import Position, PositionAction
+from .rules import (
+    BACTERIA, DEBRIS, DENDRITIC_CELL, RED_BLOOD_CELL, STEP_MASK, T_CELL, UNKNOWN, VIRUS,
+)
+
+
+DEFAULT_TABLEBASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "tablebase.bin")
+
+MAGIC = b"PHTB"
+VERSION = 1
+# magic, version, max pieces, piece states, rounds
+HEADER = struct.Struct("=4sHHII")
+
+ESCAPE_ROUNDS = 5
+LAYERS = ESCAPE_ROUNDS * 2
+# Stored for positions that were not solved (two tiles on one square)
+UNSOLVED = -128
+
+# Piece kinds: (tile code, player index who alone may move it, or None)
+KINDS: Tuple[Tuple[int, Optional[int]], ...] = (
+    (VIRUS, None), (BACTERIA, None), (T_CELL, None), (DENDRITIC_CELL, None),
+    (RED_BLOOD_CELL, None), (RED_BLOOD_CELL, 0), (RED_BLOOD_CELL, 1), (DEBRIS, None),
+)
+KIND_INDEX = {kind: index for index, kind in enumerate(KINDS)}
+
+
+def _previous_squares(square: int, kind: Tuple[int, Optional[int]]) -> List[int]:
+    code, owner = kind
+    if code == DEBRIS or (code == RED_BLOOD_CELL and owner is None):
+        # Never moves, or has not moved yet (moving a red blood cell ties it to the mover)
+        return [-1]
+    if STEP_MASK >> code & 1:
+        return [-1] + list(NEIGHBORS[square])
+    return [-1] + [target for ray in RAYS[square] for target in ray]
+
+
+# PIECE_STATES[state]: (square, kind index, previous square or -1)
+PIECE_STATES: Tuple[Tuple[int, int, int], ...] = tuple(
+    (square, kind_index, previous)
+    for square in range(NUM_SQUARES)
+    for kind_index, kind in enumerate(KINDS)
+    for previous in _previous_squares(square, kind)
+)
+STATE_ID = {state: index for index, state in enumerate(PIECE_STATES)}
+NUM_STATES = len(PIECE_STATES)
+
+# STATE_MAPS[t][state]: the piece state moved by board symmetry t
+STATE_MAPS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(STATE_ID[(squares[square], kind, squares[previous] if previous >= 0 else -1)]
+          for square, kind, previous in PIECE_STATES)
+    for squares in SQUARE_MAPS
+)
+
+
+def combination_index(states: Sequence[int]) -> int:
+    """Index of a sorted set of piece states among all sets of the same size."""
+    return sum(math.comb(state, rank + 1) for rank, state in enumerate(states))
+
+
+def layer_index(rounds_remaining: int, current: int) -> int:
+    return (rounds_remaining - 1) * 2 + current
+
+
+def section_offsets(max_pieces: int) -> List[int]:
+    """Start of the entries for each piece count, plus the total entry count at the end."""
+    offsets = [0]
+    for pieces in range(max_pieces + 1):
+        offsets.append(offsets[-1] + math.comb(NUM_STATES, pieces) * LAYERS)
+    return offsets
+
+
+def piece_states(position: Position, max_pieces: int = NUM_SQUARES) -> Optional[List[int]]:
+    """
+    Sorted piece states of a position, or None if a tile has no piece state
+    (e.g. it is face down) or there are more than `max_pieces` tiles.
+    """
+    states = []
+    types = position.types
+    for square in range(NUM_SQUARES):
+        code = types[square]
+        if not code:
+            continue
+        if code == UNKNOWN or position.face_down[square]:
+            return None
+        owner = None
+        if code == RED_BLOOD_CELL:
+            free = [player for player in (0, 1)
+                    if position.moved_by[square] in (-1, player) and position.revealed_by[square] in (-1, player)]
+            if not free:
+                return None
+            owner = free[0] if len(free) == 1 else None
+        state = STATE_ID.get((square, KIND_INDEX[(code, owner)], position.previous[square]))
+        if state is None:
+            return None
+        states.append(state)
+        if len(states) > max_pieces:
+            return None
+    return states
+
+
+def position_of(states: Sequence[int], rounds_remaining: int, current: int) -> Position:
+    """Escape-phase position holding `states`, with both scores at zero."""
+    position = Position.__new__(Position)
+    position.types = bytearray(NUM_SQUARES)
+    position.face_down = bytearray(NUM_SQUARES)
+    position.previous = [-1] * NUM_SQUARES
+    position.moved_by = [-1] * NUM_SQUARES
+    position.revealed_by = [-1] * NUM_SQUARES
+    position.allowed = [0] * NUM_SQUARES
+    position.hidden_counts = [0] * (UNKNOWN + 1)
+    for state in states:
+        square, kind_index, previous = PIECE_STATES[state]
+        code, owner = KINDS[kind_index]
+        position.types[square] = code
+        position.previous[square] = previous
+        if owner is not None:
+            position.revealed_by[square] = owner
+            if previous >= 0:
+                position.moved_by[square] = owner
+    position.current = current
+    position.phase = GamePhase.ESCAPE
+    position.rounds_remaining = rounds_remaining
+    position.scores = [0, 0]
+    position.viewer = None
+    position.exits = None
+    return position
+
+
+def _outcomes(position: Position, child_value: Callable[[Position], int]) -> List[Tuple[Optional[PositionAction], int]]:
+    """
+    (action, value) of every legal action, or of passing (action None) when
+    there is none; `child_value` gives the value of the position after it.
+    """
+    mover = position.current
+    actions = position.legal_actions()
+    if not actions:
+        saved = (position.current, position.phase, position.rounds_remaining)
+        position._next_turn()
+        value = 0 if position.is_finished else -child_value(position)
+        position.current, position.phase, position.rounds_remaining = saved
+        return [(None, value)]
+    outcomes = []
+    for action in actions:
+        before = position.scores[mover]
+        token = position.apply(action)
+        points = position.scores[mover] - before
+        outcomes.append((action, points - (0 if position.is_finished else child_value(position))))
+        position.undo(token)
+    return outcomes
+
+
+def build(max_pieces: int, progress: Optional[Callable[[str], None]] = None) -> array:
+    """Solve every position with at most `max_pieces` tiles; returns the table entries."""
+    offsets = section_offsets(max_pieces)
+    values = array("b", [UNSOLVED]) * offsets[-1]
+
+    # canonical[pieces][index]: index of the set solved for it, -1 for two tiles on a square
+    canonical: List[array] = []
+    for pieces in range(max_pieces + 1):
+        table = array("l", [-1]) * math.comb(NUM_STATES, pieces)
+        for index, states in enumerate(_state_sets(pieces)):
+            if len({PIECE_STATES[state][0] for state in states}) == pieces:
+                table[index] = min(combination_index(sorted(state_map[state] for state in states))
+                                   for state_map in STATE_MAPS)
+        canonical.append(table)
+        if progress:
+            progress(f"{pieces} pieces: {sum(1 for index, rep in enumerate(table) if rep == index)} to solve")
+
+    def child_value(child: Position) -> int:
+        states = piece_states(child)
+        pieces = len(states)
+        size = len(canonical[pieces])
+        rep = canonical[pieces][combination_index(states)]
+        return values[offsets[pieces] + layer_index(child.rounds_remaining, child.current) * size + rep]
+
+    # A layer only leads to the one before it: the second player's turn ends the round
+    for rounds_remaining in range(1, ESCAPE_ROUNDS + 1):
+        for current in (1, 0):
+            layer = layer_index(rounds_remaining, current)
+            for pieces in range(max_pieces + 1):
+                table = canonical[pieces]
+                base = offsets[pieces] + layer * len(table)
+                for index, states in enumerate(_state_sets(pieces)):
+                    if table[index] == index:
+                        position = position_of(states, rounds_remaining, current)
+                        values[base + index] = max(value for _, value in _outcomes(position, child_value))
+            if progress:
+                progress(f"solved {rounds_remaining} rounds left, player {current} to move")
+
+    for pieces in range(max_pieces + 1):
+        table = canonical[pieces]
+        size = len(table)
+        for layer in range(LAYERS):
+            base = offsets[pieces] + layer * size
+            for index, rep in enumerate(table):
+                if rep >= 0:
+                    values[base + index] = values[base + rep]
+    return values
+
+
+def _state_sets(pieces: int, limit: int = NUM_STATES):
+    """Every sorted set of `pieces` piece states below `limit`, in combination index order."""
+    if pieces == 0:
+        yield ()
+        return
+    for last in range(pieces - 1, limit):
+        for rest in _state_sets(pieces - 1, last):
+            yield rest + (last,)
+
+
+def write_tablebase(path: str, values: array, max_pieces: int) -> None:
+    """Write table entries from `build`; replaces `path` atomically."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    partial = path + ".tmp"
+    with open(partial, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, max_pieces, NUM_STATES, ESCAPE_ROUNDS))
+        values.tofile(handle)
+    os.replace(partial, path)
+
+
+class Tablebase:
+    """Read-only view of a memory-mapped tablebase file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, max_pieces, states, rounds = HEADER.unpack_from(self._map)
+        if (magic, version, states, rounds) != (MAGIC, VERSION, NUM_STATES, ESCAPE_ROUNDS) \
+                or len(self._map) != HEADER.size + section_offsets(max_pieces)[-1]:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+        self._view = memoryview(self._map)
+        self.values = self._view[HEADER.size:].cast("b")
+        self.max_pieces = max_pieces
+        self.offsets = section_offsets(max_pieces)
+        self.sizes = [math.comb(NUM_STATES, pieces) for pieces in range(max_pieces + 1)]
+        self.path = path
+
+    def probe(self, position: Position) -> Optional[int]:
+        """Exact value for the player to move (points still to gain, less the opponent's), or None if not covered."""
+        if position.phase != GamePhase.ESCAPE or not 1 <= position.rounds_remaining <= ESCAPE_ROUNDS:
+            return None
+        states = piece_states(position, self.max_pieces)
+        if states is None:
+            return None
+        pieces = len(states)
+        value = self.values[self.offsets[pieces]
+                            + layer_index(position.rounds_remaining, position.current) * self.sizes[pieces]
+                            + combination_index(states)]
+        return None if value == UNSOLVED else value
+
+    def best_action(self, position: Position) -> Optional[PositionAction]:
+        """A best action for the player to move, or None if the position is not covered or there is none."""
+        if self.probe(position) is None:
+            return None
+        outcomes = _outcomes(position.copy(), self.probe)
+        return max(outcomes, key=lambda outcome: outcome[1])[0]
+
+    def close(self) -> None:
+        self.values.release()
+        self._view.release()
+        self._map.close()
+
@@ -1,6 +1,5 @@
 from .piece import Piece
-from common.models.coordinate import Coord
-from common.models.direction import Direction
+from board.lookup_tables import RAY_COORDS, square_index
 from typing import List
 
 
@@ -32,31 +31,18 @@ class Bacteria(Piece):
         if not self.position:
             return []
 
+        square = square_index(self.position)
         valid_moves = []
-        directions = [
-            Direction.NORTH,
-            Direction.SOUTH, 
-            Direction.EAST,
-            Direction.WEST
-        ]
-        for direction in directions:
-            dx, dy = direction.value
-            distance = 1
-            while True:
-                new_pos = Coord(
-                    self.position.x + (dx * distance),
-                    self.position.y + (dy * distance)
-                )
-                if not board.is_within_bounds(new_pos):
-                    break
-                target_tile = board.get_tile(new_pos)
-                if not target_tile:
-                    valid_moves.append(new_pos)
-                    distance += 1
-                    continue
-                if self._can_capture(target_tile):
-                    valid_moves.append(new_pos)
-                break
+        for direction_index, ray in enumerate(RAY_COORDS[square]):
+            # Empty squares up to the first blocker, found from the occupancy masks
+            blocker = board.blocker_distance(square, direction_index)
+            if not blocker:
+                valid_moves.extend(ray)
+                continue
+            valid_moves.extend(ray[:blocker - 1])
+            target_pos = ray[blocker - 1]
+            if self._can_capture(board.grid[target_pos.x][target_pos.y]):
+                valid_moves.append(target_pos)
         return valid_moves
 
     def _can_capture(self, target_tile):
@@ -64,5 +50,6 @@ class Bacteria(Piece):
         if not target_tile or not hasattr(target_tile, 'tile_type'):
             return False
         from tile.tile_types import TileType
+        from game_engine.rules import can_capture
         # Bacteria capture red blood cells
-        return target_tile.tile_type == TileType.RED_BLOOD_CELL
\ No newline at end of file
+        return can_capture(TileType.BACTERIA, target_tile.tile_type)
\ No newline at end of file
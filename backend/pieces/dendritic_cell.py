@@ -1,6 +1,5 @@
 from .piece import Piece
-from common.models.coordinate import Coord
-from common.models.direction import Direction
+from board.lookup_tables import NEIGHBOR_COORDS, RAY_COORDS, square_index
 from typing import List
 
 
@@ -33,20 +32,11 @@ class DendriticCell(Piece):
             return []
 
         valid_moves = []
-        directions = [
-            Direction.NORTH,
-            Direction.SOUTH, 
-            Direction.EAST,
-            Direction.WEST
-        ]
-        for direction in directions:
-            dx, dy = direction.value
-            new_pos = Coord(self.position.x + dx, self.position.y + dy)
-            if board.is_within_bounds(new_pos):
-                target_tile = board.get_tile(new_pos)
-                # Dendritic cells can move to empty spaces or remove debris
-                if not target_tile or self._can_capture(target_tile):
-                    valid_moves.append(new_pos)
+        for new_pos in NEIGHBOR_COORDS[square_index(self.position)]:
+            target_tile = board.grid[new_pos.x][new_pos.y]
+            # Dendritic cells can move to empty spaces or remove debris
+            if not target_tile or self._can_capture(target_tile):
+                valid_moves.append(new_pos)
         return valid_moves
 
     def _can_capture(self, target_tile):
@@ -54,5 +44,6 @@ class DendriticCell(Piece):
         if not target_tile or not hasattr(target_tile, 'tile_type'):
             return False
         from tile.tile_types import TileType
+        from game_engine.rules import can_capture
         # Dendritic cells remove debris
-        return target_tile.tile_type == TileType.DEBRIS
\ No newline at end of file
+        return can_capture(TileType.DENDRITIC_CELL, target_tile.tile_type)
\ No newline at end of file
@@ -53,7 +53,7 @@ class TCell(Piece):
             # Keep moving in this direction until blocked
             distance = 1
             while True:
-                new_pos = Coord(
+                new_pos = Coord.of(
                     self.position.x + (dx * distance),
                     self.position.y + (dy * distance)
                 )
@@ -93,7 +93,7 @@ class TCell(Piece):
         # Keep checking in shooting direction until we find a target
         distance = 1
         while True:
-            target_pos = Coord(
+            target_pos = Coord.of(
                 self.position.x + (dx * distance),
                 self.position.y + (dy * distance)
             )
@@ -120,7 +120,6 @@ class TCell(Piece):
         if not target_tile or not hasattr(target_tile, 'tile_type'):
             return False
         from tile.tile_types import TileType
+        from game_engine.rules import can_capture
         # T Cells capture all pathogens and red blood cells
-        return target_tile.tile_type in [
-            TileType.VIRUS, TileType.BACTERIA, TileType.RED_BLOOD_CELL
-        ]
\ No newline at end of file
+        return can_capture(TileType.T_CELL, target_tile.tile_type)
\ No newline at end of file
@@ -1,6 +1,5 @@
 from .piece import Piece
-from common.models.coordinate import Coord
-from common.models.direction import Direction
+from board.lookup_tables import RAY_COORDS, square_index
 from typing import List
 
 
@@ -37,27 +36,10 @@ class RedBloodCell(Piece):
         if not self.position:
             return []
 
+        square = square_index(self.position)
         valid_moves = []
-        directions = [
-            Direction.NORTH,
-            Direction.SOUTH, 
-            Direction.EAST,
-            Direction.WEST
-        ]
-        for direction in directions:
-            dx, dy = direction.value
-            distance = 1
-            while True:
-                new_pos = Coord(
-                    self.position.x + (dx * distance),
-                    self.position.y + (dy * distance)
-                )
-                if not board.is_within_bounds(new_pos):
-                    break
-                target_tile = board.get_tile(new_pos)
-                if not target_tile:
-                    valid_moves.append(new_pos)
-                    distance += 1
-                    continue
-                break
+        for direction_index, ray in enumerate(RAY_COORDS[square]):
+            # Empty squares up to the first blocker, found from the occupancy masks
+            blocker = board.blocker_distance(square, direction_index)
+            valid_moves.extend(ray[:blocker - 1] if blocker else ray)
         return valid_moves
\ No newline at end of file
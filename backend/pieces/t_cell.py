@@ -1,6 +1,6 @@
 from .piece import Piece
-from common.models.coordinate import Coord
 from common.models.direction import Direction
+from board.lookup_tables import DIRECTIONS, RAY_COORDS, square_index
 from typing import List
 
 
@@ -39,43 +39,22 @@ class TCell(Piece):
 
         valid_moves = []
         
-        # Check all 4 directions for movement
-        directions = [
-            Direction.NORTH,
-            Direction.SOUTH, 
-            Direction.EAST,
-            Direction.WEST
-        ]
+        square = square_index(self.position)
         
-        for direction in directions:
-            dx, dy = direction.value
+        # Check all 4 directions for movement, up to the first blocker from the occupancy masks
+        for direction_index, (direction, ray) in enumerate(zip(DIRECTIONS, RAY_COORDS[square])):
+            blocker = board.blocker_distance(square, direction_index)
+            if not blocker:
+                valid_moves.extend(ray)
+                continue
             
-            # Keep moving in this direction until blocked
-            distance = 1
-            while True:
-                new_pos = Coord(
-                    self.position.x + (dx * distance),
-                    self.position.y + (dy * distance)
-                )
-                
-                # Stop if out of bounds
-                if not board.is_within_bounds(new_pos):
-                    break
-                
-                target_tile = board.get_tile(new_pos)
-                
-                # If empty, can move here and continue
-                if not target_tile:
-                    valid_moves.append(new_pos)
-                    distance += 1
-                    continue
-                
-                # If can capture (only in shooting direction), add this position
-                if direction == self.shooting_direction and self._can_capture(target_tile):
-                    valid_moves.append(new_pos)
-                
-                # Stop at any piece
-                break
+            # Empty squares before the blocker
+            valid_moves.extend(ray[:blocker - 1])
+            
+            # If can capture (only in shooting direction), add the blocker's position
+            new_pos = ray[blocker - 1]
+            if direction == self.shooting_direction and self._can_capture(board.grid[new_pos.x][new_pos.y]):
+                valid_moves.append(new_pos)
         
         return valid_moves
 
@@ -88,30 +67,11 @@ class TCell(Piece):
             return []
 
         valid_shots = []
-        dx, dy = self.shooting_direction.value
         
-        # Keep checking in shooting direction until we find a target
-        distance = 1
-        while True:
-            target_pos = Coord(
-                self.position.x + (dx * distance),
-                self.position.y + (dy * distance)
-            )
-            
-            # Stop if out of bounds
-            if not board.is_within_bounds(target_pos):
-                break
-            
-            target_tile = board.get_tile(target_pos)
-            
-            # If we find a piece, check if we can capture it
-            if target_tile:
-                if self._can_capture(target_tile):
-                    valid_shots.append(target_pos)
-                # Stop at any piece (shot is blocked)
-                break
-            
-            distance += 1
+        # The first piece in the shooting direction is the only possible target
+        target_pos = board.first_blocker(self.position, self.shooting_direction)
+        if target_pos and self._can_capture(board.grid[target_pos.x][target_pos.y]):
+            valid_shots.append(target_pos)
         
         return valid_shots
 
@@ -120,7 +80,6 @@ class TCell(Piece):
         if not target_tile or not hasattr(target_tile, 'tile_type'):
             return False
         from tile.tile_types import TileType
+        from game_engine.rules import can_capture
         # T Cells capture all pathogens and red blood cells
-        return target_tile.tile_type in [
-            TileType.VIRUS, TileType.BACTERIA, TileType.RED_BLOOD_CELL
-        ]
\ No newline at end of file
+        return can_capture(TileType.T_CELL, target_tile.tile_type)
\ No newline at end of file
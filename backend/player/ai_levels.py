@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict
+
+from pieces.piece_owner import PieceOwner
+from player.ai_player import AIPlayer
+from player.expectimax_player import ExpectimaxPlayer
+
+
+class AIStrategy(Enum):
+    """How an AI level picks its actions."""
+
+    # Uniformly random valid actions
+    RANDOM = "random"
+    # One-ply lookahead: the action with the best immediate evaluation
+    GREEDY = "greedy"
+    # Iterative-deepening expectimax search
+    SEARCH = "search"
+
+
+class AILevel(Enum):
+    EASY = "easy"
+    MEDIUM = "medium"
+    HARD = "hard"
+
+
+@dataclass(frozen=True)
+class AILevelConfig:
+    """
+    Strategy and compute budget of an AI level.
+
+    `move_seconds` and `node_budget` cap a single decision; `game_seconds`
+    caps the AI's thinking time over a whole game, after which the session
+    scheduler falls back to random play.
+    """
+    strategy: AIStrategy
+    move_seconds: float
+    node_budget: int
+    max_depth: int
+    game_seconds: float
+
+
+AI_LEVELS: Dict[AILevel, AILevelConfig] = {
+    AILevel.EASY: AILevelConfig(AIStrategy.RANDOM, move_seconds=0.0, node_budget=0, max_depth=0, game_seconds=0.0),
+    AILevel.MEDIUM: AILevelConfig(AIStrategy.GREEDY, move_seconds=0.1, node_budget=500, max_depth=1, game_seconds=5.0),
+    AILevel.HARD: AILevelConfig(AIStrategy.SEARCH, move_seconds=1.0, node_budget=20000, max_depth=6, game_seconds=60.0),
+}
+
+DEFAULT_AI_LEVEL = AILevel.EASY
+
+
+def create_ai_player(name: str, faction: PieceOwner, level: AILevel = DEFAULT_AI_LEVEL) -> AIPlayer:
+    """Build the AI player for `level`."""
+    config = AI_LEVELS[level]
+    if config.strategy == AIStrategy.RANDOM:
+        return AIPlayer(name, faction)
+    return ExpectimaxPlayer(name, faction, max_depth=config.max_depth,
+                            node_budget=config.node_budget, time_limit=config.move_seconds)
+
+
+def choose_budgeted_action(player: AIPlayer, game_engine, seconds_left: float):
+    """
+    Ask `player` for an action within `seconds_left` of thinking time.
+    Search players get their per-move limit cut down to what is left; once
+    nothing is left every player plays randomly, which costs next to nothing.
+    """
+    if not isinstance(player, ExpectimaxPlayer):
+        return player.choose_action(game_engine)
+    if seconds_left <= 0:
+        return AIPlayer.choose_action(player, game_engine)
+    return player.choose_action(game_engine, time_limit=min(player.time_limit, seconds_left))
@@ -0,0 +1,119 @@
+"""
+Move analysis for coaching: every legal action scored and ranked.
+
+`AnalysisPool.analyze` deepens one ply at a time. Each depth scores all of
+the player's actions, split across worker processes, and only a depth that
+every worker finishes inside the time budget counts, so all actions in a
+result are compared at the same depth. Depth 1 is the evaluator applied
+after each action; it is cheap, runs in the calling thread and always
+completes. Deeper plies are short expectimax searches with full windows,
+so every score is exact for its depth rather than a bound.
+
+The budget runs from the call, not from when a worker picks a job up: jobs
+carry a wall-clock deadline, and a depth still queued or running when it
+passes is abandoned for the depth before it.
+"""
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import List, NamedTuple, Optional, Tuple
+
+from common.logging_config import GameLogger
+from common.metrics import metrics
+from game_engine.position import Position, PositionAction
+from player.expectimax_player import ExpectimaxPlayer
+
+
+ANALYSIS_SECONDS = metrics.histogram("phage_analysis_seconds", "Time spent analyzing a position")
+ANALYSIS_DEPTH = metrics.histogram(
+    "phage_analysis_depth", "Depth every action was scored to in an analysis", buckets=(1, 2, 3, 4, 5, 6)
+)
+
+logger = GameLogger.get_module_logger("player.analysis")
+
+# Searches are bounded by the time budget, not by nodes
+_UNBOUNDED_NODES = 1 << 62
+
+
+class Analysis(NamedTuple):
+    # (action code, score for the player to move), best first; ties keep move generation order
+    ranked: List[Tuple[PositionAction, float]]
+    depth: int
+    seconds: float
+
+
+def score_actions(position: Position, actions: List[PositionAction], depth: int,
+                  deadline: float) -> Optional[List[float]]:
+    """Scores of `actions` at `depth`, or None if the `time.time()` deadline passes first; runs in a worker."""
+    time_limit = deadline - time.time()
+    if time_limit <= 0:
+        return None
+    searcher = ExpectimaxPlayer("analysis", node_budget=_UNBOUNDED_NODES, time_limit=time_limit)
+    return searcher.score_actions(position, actions, depth)
+
+
+class AnalysisPool:
+    """
+    Worker processes shared by the analyses of every session.
+
+    With `max_workers` 0 each analysis runs in the calling thread instead.
+    Workers are separate processes, so a long analysis neither holds the
+    GIL against request handling nor slows other games' AI moves; the
+    calling thread only waits.
+    """
+
+    def __init__(self, max_workers: int = 0, max_depth: int = 3):
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self._executor = ProcessPoolExecutor(
+            max_workers, mp_context=multiprocessing.get_context("spawn"),
+        ) if max_workers > 0 else None
+
+    def analyze(self, position: Position, time_budget: float) -> Analysis:
+        """Rank the legal actions of the player to move in `position`, deepening while `time_budget` lasts."""
+        started = time.time()
+        deadline = started + time_budget
+        actions = position.legal_actions()
+        scores: List[float] = []
+        depth_done = 0
+        if actions:
+            # The evaluator pass is cheap and always finishes, so there is always a ranking
+            scores, depth_done = score_actions(position, actions, 1, math.inf), 1
+            for depth in range(2, self.max_depth + 1):
+                if time.time() >= deadline:
+                    break
+                depth_scores = self._score(position, actions, depth, deadline)
+                if depth_scores is None:
+                    break
+                scores, depth_done = depth_scores, depth
+        ranked = sorted(zip(actions, scores), key=lambda scored: scored[1], reverse=True)
+        seconds = time.time() - started
+        ANALYSIS_SECONDS.observe(seconds)
+        ANALYSIS_DEPTH.observe(depth_done)
+        return Analysis(ranked, depth_done, seconds)
+
+    def _score(self, position: Position, actions: List[PositionAction], depth: int,
+               deadline: float) -> Optional[List[float]]:
+        if self._executor is None:
+            return score_actions(position, actions, depth, deadline)
+        # Interleaved chunks spread the costly actions of each piece over the workers
+        chunks = [actions[start::self.max_workers] for start in range(min(self.max_workers, len(actions)))]
+        futures = [self._executor.submit(score_actions, position, chunk, depth, deadline) for chunk in chunks]
+        _, pending = wait(futures, timeout=max(0.0, deadline - time.time()))
+        if pending:
+            # Queued jobs are dropped; running ones stop at the deadline they carry
+            for future in pending:
+                future.cancel()
+            return None
+        results = [future.result() for future in futures]
+        if any(result is None for result in results):
+            return None
+        scores = [0.0] * len(actions)
+        for start, result in enumerate(results):
+            scores[start::len(chunks)] = result
+        return scores
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
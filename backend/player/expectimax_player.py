@@ -0,0 +1,248 @@
+"""
+Expectimax search player.
+
+Searches the player's own view of the game (`GameEngine.player_view`) with
+iterative-deepening alpha-beta. Moves, shots, cuts and escapes are decision
+nodes; flips, and shots that stop on a face-down tile, are chance nodes
+weighted by the remaining hidden-tile distribution. The search is
+deterministic for a given node budget; the time limit is a hard cap that
+only cuts it short when the budget would take longer.
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+
+from board.lookup_tables import NUM_SQUARES
+from board.symmetry import INVERSE
+from common.logging_config import GameLogger
+from common.models.action import Action
+from evaluation_engine.evaluation_engine import evaluate
+from game_engine.action_codes import ESCAPE, KIND_MASK, MOVE, SHOOT, unpack
+from game_engine.position import POINTS, SHOOTABLE, UNKNOWN, Position, PositionAction
+from pieces.piece_owner import PieceOwner
+from player.ai_player import AIPlayer
+
+
+logger = GameLogger.get_module_logger("player.expectimax")
+
+INFINITY = float("inf")
+
+# Transposition table bounds
+EXACT, LOWER, UPPER = range(3)
+
+# Move ordering tiers, highest first
+TT_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 20
+KILLER_SCORE = 1 << 16
+
+
+class SearchBudgetExhausted(Exception):
+    """Raised inside the search when the node budget or deadline runs out."""
+
+
+class ExpectimaxPlayer(AIPlayer):
+    def __init__(self, name: str, faction: PieceOwner = None, max_depth: int = 4,
+                 node_budget: int = 20000, time_limit: float = 2.0):
+        super().__init__(name, faction)
+        self.max_depth = max_depth
+        self.node_budget = node_budget
+        self.time_limit = time_limit
+        self.last_depth = 0
+        self.last_nodes = 0
+        self._stopped = False
+        # Transposition table handed over by pondering, used by the next search
+        self._reused_table: Optional[Dict[tuple, tuple]] = None
+
+    def choose_action(self, game_engine, time_limit: Optional[float] = None) -> Optional[Action]:
+        """
+        Search the player's view of the game and return the best action found.
+        `time_limit` overrides the player's own per-move limit for this move.
+        """
+        action = self.search(game_engine.player_view(self), time_limit)
+        if action is None:
+            logger.info("%s has no valid moves, passing turn", self.name)
+            return None
+        logger.debug("%s searched %d nodes to depth %d", self.name, self.last_nodes, self.last_depth)
+        return Position.to_action(action)
+
+    def reuse_table(self, table: Dict[tuple, tuple]) -> None:
+        """Start the next search from `table`, e.g. one filled while pondering the opponent's turn."""
+        self._reused_table = table
+
+    def stop(self) -> None:
+        """Abandon the running search, and any later one; for searches run on another thread."""
+        self._stopped = True
+
+    def search(self, position: Position, time_limit: Optional[float] = None,
+               table: Optional[Dict[tuple, tuple]] = None) -> Optional[PositionAction]:
+        """
+        Best action for the player to move in `position`, or None if there is none.
+        Results are stored in `table` if given, so the caller can keep them.
+        """
+        self._start(time_limit, table)
+        position = position.copy()
+
+        actions = self._candidates(position)
+        if not actions:
+            return None
+        best = actions[0]
+        self.last_depth = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                _, move = self._negamax(position, depth, -INFINITY, INFINITY, 0)
+            except SearchBudgetExhausted:
+                break
+            if move is not None:
+                best = move
+            self.last_depth = depth
+        self.last_nodes = self._nodes
+        return best
+
+    def _candidates(self, position: Position) -> List[PositionAction]:
+        """
+        Legal actions worth searching. Shots that cannot hit anything change
+        nothing but the turn; they are kept only when nothing else is legal.
+        """
+        actions = position.legal_actions()
+        useful = [action for action in actions if action & KIND_MASK != SHOOT or self._shot_may_hit(position, action)]
+        return useful or actions[:1]
+
+    @staticmethod
+    def _shot_may_hit(position: Position, action: PositionAction) -> bool:
+        _, square, direction = unpack(action)
+        target = position._shot_target(square, direction)
+        return target is not None and (position.types[target] == UNKNOWN or position.types[target] in SHOOTABLE)
+
+    @staticmethod
+    def _gain(position: Position, action: PositionAction) -> int:
+        """Points an action scores outright, for ordering captures first."""
+        kind, square, argument = unpack(action)
+        if kind == MOVE:
+            return POINTS[position.types[argument]] if argument < NUM_SQUARES else POINTS[position.types[square]]
+        if kind == ESCAPE:
+            return POINTS[position.types[square]]
+        if kind == SHOOT:
+            target = position._shot_target(square, argument)
+            return POINTS[position.types[target]] if target is not None else 0
+        return 0
+
+    def _ordered(self, position: Position, actions: List[PositionAction], ply: int,
+                 tt_move: Optional[PositionAction]) -> List[PositionAction]:
+        killers = self._killers.get(ply, ())
+        history = self._history
+
+        def score(action):
+            if action == tt_move:
+                return TT_MOVE_SCORE
+            gain = self._gain(position, action)
+            if gain:
+                return CAPTURE_SCORE + gain
+            if action in killers:
+                return KILLER_SCORE
+            return history.get(action, 0)
+
+        return sorted(actions, key=score, reverse=True)
+
+    def score_actions(self, position: Position, actions: List[PositionAction], depth: int,
+                      time_limit: Optional[float] = None) -> Optional[List[float]]:
+        """
+        Exact value of each of `actions` for the player to move, searched to
+        `depth` plies including the action itself; for ranking every action
+        rather than picking one. None if the budget runs out first.
+        """
+        self._start(time_limit, {})
+        position = position.copy()
+        try:
+            return [self._action_value(position, action, depth, -INFINITY, INFINITY, 0) for action in actions]
+        except SearchBudgetExhausted:
+            return None
+        finally:
+            self.last_nodes = self._nodes
+
+    def _start(self, time_limit: Optional[float], table: Optional[Dict[tuple, tuple]]) -> None:
+        self._nodes = 0
+        self._deadline = time.monotonic() + (self.time_limit if time_limit is None else time_limit)
+        if table is None:
+            table, self._reused_table = self._reused_table or {}, None
+        self._table: Dict[tuple, Tuple[int, int, float, Optional[PositionAction]]] = table
+        self._killers: Dict[int, List[PositionAction]] = {}
+        self._history: Dict[PositionAction, int] = {}
+
+    def _count_node(self) -> None:
+        self._nodes += 1
+        if self._stopped or self._nodes > self.node_budget:
+            raise SearchBudgetExhausted()
+        if not self._nodes & 255 and time.monotonic() > self._deadline:
+            raise SearchBudgetExhausted()
+
+    def _negamax(self, position: Position, depth: int, alpha: float, beta: float,
+                 ply: int) -> Tuple[float, Optional[PositionAction]]:
+        """Value of `position` for the player to move, and the best action found there."""
+        self._count_node()
+        if position.is_finished or depth == 0:
+            return evaluate(position, position.current), None
+
+        # Symmetric positions share an entry; its move is kept in the canonical orientation
+        key, symmetry = position.canonical_key()
+        entry = self._table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, bound, value, tt_move = entry
+            if tt_move is not None and symmetry:
+                tt_move = Position.transform_action(tt_move, INVERSE[symmetry])
+            if entry_depth >= depth and (
+                    bound == EXACT or (bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha)):
+                return value, tt_move
+
+        actions = self._candidates(position)
+        if not actions:
+            return evaluate(position, position.current), None
+
+        original_alpha = alpha
+        best_value, best_move = -INFINITY, None
+        for action in self._ordered(position, actions, ply, tt_move):
+            value = self._action_value(position, action, depth, alpha, beta, ply)
+            if value > best_value:
+                best_value, best_move = value, action
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                if not self._gain(position, action):
+                    killers = self._killers.setdefault(ply, [])
+                    if action not in killers:
+                        killers.insert(0, action)
+                        del killers[2:]
+                    self._history[action] = self._history.get(action, 0) + depth * depth
+                break
+
+        if best_value <= original_alpha:
+            bound = UPPER
+        elif best_value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        if best_move is not None and symmetry:
+            best_move_stored = Position.transform_action(best_move, symmetry)
+        else:
+            best_move_stored = best_move
+        self._table[key] = (depth, bound, best_value, best_move_stored)
+        return best_value, best_move
+
+    def _action_value(self, position: Position, action: PositionAction, depth: int,
+                      alpha: float, beta: float, ply: int) -> float:
+        """Value of playing `action`; the expectation over outcomes when it exposes a face-down tile."""
+        outcomes = position.chance_outcomes(action)
+        if outcomes is None:
+            token = position.apply(action)
+            value = -self._negamax(position, depth - 1, -beta, -alpha, ply + 1)[0]
+            position.undo(token)
+            return value
+
+        # Chance node: each outcome is searched with a full window so the
+        # weighted sum is exact
+        expected = 0.0
+        for code, probability in outcomes:
+            token = position.apply(action, code)
+            expected += probability * -self._negamax(position, depth - 1, -INFINITY, INFINITY, ply + 1)[0]
+            position.undo(token)
+        return expected
+
@@ -0,0 +1,155 @@
+"""
+Flip policy for the FLIP phase, read from a table built offline by
+`tools/build_flip_table.py` from self-play.
+
+The table holds, per flipping player, square and neighbourhood bucket, the
+mean change in the flipper's evaluation over the flip and the opponent's
+reply, and how many flips it was measured on. A bucket is the number of
+face-up neighbours only the flipper can move, only the opponent can move
+(each capped at 2) and face-down neighbours. Scoring a flip is one lookup,
+so the early turns, where search drowns in chance branching, cost nothing.
+
+The file is memory-mapped on load and stays read-only; the server loads it
+at startup from PHAGE_FLIP_TABLE, or data/flip_policy.bin under backend/.
+Values are stored in native byte order, so build the table on the machine
+(or architecture) that serves it.
+"""
+import mmap
+import os
+import random
+import struct
+from typing import List, Optional, Sequence
+
+from board.lookup_tables import NEIGHBORS, NUM_SQUARES
+from common.logging_config import GameLogger
+from game_engine.position import MOVABLE, Position
+
+
+logger = GameLogger.get_module_logger("player.flip_policy")
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "flip_policy.bin")
+
+MAGIC = b"PHFP"
+VERSION = 1
+# magic, version, players, squares, buckets
+HEADER = struct.Struct("=4sHHHH")
+
+MAX_SIDE_NEIGHBORS = 2
+MAX_HIDDEN_NEIGHBORS = 4
+NUM_BUCKETS = (MAX_SIDE_NEIGHBORS + 1) ** 2 * (MAX_HIDDEN_NEIGHBORS + 1)
+NUM_CELLS = 2 * NUM_SQUARES * NUM_BUCKETS
+
+# Cells measured on fewer flips than this are treated as unknown
+MIN_SAMPLES = 20
+
+
+def flip_bucket(types: Sequence[int], face_down: Sequence[int], square: int, player: int) -> int:
+    """Neighbourhood bucket of `square` for player index `player`, from a Position's arrays."""
+    own = theirs = hidden = 0
+    mine, other = MOVABLE[player], MOVABLE[1 - player]
+    for neighbor in NEIGHBORS[square]:
+        if face_down[neighbor]:
+            hidden += 1
+            continue
+        code = types[neighbor]
+        if code in mine and code not in other:
+            own += 1
+        elif code in other and code not in mine:
+            theirs += 1
+    return ((min(own, MAX_SIDE_NEIGHBORS) * (MAX_SIDE_NEIGHBORS + 1) + min(theirs, MAX_SIDE_NEIGHBORS))
+            * (MAX_HIDDEN_NEIGHBORS + 1) + hidden)
+
+
+def cell_index(player: int, square: int, bucket: int) -> int:
+    return (player * NUM_SQUARES + square) * NUM_BUCKETS + bucket
+
+
+def write_table(path: str, sums: Sequence[float], counts: Sequence[int]) -> None:
+    """Write per-cell outcome sums and counts as a table of means; replaces `path` atomically."""
+    means = [total / count if count else 0.0 for total, count in zip(sums, counts)]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    partial = path + ".tmp"
+    with open(partial, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, 2, NUM_SQUARES, NUM_BUCKETS))
+        handle.write(struct.pack(f"={NUM_CELLS}f", *means))
+        handle.write(struct.pack(f"={NUM_CELLS}I", *(min(count, 0xFFFFFFFF) for count in counts)))
+    os.replace(partial, path)
+
+
+class FlipPolicy:
+    """Read-only view of a memory-mapped flip table."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, players, squares, buckets = HEADER.unpack_from(self._map)
+        expected_size = HEADER.size + NUM_CELLS * 8
+        if (magic, version, players, squares, buckets) != (MAGIC, VERSION, 2, NUM_SQUARES, NUM_BUCKETS) \
+                or len(self._map) != expected_size:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} flip table")
+        self._view = view = memoryview(self._map)
+        self.means = view[HEADER.size:HEADER.size + NUM_CELLS * 4].cast("f")
+        self.counts = view[HEADER.size + NUM_CELLS * 4:].cast("I")
+        self.path = path
+
+    def score(self, player: int, square: int, bucket: int) -> Optional[float]:
+        """Mean outcome of the flip, or None if the table has too few samples for it."""
+        index = cell_index(player, square, bucket)
+        return self.means[index] if self.counts[index] >= MIN_SAMPLES else None
+
+    def choose(self, position: Position) -> Optional[int]:
+        """Best-scoring face-down square for the player to move, or None if no candidate has data."""
+        player = position.current
+        types, face_down = position.types, position.face_down
+        best: List[int] = []
+        best_score = None
+        for square in range(NUM_SQUARES):
+            if not face_down[square]:
+                continue
+            score = self.score(player, square, flip_bucket(types, face_down, square, player))
+            if score is None:
+                continue
+            if best_score is None or score > best_score:
+                best, best_score = [square], score
+            elif score == best_score:
+                best.append(square)
+        return random.choice(best) if best else None
+
+    def close(self) -> None:
+        self.means.release()
+        self.counts.release()
+        self._view.release()
+        self._map.close()
+
+
+_policy: Optional[FlipPolicy] = None
+
+
+def load_flip_policy(path: Optional[str] = None) -> Optional[FlipPolicy]:
+    """Map the flip table and make it the active policy; None (random flips) if it is missing or invalid."""
+    global _policy
+    path = path or os.environ.get("PHAGE_FLIP_TABLE") or DEFAULT_TABLE_PATH
+    try:
+        policy = FlipPolicy(path)
+    except FileNotFoundError:
+        logger.info("No flip table at %s, AI flips at random", path)
+        return None
+    except (OSError, ValueError, struct.error) as e:
+        logger.warning("Ignoring flip table %s: %s", path, e)
+        return None
+    unload_flip_policy()
+    _policy = policy
+    logger.info("Loaded flip table %s", path)
+    return policy
+
+
+def unload_flip_policy() -> None:
+    global _policy
+    if _policy is not None:
+        _policy.close()
+        _policy = None
+
+
+def active_flip_policy() -> Optional[FlipPolicy]:
+    return _policy
@@ -44,7 +44,7 @@ class HumanPlayer(Player):
         print("Choose coordinates to flip (e.g., '2 3'):")
         try:
             x, y = map(int, input().split())
-            target = Coord(x, y)
+            target = Coord.of(x, y)
             
             # Validate flip action
             tile = game_engine.board.get_tile(target)
@@ -67,8 +67,8 @@ class HumanPlayer(Player):
         print("Format: 'from_x from_y to_x to_y'")
         try:
             from_x, from_y, to_x, to_y = map(int, input().split())
-            source = Coord(from_x, from_y)
-            target = Coord(to_x, to_y)
+            source = Coord.of(from_x, from_y)
+            target = Coord.of(to_x, to_y)
             
             # Basic validation
             from_tile = game_engine.board.get_tile(source)
@@ -87,7 +87,7 @@ class HumanPlayer(Player):
         print("Choose T cell position to shoot from (e.g., '2 3'):")
         try:
             x, y = map(int, input().split())
-            source = Coord(x, y)
+            source = Coord.of(x, y)
             
             # Prompt for shooting direction
             print("Choose shooting direction (N/S/E/W):")
@@ -112,7 +112,7 @@ class HumanPlayer(Player):
         print("Choose dendritic cell position to clear debris from (e.g., '2 3'):")
         try:
             x, y = map(int, input().split())
-            source = Coord(x, y)
+            source = Coord.of(x, y)
             
             return Action(ActionType.CUT, target=source)
             
@@ -0,0 +1,118 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from common.logging_config import GameLogger
+from common.metrics import metrics
+from game_engine.position import Position
+from player.expectimax_player import ExpectimaxPlayer
+
+
+PONDER_STARTED = metrics.counter("phage_ponder_started_total", "Pondering searches started")
+PONDER_REJECTED = metrics.counter(
+    "phage_ponder_rejected_total", "Pondering searches skipped because the ponder pool was full"
+)
+PONDER_REUSED = metrics.counter(
+    "phage_ponder_reused_total", "Pondering tables handed to the AI for its next move"
+)
+
+logger = GameLogger.get_module_logger("player.ponder")
+
+
+class PonderPool:
+    """
+    Background threads shared by the pondering of every session.
+
+    At most `max_workers` searches run at once and at most `max_pending`
+    are running or queued; further requests are dropped rather than queued,
+    so pondering never builds up a backlog on a busy server.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: Optional[int] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending if max_pending is not None else max_workers * 2
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="ponder")
+
+    def submit(self, fn, *args) -> Optional[Future]:
+        """Run `fn(*args)` in the background, or return None if the pool is full."""
+        if not self._slots.acquire(blocking=False):
+            PONDER_REJECTED.inc()
+            return None
+        try:
+            future = self._executor.submit(fn, *args)
+        except RuntimeError:
+            # Shut down
+            self._slots.release()
+            return None
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class Ponderer:
+    """
+    Searches the opponent's turn in the background for one search AI.
+
+    `start` searches the position with the opponent to move, one ply deeper
+    than the AI's own search, into a fresh transposition table; the most
+    likely replies come first in its move ordering and get searched deepest.
+    `stop` ends that search when the opponent's action arrives and hands the
+    table to the AI. The AI's next search starts from it and finds the
+    subtree below the actual reply already searched.
+    """
+
+    def __init__(self, player: ExpectimaxPlayer, pool: PonderPool,
+                 node_budget: Optional[int] = None, time_limit: float = 30.0):
+        self.player = player
+        self.pool = pool
+        self.node_budget = node_budget if node_budget is not None else player.node_budget * 10
+        self.time_limit = time_limit
+        self._searcher: Optional[ExpectimaxPlayer] = None
+        self._future: Optional[Future] = None
+        self._table: Dict[tuple, tuple] = {}
+
+    @property
+    def is_pondering(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def start(self, position: Position) -> bool:
+        """Ponder `position`, the AI's view with the opponent to move. Returns False if the pool is full."""
+        self.cancel()
+        searcher = ExpectimaxPlayer(self.player.name, self.player.faction, max_depth=self.player.max_depth + 1,
+                                    node_budget=self.node_budget, time_limit=self.time_limit)
+        table: Dict[tuple, tuple] = {}
+        future = self.pool.submit(searcher.search, position, None, table)
+        if future is None:
+            return False
+        PONDER_STARTED.inc()
+        self._searcher, self._future, self._table = searcher, future, table
+        return True
+
+    def _halt(self) -> bool:
+        """Stop the search and wait for it; True if it ran at all."""
+        if self._future is None:
+            return False
+        self._searcher.stop()
+        ran = not self._future.cancel()
+        if ran:
+            exception = self._future.exception()
+            if exception is not None:
+                logger.error("Pondering failed: %s", exception)
+                ran = False
+        self._searcher, self._future = None, None
+        return ran
+
+    def stop(self) -> None:
+        """The opponent has moved: end pondering and give its results to the AI."""
+        if self._halt():
+            PONDER_REUSED.inc()
+            self.player.reuse_table(self._table)
+        self._table = {}
+
+    def cancel(self) -> None:
+        """End pondering and drop its results, e.g. when the game ends."""
+        self._halt()
+        self._table = {}
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+from pydantic import ValidationError
+
+from api.models.api_models import ActionRequest
+from api.models.game_manager import GameSessionManager
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+from common.models.direction import Direction
+from game_engine.action_codes import CODE_BITS, decode, describe, encode, pack, unpack, MOVE
+from game_engine.perft import CANDIDATE_ACTIONS, seeded_engine
+from game_engine.position import Position
+
+
+def test_every_action_round_trips_through_its_code():
+    codes = {encode(action) for action in CANDIDATE_ACTIONS}
+    assert len(codes) == len(CANDIDATE_ACTIONS)
+    assert max(codes) < 1 << CODE_BITS
+    for action in CANDIDATE_ACTIONS:
+        code = encode(action)
+        assert decode(code) == action
+        assert decode(code) is decode(code)
+        assert pack(*unpack(code)) == code
+    # A shot given by its source, as the human player builds it, packs like one given by its target
+    assert encode(Action(ActionType.SHOOT, source=Coord(2, 2), direction=Direction.EAST)) == \
+        encode(Action(ActionType.SHOOT, target=Coord(2, 2), direction=Direction.EAST))
+    assert describe(encode(Action(ActionType.MOVE, source=Coord(3, 0), target=Coord(3, -1)))) == "move 3,0->3,-1"
+
+
+def test_position_actions_are_codes():
+    engine = seeded_engine(4, 110)
+    position = Position.from_engine(engine)
+    for code in position.legal_actions():
+        assert encode(Position.to_action(code)) == code
+
+
+@pytest.mark.parametrize("code", [7, 49 << 3, pack(MOVE, 0, 53), pack(0, 0, 1), 1 << CODE_BITS])
+def test_invalid_codes_are_rejected(code):
+    with pytest.raises(ValueError):
+        decode(code)
+    with pytest.raises(ValidationError):
+        ActionRequest(code=code)
+
+
+def test_requests_carry_codes():
+    action = Action(ActionType.SHOOT, target=Coord(1, 5), direction=Direction.NORTH)
+    request = ActionRequest.from_action(action)
+    assert request.to_action() == action
+    assert ActionRequest(code=request.code).to_action() == action
+    assert ActionRequest.model_validate(request.model_dump(exclude={"code"})).to_action() == action
+    with pytest.raises(ValidationError):
+        ActionRequest()
+
+    manager = GameSessionManager()
+    game_id = manager.create_game("Ada", "Bob")
+    flip = Action(ActionType.FLIP, target=Coord(0, 0))
+    assert manager.apply_action(game_id, "Ada", ActionRequest(code=encode(flip)).to_action())[0]
+    assert manager.get_game_state(game_id)["move_history"][-1]["details"]["code"] == encode(flip)
+
+
+def test_legal_actions_are_cached_per_state_version():
+    manager = GameSessionManager()
+    assert manager.get_legal_actions("missing") is None
+    game_id = manager.create_game("Ada", "Bob")
+    session = manager.get_game(game_id)
+    legal = manager.get_legal_actions(game_id)
+    assert legal["state_version"] == 0 and legal["current_player"] == "Ada"
+    assert len(legal["actions"]) == session.game_engine.board.face_down_tiles_count and all(decode(code).type == ActionType.FLIP for code in legal["actions"])
+    assert session.legal_actions() is session.legal_actions()
+
+    # Every listed action is accepted by the engine, and one from a single square
+    flip = decode(legal["actions"][-1])
+    assert manager.get_legal_actions(game_id, flip.target)["actions"] == [legal["actions"][-1]]
+    assert manager.apply_action(game_id, "Ada", decode(legal["actions"][0]))[0]
+    legal = manager.get_legal_actions(game_id)
+    assert legal["state_version"] == 1 and legal["current_player"] == "Bob"
+
+    # Through a whole game the list is exactly what the rules validator accepts
+    engine = session.game_engine
+    rng = random.Random(1)
+    while session.is_active:
+        legal = manager.get_legal_actions(game_id)
+        player = engine.current_player
+        assert {decode(code) for code in legal["actions"]} == {
+            action for action in CANDIDATE_ACTIONS if engine.rules_validator.validate_action(player, action)[0]}
+        if not legal["actions"]:
+            engine.next_turn()
+            session.state_changed()
+            session.is_active = not engine.is_game_over
+            continue
+        assert manager.apply_action(game_id, player.name, decode(rng.choice(legal["actions"])))[0]
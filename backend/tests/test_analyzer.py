@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from api.models.game_manager import GameSessionManager
+from evaluation_engine.evaluation_engine import evaluate
+from game_engine.action_codes import decode
+from game_engine.perft import seeded_engine
+from game_engine.position import Position
+from player.analyzer import AnalysisPool
+
+
+def _position():
+    engine = seeded_engine(4, 60)
+    return Position.from_engine(engine, engine.current_player_turn_index)
+
+
+def test_depth_one_scores_are_the_evaluation_after_each_action():
+    position = _position()
+    analysis = AnalysisPool(max_depth=1).analyze(position, 1e-6)
+    assert analysis.depth == 1
+    assert sorted(code for code, _ in analysis.ranked) == sorted(position.legal_actions())
+    scores = [score for _, score in analysis.ranked]
+    assert scores == sorted(scores, reverse=True)
+    for code, score in analysis.ranked:
+        if position.chance_outcomes(code) is None:
+            child = position.copy()
+            child.apply(code)
+            assert score == -evaluate(child, child.current)
+
+
+def test_worker_processes_rank_like_the_calling_thread():
+    position = _position()
+    pool = AnalysisPool(max_workers=2, max_depth=2)
+    try:
+        analysis = pool.analyze(position, 60.0)
+    finally:
+        pool.shutdown()
+    inline = AnalysisPool(max_depth=2).analyze(position, 60.0)
+    assert analysis.depth == inline.depth == 2
+    assert analysis.ranked == inline.ranked
+
+
+def test_busy_workers_do_not_stretch_the_budget():
+    position = _position()
+    pool = AnalysisPool(max_workers=1, max_depth=3)
+    try:
+        # Another analysis's jobs hold the only worker for longer than the budget
+        blocker = pool._executor.submit(time.sleep, 2)
+        started = time.monotonic()
+        analysis = pool.analyze(position, 0.5)
+        assert time.monotonic() - started < 1.5
+        assert analysis.depth == 1 and len(analysis.ranked) == len(position.legal_actions())
+        blocker.cancel()
+    finally:
+        pool.shutdown()
+
+
+def test_session_analyses_are_cached_per_state_version():
+    manager = GameSessionManager()
+    assert manager.analyze("missing", "Ada", 0.1) is None
+    game_id = manager.create_game("Ada", "Bob")
+    with pytest.raises(ValueError):
+        manager.analyze(game_id, "Bob", 0.1)
+    with pytest.raises(ValueError):
+        manager.analyze(game_id, "Eve", 0.1)
+
+    first = manager.analyze(game_id, "Ada", 0.05)
+    assert first["state_version"] == 0 and len(first["actions"]) == len(manager.get_legal_actions(game_id)["actions"])
+    future = manager.get_game(game_id).analyses[0][2]
+    assert manager.analyze(game_id, "Ada", 0.01) == first
+    assert manager.get_game(game_id).analyses[0][2] is future
+    # A bigger budget analyzes again
+    manager.analyze(game_id, "Ada", 0.1)
+    assert manager.get_game(game_id).analyses[0][2] is not future
+
+    assert manager.apply_action(game_id, "Ada", decode(first["actions"][0]["code"]))[0]
+    assert manager.analyze(game_id, "Bob", 0.05)["state_version"] == 1
@@ -3,6 +3,9 @@ from api.models.game_manager import GameSessionManager
 from common.models.action import Action, ActionType
 from common.models.coordinate import Coord
 from common.models.direction import Direction
+from player.ai_levels import AILevel
+from player.ai_player import AIPlayer
+from player.expectimax_player import ExpectimaxPlayer
 
 @pytest.fixture
 def game_manager():
@@ -54,3 +57,46 @@ def test_cleanup_expired_games(game_manager):
     cleaned = game_manager.cleanup_expired_games(timeout_hours=1)
     assert cleaned == 1
     assert game_manager.get_game(game_id) is None
+
+
+def test_stats_counters_track_lifecycle(game_manager):
+    first = game_manager.create_game("Carol", None)
+    second = game_manager.create_game("Dave", "Erin")
+    stats = game_manager.get_stats()
+    assert stats["total_games"] == 2
+    assert stats["active_games"] == 2
+    assert stats["games_per_phase"]["flip"] == 2
+    assert stats["oldest_game"] == game_manager.get_game(first).created_at
+
+    success, _, _ = game_manager.apply_action(second, "Dave", Action(ActionType.FLIP, target=Coord(0, 0)))
+    assert success
+    assert game_manager.get_stats()["actions_per_second"] > 0
+
+    assert game_manager.resign_game(second, "Dave")[0]
+    stats = game_manager.get_stats()
+    assert stats["active_games"] == 1
+    assert stats["finished_games"] == 1
+    assert stats["games_per_phase"]["finished"] == 1
+    assert stats["average_game_length"] == 1
+
+    assert game_manager.delete_game(first)
+    stats = game_manager.get_stats()
+    assert stats["total_games"] == 1
+    assert stats["games_per_phase"]["flip"] == 0
+    assert stats["oldest_game"] == game_manager.get_game(second).created_at
+
+
+def test_ai_level_picks_strategy_and_budget(game_manager):
+    easy = game_manager.get_game(game_manager.create_game("Fay", None))
+    hard = game_manager.get_game(game_manager.create_game("Gus", None, AILevel.HARD))
+    assert type(easy.game_engine.players[1]) is AIPlayer
+    assert isinstance(hard.game_engine.players[1], ExpectimaxPlayer)
+
+    # With the game budget spent the search AI falls back to random play
+    hard.ai_seconds_used = 1e9
+    hard.game_engine.players[1].search = lambda *args: pytest.fail("searched past the game budget")
+    assert game_manager.apply_action(hard.game_id, "Gus", Action(ActionType.FLIP, target=Coord(0, 0)))[0]
+    hard.ai_can_move_after = None
+    game_manager._process_ai_turns(hard)
+    assert hard.game_engine.current_player.name == "Gus"
+    assert hard.ai_seconds_used >= 1e9
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from board.board import Board
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+from common.models.direction import Direction
+from game_engine.batched_engine import ACTIONS, ACTION_INDEX, TILE_CODE, BatchedEngine
+from game_engine.game_engine import GameEngine
+from pieces.piece_owner import PieceOwner
+from player.human_player import HumanPlayer
+from tile.tile_types import TileType
+
+STATE_FIELDS = ("types", "factions", "flipped", "previous", "moved_by", "revealed_by",
+                "current", "phase", "rounds_remaining", "scores", "turn", "winner")
+
+
+def _candidate_actions():
+    """Every action the API could submit, on or next to the board."""
+    actions = []
+    for x in range(7):
+        for y in range(7):
+            square = Coord.of(x, y)
+            actions += [Action(ActionType.FLIP, target=square), Action(ActionType.CUT, target=square),
+                        Action(ActionType.ESCAPE, source=square)]
+            actions += [Action(ActionType.SHOOT, target=square, direction=d) for d in Direction]
+            actions += [Action(ActionType.MOVE, source=square, target=Coord.of(tx, ty))
+                        for tx in range(-1, 8) for ty in range(-1, 8) if tx == x or ty == y]
+    return actions
+
+
+def test_batched_engine_matches_object_engine():
+    candidates = _candidate_actions()
+    for seed in range(2):
+        engine = GameEngine([HumanPlayer("a", PieceOwner.PLAYER1), HumanPlayer("b", PieceOwner.PLAYER2)],
+                            Board(seed=seed))
+        batch = BatchedEngine.from_engines([engine])
+        rng = random.Random(seed)
+        while not engine.is_game_over:
+            player = engine.current_player
+            valid = [a for a in candidates if engine.rules_validator.validate_action(player, a)[0]]
+            assert set(valid) == {ACTIONS[i] for i in np.flatnonzero(batch.legal_mask()[0])}
+
+            index, points = -1, 0
+            if valid:
+                action = rng.choice(valid)
+                index = ACTION_INDEX[action]
+                points = engine.apply_action(player, action)
+                engine.update_scores(player, points)
+            engine.next_turn()
+
+            assert batch.step(np.array([index]))[0] == points
+            reference = BatchedEngine.from_engines([engine])
+            for field in STATE_FIELDS:
+                assert np.array_equal(getattr(batch, field), getattr(reference, field)), field
+
+
+def test_new_games_use_the_standard_distribution():
+    batch = BatchedEngine.new(50, seed=1)
+    assert (batch.types[:, 3, 3] == 0).all()
+    assert ((batch.types == TILE_CODE[TileType.DEBRIS]).sum(axis=(1, 2)) == 15).all()
+    assert ((batch.types == TILE_CODE[TileType.RED_BLOOD_CELL]).sum(axis=(1, 2)) == 15).all()
+    assert not np.array_equal(batch.types[0], batch.types[1])
+
+
+def test_random_play_finishes_every_game():
+    batch = BatchedEngine.new(200, seed=2)
+    batch.play_random(seed=3)
+    assert not batch.active.any()
+    assert set(np.unique(batch.winner)) <= {0, 1}
+
+
+def test_illegal_action_changes_nothing():
+    batch = BatchedEngine.new(2, seed=4)
+    before = batch.types.copy()
+    move = ACTION_INDEX[Action(ActionType.MOVE, source=Coord.of(0, 0), target=Coord.of(0, 1))]
+    with pytest.raises(ValueError):
+        batch.step(np.array([ACTION_INDEX[Action(ActionType.FLIP, target=Coord.of(0, 0))], move]))
+    assert np.array_equal(batch.types, before)
+    assert not batch.is_legal(np.array([move, -1])).any()
@@ -0,0 +1,89 @@
+import itertools
+import random
+from collections import Counter
+
+import pytest
+
+from board.board import Board
+from board.lookup_tables import SQUARE_COORDS
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+from common.models.direction import Direction
+from game_engine.belief_state import HIDDEN_TYPES, BeliefState
+from game_engine.game_engine import GameEngine
+from pieces.piece_owner import PieceOwner
+from player.human_player import HumanPlayer
+from tile.tile_types import TileType
+
+V, B, T, D = TileType.VIRUS, TileType.BACTERIA, TileType.T_CELL, TileType.DEBRIS
+
+
+def _brute_force(belief):
+    """Probabilities by enumerating every distinct layout."""
+    squares = belief.hidden_squares
+    pool = [tile_type for tile_type, count in belief.remaining().items() for _ in range(count)]
+    layouts = [layout for layout in set(itertools.permutations(pool))
+               if all(belief.allowed[square] >> HIDDEN_TYPES.index(tile_type) & 1
+                      for square, tile_type in zip(squares, layout))]
+    return {square: {tile_type: sum(layout[i] == tile_type for layout in layouts) / len(layouts)
+                     for tile_type in HIDDEN_TYPES}
+            for i, square in enumerate(squares)}
+
+
+def test_fresh_board_probabilities_follow_the_distribution():
+    belief = BeliefState.from_board(Board(seed=0))
+    probabilities = belief.probabilities(0)
+    assert probabilities[TileType.DEBRIS] == pytest.approx(15 / 48)
+    assert probabilities[TileType.VIRUS] == pytest.approx(2 / 48)
+    assert sum(probabilities.values()) == pytest.approx(1)
+
+
+def test_constrained_probabilities_are_exact():
+    belief = BeliefState(range(6), {V: 1, B: 2, T: 1, D: 2})
+    belief.exclude(0, [V, B])
+    belief.exclude(1, [V, B])
+    belief.exclude(2, [D])
+    expected = _brute_force(belief)
+    for square in range(6):
+        for tile_type, probability in belief.probabilities(square).items():
+            assert probability == pytest.approx(expected[square][tile_type])
+
+
+def test_samples_respect_counts_and_constraints():
+    belief = BeliefState(range(6), {V: 1, B: 2, T: 1, D: 2})
+    belief.exclude(0, [V, B, T])
+    rng = random.Random(0)
+    seen = Counter()
+    for _ in range(3000):
+        layout = belief.sample(rng)
+        assert Counter(layout.values()) == Counter({V: 1, B: 2, T: 1, D: 2})
+        assert layout[0] == D
+        seen[layout[1]] += 1
+    # Square 1 shares the other debris with four squares: 1/5 chance
+    assert seen[D] / 3000 == pytest.approx(0.2, abs=0.03)
+
+
+def test_engine_keeps_belief_consistent_with_hidden_tiles():
+    for seed in range(3):
+        engine = GameEngine([HumanPlayer("a", PieceOwner.PLAYER1), HumanPlayer("b", PieceOwner.PLAYER2)],
+                            Board(seed=seed))
+        rng = random.Random(seed)
+        candidates = [Action(ActionType.FLIP, target=pos) for pos in SQUARE_COORDS]
+        candidates += [Action(ActionType.SHOOT, target=pos, direction=d) for pos in SQUARE_COORDS for d in Direction]
+        candidates += [Action(ActionType.CUT, target=pos) for pos in SQUARE_COORDS]
+        candidates += [Action(ActionType.MOVE, source=pos, target=Coord.of(pos.x + dx, pos.y + dy))
+                       for pos in SQUARE_COORDS for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0))]
+        while engine.board.has_hidden_tiles():
+            player = engine.current_player
+            valid = [a for a in candidates if engine.rules_validator.validate_action(player, a)[0]]
+            action = rng.choice(valid)
+            engine.update_scores(player, engine.apply_action(player, action))
+            engine.next_turn()
+
+            hidden = {square: engine.board.grid[pos.x][pos.y].tile_type for square, pos in enumerate(SQUARE_COORDS)
+                      if engine.board.grid[pos.x][pos.y] and not engine.board.grid[pos.x][pos.y].flipped}
+            belief = engine.belief
+            assert set(belief.hidden_squares) == set(hidden)
+            assert +Counter(belief.remaining()) == Counter(hidden.values())
+            for square, tile_type in hidden.items():
+                assert belief.probabilities(square)[tile_type] > 0
@@ -0,0 +1,46 @@
+import time
+
+from board.board import Board
+from board.board_pool import BoardPool
+from api.models.game_manager import GameSessionManager
+
+
+def _layout(board):
+    return [(tile.tile_type, tile.faction) if tile else None for row in board.grid for tile in row]
+
+
+def test_seeded_boards_are_reproducible():
+    assert _layout(Board(seed=42)) == _layout(Board(seed=42))
+    assert _layout(Board(seed=42)) != _layout(Board(seed=43))
+
+
+def test_pool_serves_prebuilt_boards_and_refills():
+    pool = BoardPool(target_size=8, low_water=4, seed=1)
+    pool.fill()
+    assert len(pool) == 8
+
+    pool.start()
+    try:
+        boards = [pool.acquire() for _ in range(6)]
+        assert len({board.seed for board in boards}) == 6
+        deadline = time.time() + 5
+        while len(pool) < 8 and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(pool) == 8
+    finally:
+        pool.stop()
+
+    # An empty, stopped pool still builds boards inline
+    empty = BoardPool(target_size=2)
+    assert empty.acquire().seed is not None
+
+
+def test_bulk_create_uses_pool_boards():
+    pool = BoardPool(target_size=4, seed=3)
+    pool.fill()
+    manager = GameSessionManager(pool)
+    game_ids = manager.create_games([("Alice", None), ("Bob", "Carol")])
+    assert len(game_ids) == 2
+    assert manager.get_stats()["total_games"] == 2
+    assert manager.get_game(game_ids[1]).player2_name == "Carol"
+    assert manager.get_game(game_ids[0]).game_engine.board.seed is not None
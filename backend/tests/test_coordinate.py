@@ -0,0 +1,36 @@
+import copy
+import pickle
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from common.models.coordinate import Coord
+
+
+def test_board_coordinates_are_shared():
+    assert Coord.of(2, 5) is Coord.of(2, 5)
+    assert Coord(2, 5) is Coord.of(2, 5)
+    assert Coord.of(3, -1) is Coord.of(3, -1)
+    assert Coord.of(6, 6).moved(1, -3) is Coord.of(7, 3)
+
+
+def test_off_board_coordinates_still_compare_equal():
+    far = Coord.of(20, -8)
+    assert far == Coord.of(20, -8)
+    assert hash(far) == hash(Coord.of(20, -8))
+    assert {far: 1}[Coord.of(20, -8)] == 1
+
+
+def test_coordinates_are_immutable_and_slotted():
+    coord = Coord.of(1, 1)
+    with pytest.raises(FrozenInstanceError):
+        coord.x = 4
+    assert not hasattr(coord, "__dict__")
+
+
+def test_copy_and_pickle_preserve_identity():
+    coord = Coord.of(4, 2)
+    assert copy.copy(coord) is coord
+    assert copy.deepcopy([coord])[0] is coord
+    assert pickle.loads(pickle.dumps(coord)) is coord
+    assert coord != (4, 2)
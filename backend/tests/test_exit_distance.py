@@ -0,0 +1,154 @@
+import random
+
+from board.board import Board
+from board.exit_distance import ALL_EXITS, UNREACHABLE, ExitField
+from board.lookup_tables import FOREST_EXITS, NEIGHBOR_COORDS, NUM_SQUARES, RAY_COORDS, SQUARE_COORDS, square_index
+from common.models.coordinate import Coord
+from game_engine.game_engine import GameEngine
+from game_engine.models.game_phase import GamePhase
+from game_engine.perft import seeded_engine
+from game_engine.position import Position
+from pieces.piece_owner import PieceOwner
+from player.ai_player import AIPlayer
+from player.human_player import HumanPlayer
+from tile.tile import Tile
+from tile.tile_types import TileOwner, TileType
+
+
+def _sparse_board(seed, cleared=30):
+    board = Board(seed=seed)
+    for pos in random.Random(seed).sample(SQUARE_COORDS, cleared):
+        board._set_tile(pos.x, pos.y, None)
+    return board
+
+
+def _walk_out(board, start, exit_pos, slider):
+    """Actions one piece needs to leave through `exit_pos`, by a breadth-first walk of its moves."""
+    def empty(pos):
+        return pos == start or not board.grid[pos.x][pos.y]
+
+    def leaves(pos):
+        if abs(exit_pos.x - pos.x) + abs(exit_pos.y - pos.y) == 1:
+            return True
+        if not slider or (exit_pos.x != pos.x and exit_pos.y != pos.y):
+            return False
+        dx = (exit_pos.x > pos.x) - (exit_pos.x < pos.x)
+        dy = (exit_pos.y > pos.y) - (exit_pos.y < pos.y)
+        step = Coord(pos.x + dx, pos.y + dy)
+        while step != exit_pos:
+            if not empty(step):
+                return False
+            step = Coord(step.x + dx, step.y + dy)
+        return True
+
+    seen, frontier, actions = {start}, [start], 1
+    while frontier:
+        if any(leaves(pos) for pos in frontier):
+            return actions
+        actions += 1
+        next_frontier = []
+        for pos in frontier:
+            for ray in RAY_COORDS[square_index(pos)]:
+                for step in ray if slider else ray[:1]:
+                    if not empty(step):
+                        break
+                    if step not in seen:
+                        seen.add(step)
+                        next_frontier.append(step)
+        frontier = next_frontier
+    return UNREACHABLE
+
+
+def test_fields_match_a_walk_of_the_moves():
+    for seed in range(4):
+        board = _sparse_board(seed)
+        for slider in (False, True):
+            for exit_index, exit_pos in enumerate(FOREST_EXITS):
+                field = ExitField(board.exits.occupied, slider, (exit_index,))
+                for square, pos in enumerate(SQUARE_COORDS):
+                    assert field.distance[square] == _walk_out(board, pos, exit_pos, slider)
+
+
+def test_occupancy_follows_the_board():
+    board = _sparse_board(5)
+    fields = board.exits.fields(TileType.BACTERIA)
+    tile = next(board.get_tile(pos) for pos in SQUARE_COORDS if board.get_tile(pos))
+    empty = next(pos for pos in SQUARE_COORDS if not board.get_tile(pos))
+    board.move_tile(tile.position, empty, None)
+    occupied = board.exits.occupied
+    board.exits.rebuild()
+    assert occupied == board.exits.occupied
+    # Fields asked for before the move were repaired along with it
+    assert [field.distance for field in fields] == [field.distance for field in board.exits.fields(TileType.BACTERIA)]
+
+
+def test_escapes_and_valid_exits():
+    board = Board(seed=0)
+    board.grid = [[None] * 7 for _ in range(7)]
+    virus = Tile(position=Coord(3, 2), tile_type=TileType.VIRUS, faction=TileOwner.PLAYER2, points=10)
+    bacteria = Tile(position=Coord(1, 3), tile_type=TileType.BACTERIA, faction=TileOwner.PLAYER2, points=5)
+    t_cell = Tile(position=Coord(5, 5), tile_type=TileType.T_CELL, faction=TileOwner.PLAYER1, points=5)
+    for tile in (virus, bacteria, t_cell):
+        tile.flipped = True
+        board.grid[tile.position.x][tile.position.y] = tile
+    board.rebuild_occupancy()
+
+    escapes = board.exits.escapes(PieceOwner.PLAYER2)
+    assert [(escape.source, escape.distance) for escape in escapes] == [(Coord(1, 3), 1), (Coord(3, 2), 3)]
+    assert escapes[1].exit == Coord(3, -1)
+    assert board.get_valid_exit_positions(Coord(3, 2)) == []
+    # Only edge squares on a line with the piece, as before the fields: (3, 6) takes two moves
+    assert board.get_valid_exit_positions(Coord(1, 3)) == [Coord(6, 3), Coord(0, 3)]
+    assert board.exits.next_step(Coord(3, 2), TileType.VIRUS, Coord(3, -1)) == Coord(3, 1)
+
+
+def test_ai_walks_a_piece_toward_the_nearest_exit():
+    board = Board(seed=0)
+    board.grid = [[None] * 7 for _ in range(7)]
+    virus = Tile(position=Coord(2, 2), tile_type=TileType.VIRUS, faction=TileOwner.PLAYER2, points=10)
+    virus.flipped = True
+    board.grid[2][2] = virus
+    board.rebuild_occupancy()
+    ai = AIPlayer("ai", PieceOwner.PLAYER2)
+    engine = GameEngine([HumanPlayer("human", PieceOwner.PLAYER1), ai], board)
+    engine.phase = GamePhase.ESCAPE
+
+    action = ai._choose_move_toward_exit(engine)
+    assert action.source == Coord(2, 2)
+    assert board.exits.distance(action.target, TileType.VIRUS) == board.exits.distance(Coord(2, 2), TileType.VIRUS) - 1
+    assert action.target in NEIGHBOR_COORDS[square_index(Coord(2, 2))]
+
+
+def test_repaired_fields_match_fields_built_afresh():
+    rng = random.Random(3)
+    occupied = sum(1 << square for square in rng.sample(range(NUM_SQUARES), 30))
+    for slider in (False, True):
+        field = ExitField(occupied, slider, journaled=True)
+        start, distance = field.mark(), field.distance[:]
+        for _ in range(200):
+            changes = [(square, rng.random() < 0.5) for square in rng.sample(range(NUM_SQUARES), rng.randint(1, 3))]
+            field.update(changes)
+            assert field.distance == ExitField(field.occupied, slider).distance
+        field.rollback(start)
+        assert field.occupied == occupied and field.distance == distance
+
+
+def test_positions_keep_their_fields_through_apply_and_undo():
+    engine = seeded_engine(7, 90)
+    assert engine.phase == GamePhase.ESCAPE
+    position = Position.from_engine(engine, engine.current_player_turn_index)
+    rng = random.Random(7)
+    tokens = []
+    while not position.is_finished and position.legal_actions():
+        tokens.append(position.apply(rng.choice(position.legal_actions())))
+        occupied = sum(1 << square for square, code in enumerate(position.types) if code)
+        for field in position.exit_fields():
+            assert field.distance == ExitField(occupied, field.slider).distance
+    fresh = Position.from_engine(engine, engine.current_player_turn_index).exit_fields()
+    for token in reversed(tokens):
+        position.undo(token)
+    assert [field.distance for field in position.exit_fields()] == [field.distance for field in fresh]
+    # The nearest exit over all four is the best of the per-exit fields
+    for slider in (False, True):
+        per_exit = [ExitField(fresh[0].occupied, slider, (exit_index,)).distance for exit_index in ALL_EXITS]
+        assert fresh[slider].distance == [min(column) for column in zip(*per_exit)]
@@ -0,0 +1,71 @@
+import random
+
+from board.board import Board
+from game_engine.game_engine import GameEngine
+from game_engine.models.game_phase import GamePhase
+from game_engine.position import RED_BLOOD_CELL, T_CELL, VIRUS, Position
+from pieces.piece_owner import PieceOwner
+from player.expectimax_player import ExpectimaxPlayer
+from player.human_player import HumanPlayer
+
+
+def _engine(first, second, seed=0):
+    return GameEngine([first, second], Board(seed=seed))
+
+
+def _open_position(pieces, current=0):
+    """Escape-phase full-view position with only `pieces` (square -> code) on the board."""
+    position = Position.from_engine(_engine(HumanPlayer("a", PieceOwner.PLAYER1), HumanPlayer("b", PieceOwner.PLAYER2)))
+    for square in range(len(position.types)):
+        position._clear(square)
+    for square, code in pieces.items():
+        position.types[square] = code
+    position.hidden_counts = [0] * len(position.hidden_counts)
+    position.phase = GamePhase.ESCAPE
+    position.rounds_remaining = 5
+    position.current = current
+    return position
+
+
+def test_plays_legal_actions_for_both_sides():
+    for seat in range(2):
+        players = [HumanPlayer("a", PieceOwner.PLAYER1), HumanPlayer("b", PieceOwner.PLAYER2)]
+        players[seat] = ExpectimaxPlayer(players[seat].name, players[seat].faction, node_budget=500)
+        engine = _engine(*players, seed=seat)
+        rng = random.Random(seat)
+        for _ in range(60):
+            if engine.is_game_over:
+                break
+            player = engine.current_player
+            if player is players[seat]:
+                action = player.choose_action(engine)
+            else:
+                action = Position.to_action(rng.choice(engine.player_view(player).legal_actions()))
+            valid, message = engine.rules_validator.validate_action(player, action)
+            assert valid, message
+            engine.update_scores(player, engine.apply_action(player, action))
+            engine.next_turn()
+
+
+def test_same_budget_gives_same_action():
+    engine = _engine(ExpectimaxPlayer("a", PieceOwner.PLAYER1), HumanPlayer("b", PieceOwner.PLAYER2), seed=3)
+    choices = {ExpectimaxPlayer("a", PieceOwner.PLAYER1, node_budget=2000).search(engine.player_view(engine.players[0]))
+               for _ in range(3)}
+    assert len(choices) == 1
+
+
+def test_takes_a_free_capture():
+    # The T cell on (0, 0) can shoot or run down the virus on (0, 3)
+    position = _open_position({0: T_CELL, 3: VIRUS, 48: RED_BLOOD_CELL})
+    action = ExpectimaxPlayer("a", PieceOwner.PLAYER1, max_depth=2).search(position)
+    position.apply(action)
+    assert VIRUS not in position.types
+    assert position.scores[0] == 10
+
+
+def test_budget_bounds_the_search():
+    engine = _engine(ExpectimaxPlayer("a", PieceOwner.PLAYER1), HumanPlayer("b", PieceOwner.PLAYER2))
+    player = ExpectimaxPlayer("a", PieceOwner.PLAYER1, max_depth=10, node_budget=300)
+    assert player.search(engine.player_view(engine.players[0])) is not None
+    assert player.last_nodes <= 301
+    assert player.last_depth < 10
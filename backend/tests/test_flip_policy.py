@@ -0,0 +1,65 @@
+import pytest
+
+from board.board import Board
+from board.symmetry import SQUARE_MAPS
+from common.models.action import ActionType
+from game_engine.game_engine import GameEngine
+from game_engine.position import Position
+from player.ai_player import AIPlayer
+from player.flip_policy import (
+    MIN_SAMPLES, NUM_BUCKETS, NUM_CELLS, FlipPolicy, active_flip_policy, cell_index, flip_bucket, load_flip_policy,
+    unload_flip_policy, write_table,
+)
+from pieces.piece_owner import PieceOwner
+from player.human_player import HumanPlayer
+from tools.build_flip_table import main, play_flips
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    yield str(tmp_path / "flip_policy.bin")
+    unload_flip_policy()
+
+
+def test_self_play_records_every_flip():
+    samples = play_flips(3)
+    assert 40 <= len(samples) <= 48
+    assert all(0 <= cell < NUM_CELLS for cell, _ in samples)
+
+
+def test_built_table_round_trips(table_path):
+    assert main(["--games", "3", "--output", table_path]) == 0
+    policy = FlipPolicy(table_path)
+    # Squares a symmetry maps onto each other share their counts
+    orbits = [{squares[square] for squares in SQUARE_MAPS} for square in range(49)]
+    counts = [policy.counts[cell_index(player, square, bucket)] / len(orbits[square])
+              for player in range(2) for square in range(49) for bucket in range(NUM_BUCKETS)]
+    assert round(sum(counts)) == sum(len(play_flips(seed)) for seed in range(3))
+    assert all(policy.counts[cell_index(1, image, 3)] == policy.counts[cell_index(1, 10, 3)] for image in orbits[10])
+    policy.close()
+
+
+def test_ai_flips_the_best_scoring_square(table_path):
+    ai = AIPlayer("ai", PieceOwner.PLAYER1)
+    engine = GameEngine([ai, HumanPlayer("human", PieceOwner.PLAYER2)], Board(seed=0))
+    position = Position.from_engine(engine, viewer=0)
+    sums, counts = [0.0] * NUM_CELLS, [0] * NUM_CELLS
+    # Every opening flip has data; one corner looks best
+    for square in range(49):
+        if position.face_down[square]:
+            cell = cell_index(0, square, flip_bucket(position.types, position.face_down, square, 0))
+            counts[cell] = MIN_SAMPLES
+            sums[cell] = MIN_SAMPLES * (5.0 if square == 48 else 1.0)
+    write_table(table_path, sums, counts)
+
+    assert load_flip_policy(table_path) is active_flip_policy()
+    action = ai._choose_random_flip(engine)
+    assert action.type == ActionType.FLIP and (action.target.x, action.target.y) == (6, 6)
+
+
+def test_missing_or_broken_table_falls_back_to_random(table_path):
+    assert load_flip_policy(table_path) is None
+    with open(table_path, "wb") as handle:
+        handle.write(b"not a table")
+    assert load_flip_policy(table_path) is None
+    assert active_flip_policy() is None
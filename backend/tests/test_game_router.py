@@ -0,0 +1,50 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+
+from api.main import app
+from api.models.game_manager import game_session_manager
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+from player.ai_levels import AILevel
+from tools.load_test import AsgiClient
+
+
+def test_ai_search_does_not_hold_up_other_games():
+    searching_id = game_session_manager.create_game("Ada", ai_level=AILevel.HARD)
+    other_id = game_session_manager.create_game("Bob", "Cy")
+    assert game_session_manager.apply_action(searching_id, "Ada", Action(ActionType.FLIP, target=Coord(0, 0)))[0]
+    session = game_session_manager.get_game(searching_id)
+    session.ai_can_move_after = datetime.now()
+
+    # The HARD AI searches as usual, then holds on until the other game has been served
+    ai_player = session.game_engine.players[1]
+    search = ai_player.choose_action
+    searching, release = threading.Event(), threading.Event()
+
+    def held_search(*args, **kwargs):
+        searching.set()
+        action = search(*args, **kwargs)
+        release.wait(5)
+        return action
+
+    ai_player.choose_action = held_search
+
+    async def scenario():
+        client = AsgiClient(app)
+        ai_turn = asyncio.ensure_future(client.request("GET", f"/api/game/{searching_id}/state"))
+        assert await asyncio.get_running_loop().run_in_executor(None, searching.wait, 5)
+        status, body = await asyncio.wait_for(client.request("GET", f"/api/game/{other_id}/state"), 2)
+        assert status == 200 and json.loads(body)["current_player"] == "Bob"
+        assert not ai_turn.done()
+        release.set()
+        status, body = await ai_turn
+        assert status == 200 and json.loads(body)["current_player"] == "Ada"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        game_session_manager.delete_game(searching_id)
+        game_session_manager.delete_game(other_id)
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from api.main import app
+from tools.load_test import ACTION, CREATE, LEGAL, RESIGN, STATE, AsgiClient, LoadTest, parse_mix, percentile
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_parse_mix_rejects_unknown_requests():
+    assert parse_mix("state=2,action=1") == {"state": 2, "action": 1}
+    with pytest.raises(ValueError):
+        parse_mix("teleport=1")
+
+
+def test_in_process_load_test_reports_per_endpoint():
+    load_test = LoadTest(lambda: AsgiClient(app), games=5, concurrency=5, steps=4,
+                         mix={"state": 1, "action": 1, "legal": 1}, seed=7)
+    report = asyncio.run(load_test.run())
+    assert report[CREATE]["requests"] == 5
+    assert report[RESIGN]["requests"] == 5
+    assert report[STATE]["requests"] + report[ACTION]["requests"] + report[LEGAL]["requests"] == 20
+    assert all(row["errors"] == 0 for row in report.values())
@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+
+from common.logging_config import GameLogger, SILENT, quiet_logging
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_parse_levels():
+    levels = GameLogger.parse_levels("board=WARNING, player.ai=off,*=INFO")
+    assert levels == {"board": logging.WARNING, "player.ai": SILENT, "*": logging.INFO}
+    with pytest.raises(ValueError):
+        GameLogger.parse_levels("board=LOUD")
+
+
+def test_module_levels_and_quiet_logging():
+    root = GameLogger.get_logger()
+    handler = _ListHandler()
+    root.addHandler(handler)
+    board_logger = GameLogger.get_module_logger("board")
+    try:
+        GameLogger.configure_levels({"board": logging.WARNING})
+        board_logger.info("hidden %s", "info")
+        board_logger.warning("shown %s", "warning")
+        with quiet_logging():
+            GameLogger.get_module_logger("engine").info("silenced")
+        assert handler.messages == ["shown warning"]
+    finally:
+        board_logger.setLevel(logging.NOTSET)
+        root.removeHandler(handler)
+
+
+def test_queue_logging_formats_on_listener_thread():
+    root = GameLogger.get_logger()
+    handler = _ListHandler()
+    root.addHandler(handler)
+    GameLogger.enable_queue_logging()
+    try:
+        GameLogger.get_module_logger("board").info("T cell shot %s for %d points!", "VIRUS", 10)
+    finally:
+        GameLogger.disable_queue_logging()
+        root.removeHandler(handler)
+    assert handler.messages == ["T cell shot VIRUS for 10 points!"]
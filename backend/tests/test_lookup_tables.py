@@ -0,0 +1,43 @@
+from board.board import Board
+from board.lookup_tables import (
+    BETWEEN, DIRECTIONS, EXIT_PATHS, NEIGHBOR_COORDS, RAY_COORDS, RAY_EXIT, SQUARE_COORDS, square_of
+)
+from common.models.coordinate import Coord
+from pieces.bacteria import Bacteria
+
+
+def test_rays_walk_out_to_the_edge():
+    for square, origin in enumerate(SQUARE_COORDS):
+        for direction, ray in zip(DIRECTIONS, RAY_COORDS[square]):
+            dx, dy = direction.value
+            expected = []
+            pos = origin.moved(dx, dy)
+            while 0 <= pos.x < 7 and 0 <= pos.y < 7:
+                expected.append(pos)
+                pos = pos.moved(dx, dy)
+            assert list(ray) == expected
+
+
+def test_neighbors_and_between():
+    assert set(NEIGHBOR_COORDS[square_of(0, 0)]) == {Coord(1, 0), Coord(0, 1)}
+    assert len(NEIGHBOR_COORDS[square_of(3, 3)]) == 4
+    assert BETWEEN[(square_of(0, 2), square_of(4, 2))] == tuple(square_of(x, 2) for x in (1, 2, 3))
+    assert BETWEEN[(square_of(2, 2), square_of(2, 3))] == ()
+    assert (square_of(0, 0), square_of(1, 1)) not in BETWEEN
+
+
+def test_forest_exit_tables():
+    north = DIRECTIONS.index(next(d for d in DIRECTIONS if d.name == "NORTH"))
+    assert RAY_EXIT[square_of(3, 5)][north] == Coord(3, -1)
+    assert RAY_EXIT[square_of(2, 5)][north] is None
+    assert EXIT_PATHS[(square_of(3, 0), Coord(3, -1))] == ()
+    assert EXIT_PATHS[(square_of(0, 3), Coord(7, 3))] == tuple(square_of(x, 3) for x in range(1, 7))
+
+
+def test_sliding_piece_uses_rays():
+    board = Board(seed=0)
+    board.grid = [[None] * 7 for _ in range(7)]
+    board.rebuild_occupancy()
+    piece = Bacteria()
+    piece.position = Coord(0, 0)
+    assert len(piece.valid_moves(board)) == 12
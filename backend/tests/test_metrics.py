@@ -0,0 +1,46 @@
+from api.models.game_manager import GameSessionManager
+from common.metrics import MetricsRegistry, TimedRLock
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    text = registry.render()
+    assert '# TYPE test_seconds histogram' in text
+    assert 'test_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_seconds_bucket{le="1.0"} 2' in text
+    assert 'test_seconds_bucket{le="+Inf"} 3' in text
+    assert 'test_seconds_count 3' in text
+
+
+def test_timed_rlock_measures_outermost_hold_only():
+    registry = MetricsRegistry()
+    wait = registry.histogram("wait_seconds", "Wait")
+    hold = registry.histogram("hold_seconds", "Hold")
+    lock = TimedRLock(wait, hold)
+    with lock:
+        with lock:
+            pass
+    assert wait.count == 1
+    assert hold.count == 1
+
+
+def test_engine_hot_paths_are_instrumented():
+    from common.metrics import metrics
+    manager = GameSessionManager()
+    game_id = manager.create_game("Alice", "Bob")
+    manager.apply_action(game_id, "Alice", Action(ActionType.FLIP, target=Coord(0, 0)))
+    manager.get_game_state(game_id)
+
+    text = metrics.render()
+    for name in ("phage_engine_apply_action_seconds_count",
+                 "phage_engine_validate_action_seconds_count",
+                 "phage_game_state_serialize_seconds_count",
+                 "phage_session_lock_hold_seconds_count"):
+        assert name in text
@@ -0,0 +1,47 @@
+import random
+
+from board.board import Board
+from board.lookup_tables import DIRECTIONS, RAY_COORDS, SQUARE_COORDS
+from common.models.coordinate import Coord
+from pieces.t_cell import TCell
+
+
+def _sparse_board(seed):
+    board = Board(seed=seed)
+    rng = random.Random(seed)
+    for pos in rng.sample(SQUARE_COORDS, 30):
+        board._set_tile(pos.x, pos.y, None)
+    return board
+
+
+def test_blocker_distance_matches_ray_walk():
+    for seed in range(5):
+        board = _sparse_board(seed)
+        for square in range(49):
+            for index, ray in enumerate(RAY_COORDS[square]):
+                expected = next((step for step, pos in enumerate(ray, 1) if board.grid[pos.x][pos.y]), 0)
+                assert board.blocker_distance(square, index) == expected
+
+
+def test_masks_follow_moves_and_captures():
+    board = _sparse_board(1)
+    empty = next(pos for pos in SQUARE_COORDS if not board.get_tile(pos))
+    occupied = next(pos for pos in SQUARE_COORDS if board.get_tile(pos))
+    board.move_tile(occupied, empty, None)
+    masks = (list(board.row_masks), list(board.col_masks))
+    board.rebuild_occupancy()
+    assert masks == (board.row_masks, board.col_masks)
+
+
+def test_tcell_moves_stop_at_first_blocker():
+    board = Board(seed=0)
+    board.grid = [[None] * 7 for _ in range(7)]
+    board.grid[0][3] = board.grid[3][3] = object()
+    board.rebuild_occupancy()
+    piece = TCell(shooting_direction=DIRECTIONS[0])
+    piece.position = Coord(0, 0)
+    moves = piece.valid_moves(board)
+    assert Coord(0, 2) in moves and Coord(0, 3) not in moves and Coord(0, 4) not in moves
+    assert board.first_blocker(Coord(0, 3), DIRECTIONS[2]) == Coord(3, 3)
+    assert board.is_path_clear(Coord(0, 3), Coord(3, 3))
+    assert not board.is_path_clear(Coord(0, 3), Coord(4, 3))
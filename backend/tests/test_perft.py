@@ -0,0 +1,29 @@
+from common.models.action import ActionType
+from game_engine.models.game_phase import GamePhase
+from game_engine.perft import perft, perft_divide, seeded_engine, verify
+from game_engine.position import Position
+from tools.perft import main
+
+
+def test_opening_counts():
+    # 48 face-down tiles; after each flip the opponent has 47 flips, plus the
+    # moves of the revealed piece if they may move it
+    position = Position.from_engine(seeded_engine(0))
+    assert perft(position, 1) == 48
+    result = perft_divide(position, 2)
+    assert result.nodes == 2257
+    assert result.by_type == {ActionType.FLIP: 2257}
+
+
+def test_generator_agrees_with_validator():
+    for plies in (40, 95):
+        engine = seeded_engine(0, plies)
+        nodes, mismatches = verify(engine, 2)
+        assert mismatches == []
+        assert nodes == perft(Position.from_engine(engine), 2)
+    assert engine.phase == GamePhase.ESCAPE
+
+
+def test_cli_verifies(capsys):
+    assert main(["--seed", "2", "--plies", "30", "--depth", "2", "--verify"]) == 0
+    assert "verify: ok" in capsys.readouterr().out
@@ -0,0 +1,67 @@
+import threading
+
+from api.models.game_manager import GameSessionManager
+from board.board import Board
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+from game_engine.game_engine import GameEngine
+from pieces.piece_owner import PieceOwner
+from player.ai_levels import AILevel
+from player.expectimax_player import ExpectimaxPlayer
+from player.human_player import HumanPlayer
+from player.ponderer import Ponderer, PonderPool
+
+
+def test_pondered_table_covers_the_actual_reply():
+    human = HumanPlayer("h", PieceOwner.PLAYER1)
+    ai = ExpectimaxPlayer("ai", PieceOwner.PLAYER2, max_depth=1)
+    engine = GameEngine([human, ai], Board(seed=5))
+    pool = PonderPool(1)
+    ponderer = Ponderer(ai, pool, node_budget=5000)
+    try:
+        assert ponderer.start(engine.player_view(ai))
+        ponderer._future.result(timeout=30)
+
+        action = Action(ActionType.FLIP, target=Coord.of(0, 0))
+        engine.update_scores(human, engine.apply_action(human, action))
+        engine.next_turn()
+        ponderer.stop()
+        assert engine.player_view(ai).canonical_key()[0] in ai._reused_table
+
+        assert ai.choose_action(engine) is not None
+        assert ai._reused_table is None
+    finally:
+        pool.shutdown()
+
+
+def test_full_pool_drops_requests():
+    pool = PonderPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        assert pool.submit(release.wait) is not None
+        assert pool.submit(release.wait) is None
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_session_ponders_during_the_human_turn():
+    pool = PonderPool(1)
+    manager = GameSessionManager(ponder_pool=pool, ai_move_delay=0)
+    try:
+        game_id = manager.create_game("Hal", None, AILevel.HARD)
+        session = manager.get_game(game_id)
+        assert manager.apply_action(game_id, "Hal", Action(ActionType.FLIP, target=Coord.of(0, 0)))[0]
+        manager.get_game_state(game_id)
+        assert session.game_engine.current_player.name == "Hal"
+        assert session.ponderer._future is not None
+
+        # A rejected action leaves the pondering in place
+        pondering = session.ponderer._future
+        assert not manager.apply_action(game_id, "Hal", Action(ActionType.FLIP, target=Coord.of(0, 0)))[0]
+        assert session.ponderer._future is pondering
+
+        assert manager.delete_game(game_id)
+        assert not session.ponderer.is_pondering
+    finally:
+        pool.shutdown()
@@ -0,0 +1,110 @@
+import random
+
+from board.board import Board
+from board.lookup_tables import NEIGHBORS, SQUARE_COORDS
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+from common.models.direction import Direction
+from game_engine.action_codes import ARGUMENT_SHIFT, CUT, FIELD_MASK, KIND_MASK, SHOOT, SQUARE_SHIFT
+from game_engine.game_engine import GameEngine
+from game_engine.perft import seeded_engine
+from game_engine.position import DEBRIS, HIDDEN_CODES, SHOOTABLE, TILE_CODE, UNKNOWN, Position
+from pieces.piece_owner import PieceOwner
+from player.human_player import HumanPlayer
+
+CANDIDATES = [Action(ActionType.FLIP, target=pos) for pos in SQUARE_COORDS]
+CANDIDATES += [Action(ActionType.CUT, target=pos) for pos in SQUARE_COORDS]
+CANDIDATES += [Action(ActionType.ESCAPE, source=pos) for pos in SQUARE_COORDS]
+CANDIDATES += [Action(ActionType.SHOOT, target=pos, direction=d) for pos in SQUARE_COORDS for d in Direction]
+CANDIDATES += [Action(ActionType.MOVE, source=pos, target=Coord.of(tx, ty)) for pos in SQUARE_COORDS
+               for tx in range(-1, 8) for ty in range(-1, 8) if tx == pos.x or ty == pos.y]
+
+
+def _engine(seed):
+    return GameEngine([HumanPlayer("a", PieceOwner.PLAYER1), HumanPlayer("b", PieceOwner.PLAYER2)], Board(seed=seed))
+
+
+def _state(position):
+    return (bytes(position.types), bytes(position.face_down), position.previous, position.moved_by,
+            position.revealed_by, position.allowed, position.hidden_counts, position.current,
+            position.phase, position.rounds_remaining, position.scores)
+
+
+def test_full_view_tracks_the_engine():
+    for seed in range(2):
+        engine = _engine(seed)
+        rng = random.Random(seed)
+        position = Position.from_engine(engine)
+        while not engine.is_game_over:
+            player = engine.current_player
+            valid = {a for a in CANDIDATES if engine.rules_validator.validate_action(player, a)[0]}
+            generated = position.legal_actions()
+            assert {Position.to_action(a) for a in generated} == valid
+            if not generated:
+                break
+
+            action = rng.choice(generated)
+            before = _state(position)
+            token = position.apply(action)
+            position.undo(token)
+            assert _state(position) == before
+
+            position.apply(action)
+            engine_action = Position.to_action(action)
+            engine.update_scores(player, engine.apply_action(player, engine_action))
+            engine.next_turn()
+            assert _state(position) == _state(Position.from_engine(engine))
+
+
+def test_player_view_hides_face_down_tiles():
+    engine = _engine(3)
+    view = engine.player_view(engine.players[1])
+    assert set(view.types) - {0} == {UNKNOWN}
+    flips = view.legal_actions()
+    assert len(flips) == 48
+    outcomes = view.chance_outcomes(flips[0])
+    assert abs(sum(p for _, p in outcomes) - 1) < 1e-9
+
+    view.apply(flips[0], outcome=TILE_CODE[engine.board.grid[0][0].tile_type])
+    assert view.current == 1 - engine.current_player_turn_index
+    assert not engine.board.grid[0][0].flipped
+
+
+def test_blocked_shot_outcomes_are_merged():
+    view = Position.from_engine(seeded_engine(4, 30), 0)
+    shot = next(action for action in view.legal_actions()
+                if action & KIND_MASK == SHOOT and view.chance_outcomes(action))
+    outcomes = view.chance_outcomes(shot)
+    assert abs(sum(p for _, p in outcomes) - 1) < 1e-9
+    assert sum(1 for code, _ in outcomes if code not in SHOOTABLE) == 1
+    # Every blocking type leaves the same position as the one kept
+    target = view._shot_target(shot >> SQUARE_SHIFT & FIELD_MASK, shot >> ARGUMENT_SHIFT)
+    children = set()
+    for code in HIDDEN_CODES:
+        if code not in SHOOTABLE and view.allowed[target] >> code & 1 and view.hidden_counts[code]:
+            child = view.copy()
+            child.apply(shot, code)
+            children.add(repr(_state(child)))
+    assert len(children) == 1
+
+
+def test_cut_next_to_face_down_debris_is_a_chance_node():
+    engine = seeded_engine(1, 28)
+    index = engine.current_player_turn_index
+    view = Position.from_engine(engine, index)
+    # A dendritic cell with only face-down tiles that may be debris next to it
+    cut = next(action for action in view.legal_actions() if action & KIND_MASK == CUT and not any(
+        view.types[neighbor] == DEBRIS for neighbor in NEIGHBORS[action >> SQUARE_SHIFT & FIELD_MASK]))
+    outcomes = view.chance_outcomes(cut)
+    assert abs(sum(p for _, p in outcomes) - 1) < 1e-9
+
+    # The view follows the engine when given the true outcome
+    hidden = view._hidden_debris(cut >> SQUARE_SHIFT & FIELD_MASK)
+    mask = sum(1 << bit for bit, square in enumerate(hidden)
+               if TILE_CODE[engine.board.grid[square // 7][square % 7].tile_type] == DEBRIS)
+    assert mask in dict(outcomes)
+    view.apply(cut, mask)
+    player = engine.current_player
+    engine.update_scores(player, engine.apply_action(player, Position.to_action(cut)))
+    engine.next_turn()
+    assert _state(view) == _state(Position.from_engine(engine, index))
@@ -0,0 +1,28 @@
+from game_engine.rules import (
+    CAPTURE_MASK, MOVABLE_MASK, PIECE_RULES, SHOOTABLE_TYPES, TILE_CODE, UNKNOWN,
+    can_capture, can_exit, can_move, is_slider, is_stepper,
+)
+from pieces.piece_owner import PieceOwner
+from tile.tile_types import TileType
+
+
+def test_compiled_masks_follow_the_table():
+    for attacker, rule in PIECE_RULES.items():
+        for target in PIECE_RULES:
+            assert can_capture(attacker, target) == (target in rule.captures)
+        for faction in (PieceOwner.PLAYER1, PieceOwner.PLAYER2):
+            assert can_move(faction, attacker) == (faction in rule.movers)
+        assert is_stepper(attacker) == (rule.max_range == 1)
+        assert is_slider(attacker) == (bool(rule.movers) and rule.max_range is None)
+        assert can_exit(attacker) == rule.can_exit
+
+
+def test_rules_match_the_game():
+    assert SHOOTABLE_TYPES == (TileType.VIRUS, TileType.BACTERIA, TileType.RED_BLOOD_CELL)
+    assert can_capture(TileType.VIRUS, TileType.T_CELL)
+    assert not can_capture(TileType.RED_BLOOD_CELL, TileType.DEBRIS)
+    assert can_move(PieceOwner.PLAYER1, TileType.RED_BLOOD_CELL) and can_move(PieceOwner.PLAYER2, TileType.RED_BLOOD_CELL)
+    assert not can_move(PieceOwner.PLAYER1, TileType.DEBRIS) and not can_move(PieceOwner.PLAYER2, TileType.DEBRIS)
+    # Empty squares and unknown tiles neither move nor capture
+    assert not CAPTURE_MASK[TILE_CODE[TileType.EMPTY]] and not CAPTURE_MASK[UNKNOWN]
+    assert not any(mask >> UNKNOWN & 1 for mask in MOVABLE_MASK)
@@ -0,0 +1,54 @@
+from board.lookup_tables import EXIT_EDGE_SQUARES, NUM_SQUARES
+from board.symmetry import EXIT_MAPS, INVERSE, NUM_SYMMETRIES, SQUARE_MAPS, transform_action
+from game_engine.perft import seeded_engine
+from game_engine.position import Position
+
+
+def test_symmetries_form_the_group_and_keep_the_exits():
+    assert SQUARE_MAPS[0] == tuple(range(NUM_SQUARES))
+    maps = set(SQUARE_MAPS)
+    assert len(maps) == NUM_SYMMETRIES
+    for first in SQUARE_MAPS:
+        assert sorted(first) == list(range(NUM_SQUARES))
+        for second in SQUARE_MAPS:
+            assert tuple(second[first[square]] for square in range(NUM_SQUARES)) in maps
+    for symmetry, squares in enumerate(SQUARE_MAPS):
+        assert all(SQUARE_MAPS[INVERSE[symmetry]][squares[square]] == square for square in range(NUM_SQUARES))
+        # An exit's edge square goes to the edge square of the exit it maps to
+        for index, edge_square in enumerate(EXIT_EDGE_SQUARES):
+            assert squares[edge_square] == EXIT_EDGE_SQUARES[EXIT_MAPS[symmetry][index]]
+
+
+def test_actions_turn_with_the_position():
+    # Openings, mid-game flips and an escape phase with an exit move on offer
+    for plies in (0, 30, 95, 110):
+        engine = seeded_engine(4, plies)
+        for viewer in (None, 0):
+            position = Position.from_engine(engine, viewer)
+            actions = position.legal_actions()
+            keys = set()
+            for symmetry in range(NUM_SYMMETRIES):
+                turned = position.transformed(symmetry)
+                assert sorted(turned.legal_actions(), key=repr) == sorted(
+                    (Position.transform_action(action, symmetry) for action in actions), key=repr)
+                keys.add(turned.canonical_key()[0])
+                # Playing an action and turning the result matches turning first
+                for action in actions[::7]:
+                    if position.chance_outcomes(action):
+                        continue
+                    played = position.copy()
+                    played.apply(action)
+                    moved = turned.copy()
+                    moved.apply(Position.transform_action(action, symmetry))
+                    assert played.transformed(symmetry).key() == moved.key()
+                    # Engine actions turn the same way as position actions
+                    assert transform_action(Position.to_action(action), symmetry) == \
+                        Position.to_action(Position.transform_action(action, symmetry))
+            assert keys == {position.canonical_key()[0]}
+
+
+def test_canonical_key_names_the_symmetry():
+    position = Position.from_engine(seeded_engine(2, 40))
+    key, symmetry = position.canonical_key()
+    assert position.transformed(symmetry).key() == key
+    assert all(key <= position.transformed(other).key() for other in range(NUM_SYMMETRIES))
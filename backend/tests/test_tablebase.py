@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from game_engine.models.game_phase import GamePhase
+from game_engine.perft import seeded_engine
+from game_engine.position import Position
+from game_engine.tablebase import (
+    KIND_INDEX, NUM_STATES, PIECE_STATES, STATE_ID, STATE_MAPS, Tablebase, build, combination_index,
+    piece_states, position_of, write_tablebase, _state_sets,
+)
+from game_engine.rules import DEBRIS, T_CELL, VIRUS
+
+
+@pytest.fixture(scope="module")
+def tablebase_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tablebase") / "tablebase.bin")
+    write_tablebase(path, build(1), 1)
+    return path
+
+
+def _brute_force(position):
+    """Exact value for the player to move, by full-depth negamax."""
+    if position.is_finished:
+        return 0
+    actions = position.legal_actions()
+    if not actions:
+        child = position.copy()
+        child._next_turn()
+        return -_brute_force(child)
+    mover, best = position.current, None
+    for action in actions:
+        before = position.scores[mover]
+        token = position.apply(action)
+        value = position.scores[mover] - before - _brute_force(position)
+        position.undo(token)
+        best = value if best is None else max(best, value)
+    return best
+
+
+def test_sets_are_indexed_in_order():
+    for index, states in enumerate(_state_sets(2, 60)):
+        assert combination_index(states) == index
+    assert NUM_STATES == len(PIECE_STATES)
+
+
+def test_single_pieces_match_brute_force(tablebase_path):
+    tablebase = Tablebase(tablebase_path)
+    rng = random.Random(0)
+    for state in rng.sample(range(NUM_STATES), 150):
+        for rounds_remaining, current in ((1, 0), (1, 1), (2, 1)):
+            position = position_of([state], rounds_remaining, current)
+            assert tablebase.probe(position) == _brute_force(position)
+            # Every symmetric copy was filled in from the one solved
+            for state_map in STATE_MAPS:
+                assert tablebase.probe(position_of([state_map[state]], rounds_remaining, current)) \
+                    == tablebase.probe(position)
+    tablebase.close()
+
+
+def test_probe_skips_uncovered_positions(tablebase_path):
+    tablebase = Tablebase(tablebase_path)
+    two = position_of([STATE_ID[(0, KIND_INDEX[(VIRUS, None)], -1)], STATE_ID[(48, KIND_INDEX[(T_CELL, None)], -1)]],
+                      3, 0)
+    assert piece_states(two) is not None and tablebase.probe(two) is None
+    flip_phase = position_of([STATE_ID[(0, KIND_INDEX[(VIRUS, None)], -1)]], 3, 0)
+    flip_phase.phase = GamePhase.FLIP
+    assert tablebase.probe(flip_phase) is None
+    tablebase.close()
+
+
+def test_real_escape_phases_are_out_of_reach(tablebase_path):
+    tablebase = Tablebase(tablebase_path)
+    escape_phases = [engine for engine in (seeded_engine(seed, 90) for seed in range(10))
+                     if engine.phase == GamePhase.ESCAPE]
+    assert escape_phases
+    for engine in escape_phases:
+        position = Position.from_engine(engine)
+        # Far more tiles than any table that can be built covers, debris or not
+        assert piece_states(position, 2) is None
+        assert sum(1 for code in position.types if code and code != DEBRIS) > 2
+        assert tablebase.probe(position) is None
+    tablebase.close()
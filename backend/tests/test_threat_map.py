@@ -0,0 +1,70 @@
+import random
+
+from api.models.game_manager import GameSessionManager
+from board.lookup_tables import NEIGHBORS, RAY_COORDS, SQUARE_COORDS, square_index
+from board.threat_map import ATTACKERS, TARGETS, SQUARE_BIT, ThreatMap, mask_squares
+from common.models.action import Action, ActionType
+from common.models.coordinate import Coord
+from game_engine.perft import seeded_engine
+from game_engine.position import Position
+from tile.tile_types import TileType
+
+
+def _brute_force(board):
+    """Attack sets by walking the grid directly."""
+    covered = {kind: 0 for kind in ATTACKERS}
+    for square, pos in enumerate(SQUARE_COORDS):
+        tile = board.grid[pos.x][pos.y]
+        if not tile or not tile.flipped or tile.tile_type not in covered:
+            continue
+        if tile.tile_type == TileType.VIRUS:
+            covered[TileType.VIRUS] |= sum(SQUARE_BIT[neighbor] for neighbor in NEIGHBORS[square])
+            continue
+        for ray in RAY_COORDS[square]:
+            for step in ray:
+                covered[tile.tile_type] |= SQUARE_BIT[square_index(step)]
+                if board.grid[step.x][step.y]:
+                    break
+    return covered
+
+
+def test_map_matches_brute_force_during_games():
+    for seed in range(4):
+        engine = seeded_engine(seed)
+        rng = random.Random(seed)
+        for _ in range(60):
+            if engine.is_game_over:
+                break
+            board = engine.board
+            expected = _brute_force(board)
+            threats = ThreatMap(board)
+            assert {kind: threats.attacked_by(kind) for kind in ATTACKERS} == expected
+            actions = Position.from_engine(engine).legal_actions()
+            player = engine.current_player
+            if actions:
+                engine.update_scores(player, engine.apply_action(player, Position.to_action(rng.choice(actions))))
+            engine.next_turn()
+
+
+def test_threatened_pieces_are_targets_of_a_covering_attacker():
+    engine = seeded_engine(2, plies=40)
+    board = engine.board
+    threats = ThreatMap(board)
+    for square in mask_squares(threats.threatened()):
+        pos = SQUARE_COORDS[square]
+        target = board.grid[pos.x][pos.y].tile_type
+        assert any(target in TARGETS[kind] for _, kind in threats.attackers_of(pos))
+
+
+def test_threats_endpoint_data():
+    manager = GameSessionManager()
+    assert manager.get_threats("missing") is None
+    game_id = manager.create_game("Ada", "Bob")
+    assert manager.get_threats(game_id) == {
+        "t_cell_lanes": [], "virus_adjacent": [], "bacteria_reach": [], "threatened": [],
+    }
+    board = manager.get_game(game_id).game_engine.board
+    pos = next(pos for pos in SQUARE_COORDS if board.get_tile(pos) and board.get_tile(pos).tile_type == TileType.VIRUS)
+    assert manager.apply_action(game_id, "Ada", Action(ActionType.FLIP, target=Coord(pos.x, pos.y)))[0]
+    covered = {(square["x"], square["y"]) for square in manager.get_threats(game_id)["virus_adjacent"]}
+    assert covered == {(step.x, step.y) for step in map(SQUARE_COORDS.__getitem__, NEIGHBORS[square_index(pos)])}
@@ -0,0 +1,14 @@
+import pytest
+
+from board.board import Board
+from board.lookup_tables import SQUARE_COORDS
+
+
+def test_tiles_are_slotted():
+    board = Board(seed=3)
+    tiles = [board.get_tile(pos) for pos in SQUARE_COORDS if board.get_tile(pos)]
+    assert len(tiles) == 48
+    for tile in tiles:
+        assert not hasattr(tile, "__dict__")
+    with pytest.raises(AttributeError):
+        tiles[0].shooting_direction = None
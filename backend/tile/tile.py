@@ -2,8 +2,15 @@
 from .tile_types import TileType, TileOwner
 from common.models.coordinate import Coord
 from typing import Optional
+from game_engine.rules import PIECE_RULES
 
 class Tile:
+    # Sessions hold dozens of tiles each; slots keep them small and attribute access direct
+    __slots__ = (
+        "tile_type", "faction", "points", "flipped", "position", "alive",
+        "previous_position", "last_moved_by", "last_revealed_by",
+    )
+
     def __init__(self, position: Coord, tile_type: TileType, 
                  faction: TileOwner = TileOwner.NONE, points: int = 0):
         self.tile_type = tile_type
@@ -38,8 +45,9 @@ class Tile:
 
     def is_movable(self):
         """Return True if this tile can be moved by a player."""
-        # Only debris cannot be moved (they can only be removed)
-        return self.tile_type != TileType.DEBRIS
+        # Pieces no faction may move (debris) can only be removed
+        rule = PIECE_RULES.get(self.tile_type)
+        return rule is None or bool(rule.movers)
 
     def belongs_to(self, player_faction):
         """Check if this tile is controlled by a player."""
@@ -0,0 +1,114 @@
+"""
+Build the flip table for player/flip_policy.py from random self-play.
+
+Plays --games games through the FLIP phase with random legal actions, one
+seeded board each. For every flip it records the flipper's evaluation
+change over the flip and the opponent's reply, under the flipper, square
+and neighbourhood bucket, pools the squares that a board symmetry maps
+onto each other, and writes the averages where the server maps them at
+startup.
+
+Usage (from backend/):
+    python -m tools.build_flip_table --games 20000 --workers 4
+    python -m tools.build_flip_table --games 2000 --output /tmp/flip_policy.bin
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from board.lookup_tables import NUM_SQUARES
+from board.symmetry import SQUARE_MAPS
+from common.logging_config import quiet_logging
+from evaluation_engine.evaluation_engine import evaluate
+from game_engine.action_codes import FLIP, unpack
+from game_engine.models.game_phase import GamePhase
+from game_engine.perft import seeded_engine
+from game_engine.position import Position
+from player.flip_policy import DEFAULT_TABLE_PATH, NUM_BUCKETS, NUM_CELLS, cell_index, flip_bucket, write_table
+
+
+def play_flips(seed: int) -> List[Tuple[int, float]]:
+    """(table cell, outcome) of every flip in one random self-play game's FLIP phase."""
+    position = Position.from_engine(seeded_engine(seed))
+    rng = random.Random(seed)
+    samples = []
+    # The last flip, waiting for the opponent's reply: (flipper, cell, evaluation before)
+    pending = None
+    while position.phase == GamePhase.FLIP or pending:
+        actions = position.legal_actions()
+        if not actions:
+            break
+        action = rng.choice(actions)
+        player = position.current
+        flip = None
+        kind, square, _ = unpack(action)
+        if kind == FLIP and position.phase == GamePhase.FLIP:
+            cell = cell_index(player, square, flip_bucket(position.types, position.face_down, square, player))
+            flip = (player, cell, evaluate(position, player))
+        position.apply(action)
+        if pending:
+            flipper, cell, before = pending
+            samples.append((cell, evaluate(position, flipper) - before))
+        pending = flip
+    return samples
+
+
+def aggregate(seeds) -> Tuple[List[float], List[int]]:
+    """Per-cell outcome sums and flip counts over the games for `seeds`."""
+    sums, counts = [0.0] * NUM_CELLS, [0] * NUM_CELLS
+    with quiet_logging(logging.WARNING):
+        for seed in seeds:
+            for cell, outcome in play_flips(seed):
+                sums[cell] += outcome
+                counts[cell] += 1
+    return sums, counts
+
+
+def pool_symmetric(values: List[float]) -> List[float]:
+    """
+    Per-cell totals summed over each set of squares related by a board
+    symmetry. Neighbourhood buckets do not change under a symmetry, so the
+    squares of a set share their statistics.
+    """
+    pooled = [0.0] * NUM_CELLS
+    for player in range(2):
+        for square in range(NUM_SQUARES):
+            orbit = {squares[square] for squares in SQUARE_MAPS}
+            for bucket in range(NUM_BUCKETS):
+                pooled[cell_index(player, square, bucket)] = sum(
+                    values[cell_index(player, image, bucket)] for image in orbit)
+    return pooled
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the FLIP phase policy table from self-play.")
+    parser.add_argument("--games", type=int, default=5000, help="Self-play games to aggregate")
+    parser.add_argument("--seed", type=int, default=0, help="Board seed of the first game")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH, help="Table file to write")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    seeds = range(args.seed, args.seed + args.games)
+    if args.workers > 1:
+        chunks = [seeds[index::args.workers] for index in range(args.workers)]
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            parts = list(executor.map(aggregate, chunks))
+    else:
+        parts = [aggregate(seeds)]
+
+    sums = [sum(part[0][cell] for part in parts) for cell in range(NUM_CELLS)]
+    counts = [sum(part[1][cell] for part in parts) for cell in range(NUM_CELLS)]
+    sums, counts = pool_symmetric(sums), [int(count) for count in pool_symmetric(counts)]
+    write_table(args.output, sums, counts)
+    print(f"{args.games} games, {sum(counts)} flips, {sum(1 for count in counts if count)} of {NUM_CELLS} cells "
+          f"seen, {time.perf_counter() - started:.1f}s -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Build the escape-phase endgame tablebase for game_engine/tablebase.py.
+
+Solves every escape-phase position with at most --max-pieces tiles and
+writes the exact values to a file for offline checks. One piece
+takes under a second; two pieces take about 20 minutes and a 47 MB
+file.
+
+Usage (from backend/):
+    python -m tools.build_tablebase --max-pieces 2
+    python -m tools.build_tablebase --max-pieces 1 --output /tmp/tablebase.bin
+"""
+import argparse
+import logging
+import sys
+import time
+from typing import List, Optional
+
+from common.logging_config import quiet_logging
+from game_engine.tablebase import DEFAULT_TABLEBASE_PATH, UNSOLVED, build, write_tablebase
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Solve small escape-phase endgames into a tablebase file.")
+    parser.add_argument("--max-pieces", type=int, default=2, help="Most tiles on the board in a covered position")
+    parser.add_argument("--output", default=DEFAULT_TABLEBASE_PATH, help="Tablebase file to write")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    def progress(message: str) -> None:
+        print(f"{time.perf_counter() - started:8.1f}s  {message}", flush=True)
+
+    with quiet_logging(logging.WARNING):
+        values = build(args.max_pieces, progress)
+    write_tablebase(args.output, values, args.max_pieces)
+    solved = sum(1 for value in values if value != UNSOLVED)
+    print(f"{solved} of {len(values)} entries solved, {time.perf_counter() - started:.1f}s -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""
+Load generator for the game API.
+
+Simulates many concurrent games against the FastAPI app, either in-process
+through the ASGI interface or against a running server, and reports latency
+percentiles and throughput per endpoint.
+
+Usage (from backend/):
+    python -m tools.load_test --games 2000 --steps 20
+    python -m tools.load_test --url http://127.0.0.1:8000 --mix state=6,action=3,list=1
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+# Endpoint labels, matching the route templates in api/routers/game.py
+CREATE = "POST /api/game/create"
+STATE = "GET /api/game/{game_id}/state"
+ACTION = "POST /api/game/{game_id}/action"
+LEGAL = "GET /api/game/{game_id}/legal-actions"
+LIST = "GET /api/game/list"
+STATS = "GET /api/game/stats"
+RESIGN = "POST /api/game/{game_id}/resign"
+DELETE = "DELETE /api/game/{game_id}"
+
+# Relative weights of the requests a simulated player makes between create and resign
+DEFAULT_MIX = {"state": 6, "action": 3, "list": 1}
+MIX_REQUESTS = ("state", "action", "legal", "list", "stats")
+
+
+class AsgiClient:
+    """Drives an ASGI app in-process, without sockets."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, method: str, path: str, query: Optional[Dict] = None,
+                      body: Optional[Dict] = None) -> Tuple[int, bytes]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": urlencode(query or {}).encode(),
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(payload)).encode())],
+            "client": ("load-test", 0),
+            "server": ("load-test", 80),
+        }
+        messages = [{"type": "http.request", "body": payload, "more_body": False}]
+        status = 500
+        chunks: List[bytes] = []
+
+        async def receive():
+            return messages.pop() if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
+
+    async def close(self) -> None:
+        return None
+
+
+class HttpClient:
+    """Minimal HTTP/1.1 keep-alive client over asyncio streams, one connection per simulated game."""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, query: Optional[Dict] = None,
+                      body: Optional[Dict] = None) -> Tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        target = f"{path}?{urlencode(query)}" if query else path
+        head = (
+            f"{method} {target} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "\r\n"
+        )
+        self._writer.write(head.encode() + payload)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).strip(), 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readline()
+            return status, b"".join(chunks)
+        return status, await self._reader.readexactly(int(headers.get("content-length", 0)))
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(rank, 1)) - 1]
+
+
+class LoadTest:
+    """Runs simulated games: create, a weighted mix of requests, then resign."""
+
+    def __init__(self, client_factory, games: int, concurrency: int, steps: int,
+                 mix: Dict[str, int], think_time: float = 0.0, seed: Optional[int] = None):
+        self.client_factory = client_factory
+        self.games = games
+        self.concurrency = concurrency
+        self.steps = steps
+        self.mix = mix
+        self.think_time = think_time
+        self.random = random.Random(seed)
+        self.results: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.elapsed = 0.0
+
+    async def _timed(self, client, label: str, method: str, path: str,
+                     query: Optional[Dict] = None, body: Optional[Dict] = None) -> Optional[Dict]:
+        start = time.perf_counter()
+        try:
+            status, payload = await client.request(method, path, query, body)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            status, payload = 599, b""
+        stats = self.results[label]
+        stats.latencies.append(time.perf_counter() - start)
+        if status >= 400:
+            stats.errors += 1
+            return None
+        return json.loads(payload) if payload else {}
+
+    def _choose_request(self) -> str:
+        names = list(self.mix)
+        return self.random.choices(names, weights=[self.mix[name] for name in names])[0]
+
+    async def _play_game(self, index: int) -> None:
+        client = self.client_factory()
+        players = [f"load-p1-{index}", f"load-p2-{index}"]
+        try:
+            created = await self._timed(client, CREATE, "POST", "/api/game/create",
+                                        body={"player1_name": players[0], "player2_name": players[1]})
+            if not created:
+                return
+            game_id = created["game_id"]
+            state = created["game_state"]
+
+            for _ in range(self.steps):
+                if self.think_time:
+                    await asyncio.sleep(self.random.uniform(0, 2 * self.think_time))
+                request = self._choose_request()
+                if request == "state":
+                    state = await self._timed(client, STATE, "GET", f"/api/game/{game_id}/state") or state
+                elif request == "action":
+                    state = await self._play_action(client, game_id, state) or state
+                elif request == "legal":
+                    await self._timed(client, LEGAL, "GET", f"/api/game/{game_id}/legal-actions")
+                elif request == "list":
+                    await self._timed(client, LIST, "GET", "/api/game/list")
+                else:
+                    await self._timed(client, STATS, "GET", "/api/game/stats")
+
+            await self._timed(client, RESIGN, "POST", f"/api/game/{game_id}/resign",
+                              query={"player_name": players[0]})
+            await self._timed(client, DELETE, "DELETE", f"/api/game/{game_id}")
+        finally:
+            await client.close()
+
+    async def _play_action(self, client, game_id: str, state: Dict) -> Optional[Dict]:
+        """Flip a random face-down tile as the current player."""
+        hidden = [tile for row in state["board_state"] for tile in row
+                  if not tile["flipped"] and tile["tile_type"] != "empty"]
+        if not hidden or not state["is_active"]:
+            return None
+        tile = self.random.choice(hidden)
+        result = await self._timed(
+            client, ACTION, "POST", f"/api/game/{game_id}/action",
+            query={"player_name": state["current_player"]},
+            body={"action_type": "flip", "target": {"x": tile["x"], "y": tile["y"]}},
+        )
+        return result.get("game_state") if result else None
+
+    async def run(self) -> Dict[str, Dict[str, float]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(index: int) -> None:
+            async with semaphore:
+                await self._play_game(index)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded(index) for index in range(self.games)))
+        self.elapsed = time.perf_counter() - start
+        return self.report()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for label, stats in sorted(self.results.items()):
+            latencies = sorted(stats.latencies)
+            report[label] = {
+                "requests": len(latencies),
+                "errors": stats.errors,
+                "throughput": len(latencies) / self.elapsed if self.elapsed else 0.0,
+                "p50_ms": percentile(latencies, 0.50) * 1000,
+                "p95_ms": percentile(latencies, 0.95) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+            }
+        return report
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    """Parse a "state=6,action=3,list=1" request mix."""
+    mix = {}
+    for entry in spec.split(","):
+        name, _, weight = entry.partition("=")
+        name = name.strip()
+        if name not in MIX_REQUESTS:
+            raise ValueError(f"Unknown request type in mix: {name} (expected one of {', '.join(MIX_REQUESTS)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def format_report(report: Dict[str, Dict[str, float]], elapsed: float) -> str:
+    lines = [f"{'endpoint':<40} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"]
+    for label, row in report.items():
+        lines.append(
+            f"{label:<40} {row['requests']:>9} {row['errors']:>7} {row['throughput']:>9.1f} "
+            f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f}"
+        )
+    total = sum(row["requests"] for row in report.values())
+    lines.append(f"{total} requests in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.1f} req/s)")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate concurrent games against the game API.")
+    parser.add_argument("--url", help="Base URL of a running server; omit to drive the app in-process")
+    parser.add_argument("--games", type=int, default=1000, help="Number of simulated games")
+    parser.add_argument("--concurrency", type=int, default=1000, help="Games in flight at once")
+    parser.add_argument("--steps", type=int, default=20, help="Requests per game between create and resign")
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help="Weighted request mix, e.g. state=6,action=3,legal=2,list=1,stats=1")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean seconds between requests")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.url:
+        client_factory = lambda: HttpClient(args.url)
+    else:
+        from common.logging_config import GameLogger
+        from api.main import app
+        GameLogger.configure_levels({"*": logging.WARNING})
+        client_factory = lambda: AsgiClient(app)
+
+    load_test = LoadTest(client_factory, args.games, args.concurrency, args.steps,
+                         parse_mix(args.mix), args.think_time, args.seed)
+    report = asyncio.run(load_test.run())
+    print(format_report(report, load_test.elapsed))
+
+
+if __name__ == "__main__":
+    main()